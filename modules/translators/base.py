@@ -1,7 +1,7 @@
 import urllib.request
 from ordered_set import OrderedSet
 from typing import Dict, List, Union, Set, Callable
-import time, requests, re, uuid, base64, hmac, functools, json, copy
+import time, requests, re, uuid, base64, hmac, functools, json, copy, hashlib
 from collections import OrderedDict
 
 from .exceptions import InvalidSourceOrTargetLanguage, TranslatorSetupFailure, MissingTranslatorParams, TranslatorNotValid
@@ -76,6 +76,12 @@ class BaseTranslator(BaseModule):
 
     _postprocess_hooks = OrderedDict()
     _preprocess_hooks = OrderedDict()
+
+    # optional translation memory (get_many/put_many, e.g. utils.translation_memory.TranslationMemory)
+    # consulted before _translate so repeated lines cost no requests
+    translation_memory = None
+    # params that do not change what a translation says, left out of the memory key
+    memory_ignored_params = {'description', 'delay'}
     
     def __init__(self,
                  lang_source: str, 
@@ -178,6 +184,19 @@ class BaseTranslator(BaseModule):
         text_list = text.split(breaker)
         return [text.lstrip().rstrip() for text in text_list]
 
+    def memory_engine(self) -> str:
+        '''
+        translation memory engine key: the translator name plus a hash of its params,
+        so changing the model, prompt, glossary etc. no longer serves old translations
+        '''
+        values = {}
+        for key, param in (self.params or {}).items():
+            if key in self.memory_ignored_params:
+                continue
+            values[key] = param['value'] if isinstance(param, dict) and 'value' in param else param
+        encoded = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+        return f'{self.name}:{hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]}'
+
     def translate_textblk_lst(self, textblk_lst: List[TextBlock]):
         '''
         only textblks with non-empty source text would be passed to translator
@@ -199,7 +218,18 @@ class BaseTranslator(BaseModule):
             callback(translations = translations, textblocks = textblk_lst, translator = self, source_text = text_list)
 
         if len(text_list) > 0:
-            _translations = self.translate(text_list)
+            memory = self.translation_memory
+            if memory is None:
+                _translations = self.translate(text_list)
+            else:
+                engine = self.memory_engine()
+                cached = memory.get_many(engine, self.lang_source, self.lang_target, text_list)
+                missing = [text for text in OrderedSet(text_list) if text not in cached]
+                if missing:
+                    new_translations = dict(zip(missing, self.translate(missing)))
+                    memory.put_many(engine, self.lang_source, self.lang_target, new_translations)
+                    cached.update(new_translations)
+                _translations = [cached[text] for text in text_list]
             for ii, idx in enumerate(non_empty_ids):
                 translations[idx] = _translations[ii]
 
@@ -53,6 +53,13 @@ class ChapterInfo:
     page_count: Optional[int]
 
 
+@dataclass
+class PageInfo:
+    """Location of a single page before acquisition."""
+    index: int
+    url: str
+
+
 @dataclass
 class PageDownloadResult:
     """Result of downloading a single page."""
@@ -61,6 +68,7 @@ class PageDownloadResult:
     local_path: Optional[Path]
     error: Optional[str]
     metadata: Optional[PageMetadata]
+    throttled: bool = False  # Source answered 429/503; its rate limiter paces the retry
 
 
 class SourceAdapter(Protocol):
@@ -79,6 +87,31 @@ class SourceAdapter(Protocol):
         """List all available chapters for a series."""
         ...
 
+    def list_pages(self, chapter_info: ChapterInfo) -> list[PageInfo]:
+        """List every page of a chapter in reading order (one request per chapter)."""
+        ...
+
     def download_page(self, chapter_info: ChapterInfo, page_index: int, output_path: Path) -> PageDownloadResult:
         """Download a single page to the specified path."""
         ...
+
+
+class AsyncSourceAdapter(Protocol):
+    """Async variant of SourceAdapter used by the asyncio acquisition engine."""
+
+    @property
+    def source_id(self) -> str:
+        """Return unique identifier for this source."""
+        ...
+
+    async def list_chapters(self, series_id: str) -> list[ChapterInfo]:
+        """List all available chapters for a series."""
+        ...
+
+    async def count_pages(self, chapter_info: ChapterInfo) -> Optional[int]:
+        """Return the number of pages in a chapter, or None if unknown."""
+        ...
+
+    async def download_page(self, chapter_info: ChapterInfo, page_index: int, output_path: Path) -> PageDownloadResult:
+        """Download a single page to the specified path."""
+        ...
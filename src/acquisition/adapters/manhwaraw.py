@@ -6,31 +6,178 @@ Auth: None required
 """
 
 import re
-from typing import List
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, quote
 
 import requests
 from bs4 import BeautifulSoup
+from PIL import Image
 
 from ..adapter import (
     SourceAdapter,
     SeriesInfo,
     ChapterInfo,
+    PageDownloadResult,
+    PageInfo,
     PageMetadata,
 )
+from ..async_downloader import AsyncHTTPAdapter
+from ..rate_limit import THROTTLE_STATUS_CODES, get_rate_limiter
+from ..storage import write_hashed
 
+if TYPE_CHECKING:
+    from ..db import AcquisitionDB
 
-class ManhwaRawAdapter(SourceAdapter):
-    """Adapter for manhwaraw.com (Madara-based site)."""
 
-    def __init__(self):
-        self.base_url = "https://manhwaraw.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                         "AppleWebKit/537.36 (KHTML, like Gecko) "
-                         "Chrome/120.0.0.0 Safari/537.36"
-        })
+BASE_URL = "https://manhwaraw.com"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Seconds a chapter's page list is reused before it is fetched again
+PAGE_LIST_TTL_SECONDS = 600
+
+
+def _series_url(series_id: str) -> str:
+    return f"{BASE_URL}/manhwa-raw/{series_id}/"
+
+
+def _page_list_url(series_id: str, chapter_id: str) -> str:
+    # Madara: use ?style=list to get all images in one page load
+    return f"{BASE_URL}/manhwa-raw/{series_id}/{chapter_id}/?style=list"
+
+
+def parse_chapter_list(html: str, source_id: str, series_id: str) -> List[ChapterInfo]:
+    """Parse a series page into chapters in reading order (oldest first)."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    chapters = []
+
+    # Madara chapter list: .wp-manga-chapter or .version-chap li a
+    chapter_elements = soup.select(".wp-manga-chapter a, .version-chap li a, .listing-chapters_wrap li a")
+
+    for elem in chapter_elements:
+        chapter_url = elem.get("href", "")
+        if not chapter_url:
+            continue
+
+        # Extract chapter title
+        chapter_title = elem.get_text(strip=True)
+
+        # Extract chapter ID from URL
+        # Expected: https://manhwaraw.com/manhwa-raw/series/chapter-123/
+        match = re.search(r"/manhwa-raw/[^/]+/([^/]+)/?$", chapter_url)
+        if match:
+            chapter_id = match.group(1)
+        else:
+            chapter_id = chapter_url.rstrip("/").split("/")[-1]
+
+        chapters.append(ChapterInfo(
+            source_id=source_id,
+            series_id=series_id,
+            chapter_id=chapter_id,
+            chapter_title=chapter_title,
+            chapter_url=chapter_url,
+            page_count=None,  # Known once the page list is fetched
+        ))
+
+    # Madara lists newest first, reverse for reading order
+    chapters.reverse()
+
+    return chapters
+
+
+def parse_page_list(html: str, page_list_url: str) -> List[PageInfo]:
+    """Parse a ?style=list chapter page into page image URLs.
+
+    Raises:
+        ValueError: If the chapter page contains no images.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    pages = []
+
+    # Madara page images: .wp-manga-chapter-img or .reading-content img
+    img_elements = soup.select(".wp-manga-chapter-img, .reading-content img, .page-break img")
+
+    for img in img_elements:
+        # Try data-src first (lazy loading), then src
+        image_url = img.get("data-src") or img.get("src")
+
+        if not image_url:
+            continue
+
+        # Make absolute URL
+        image_url = urljoin(page_list_url, image_url.strip())
+
+        # Skip placeholder images
+        if "loading" in image_url.lower() or "placeholder" in image_url.lower():
+            continue
+
+        pages.append(PageInfo(index=len(pages), url=image_url))
+
+    if not pages:
+        raise ValueError(f"No pages found at {page_list_url}")
+
+    return pages
+
+
+class ManhwaRawAdapter(SourceAdapter):
+    """Adapter for manhwaraw.com (Madara-based site).
+
+    A chapter's page list is fetched and parsed once, then cached for
+    page_list_ttl seconds so downloading its pages only fetches image bytes.
+    An image 404 drops the cached list so the retry sees fresh URLs.
+
+    Every request goes through the source's shared rate limiter.
+
+    If a listing_store (an AcquisitionDB) is given, series chapter lists are
+    persisted there and revalidated with conditional requests.
+    """
+
+    def __init__(
+        self,
+        source_id: str = "manhwaraw",
+        page_list_ttl: float = PAGE_LIST_TTL_SECONDS,
+        listing_store: Optional["AcquisitionDB"] = None,
+    ):
+        self._source_id = source_id
+        self.listing_store = listing_store
+        self.base_url = BASE_URL
+        self.page_list_ttl = page_list_ttl
+        self.rate_limiter = get_rate_limiter(source_id)
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._fetch_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._page_cache: Dict[Tuple[str, str], Tuple[float, List[PageInfo]]] = {}
+
+    @property
+    def source_id(self) -> str:
+        return self._source_id
+
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread session; pages are downloaded from a thread pool."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT})
+            self._local.session = session
+        return session
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Rate-limited GET that reports throttle responses to the limiter."""
+        self.rate_limiter.acquire()
+        response = self.session.get(url, **kwargs)
+        self.rate_limiter.record_response(response.status_code, response.headers.get("Retry-After"))
+        return response
 
     def discover_series(self, query: str) -> List[SeriesInfo]:
         """Search for series by title.
@@ -45,7 +192,7 @@ class ManhwaRawAdapter(SourceAdapter):
         search_url = f"{self.base_url}/?s={quote(query)}&post_type=wp-manga"
 
         try:
-            response = self.session.get(search_url, timeout=30)
+            response = self._get(search_url, timeout=30)
             response.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Failed to search series: {e}")
@@ -82,7 +229,7 @@ class ManhwaRawAdapter(SourceAdapter):
             cover_url = img_elem.get("data-src") or img_elem.get("src") if img_elem else None
 
             series_list.append(SeriesInfo(
-                source_id="manhwaraw",  # Fixed source identifier
+                source_id=self.source_id,
                 series_id=series_id,
                 title=title,
                 description=None,  # Not available in search results
@@ -113,7 +260,7 @@ class ManhwaRawAdapter(SourceAdapter):
                 cover_url = img_elem.get("data-src") or img_elem.get("src") if img_elem else None
 
                 series_list.append(SeriesInfo(
-                    source_id="manhwaraw",
+                    source_id=self.source_id,
                     series_id=series_id,
                     title=title,
                     description=None,
@@ -141,7 +288,7 @@ class ManhwaRawAdapter(SourceAdapter):
                     series_id = url.rstrip("/").split("/")[-1]
 
                 series_list.append(SeriesInfo(
-                    source_id="manhwaraw",
+                    source_id=self.source_id,
                     series_id=series_id,
                     title=title,
                     description=None,
@@ -154,134 +301,159 @@ class ManhwaRawAdapter(SourceAdapter):
     def list_chapters(self, series_id: str) -> List[ChapterInfo]:
         """Get all chapters for a series.
 
+        With a listing_store, the series page is requested conditionally
+        (If-None-Match / If-Modified-Since); a 304 returns the stored chapter
+        list without downloading or parsing the page.
+
         Args:
             series_id: Series identifier (e.g., "solo-leveling")
 
         Returns:
             List of chapters in reading order (oldest first)
         """
-        series_url = f"{self.base_url}/manhwa-raw/{series_id}/"
+        stored = self.listing_store.get_series_listing(self.source_id, series_id) if self.listing_store else None
+        headers = {}
+        if stored:
+            if stored["etag"]:
+                headers["If-None-Match"] = stored["etag"]
+            if stored["last_modified"]:
+                headers["If-Modified-Since"] = stored["last_modified"]
 
         try:
-            response = self.session.get(series_url, timeout=30)
+            response = self._get(_series_url(series_id), headers=headers, timeout=30)
+            if response.status_code == 304 and stored:
+                return [ChapterInfo(**chapter) for chapter in stored["chapters"]]
             response.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Failed to fetch chapters for {series_id}: {e}")
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        chapters = []
-
-        # Madara chapter list: .wp-manga-chapter or .version-chap li a
-        chapter_elements = soup.select(".wp-manga-chapter a, .version-chap li a, .listing-chapters_wrap li a")
-
-        for elem in chapter_elements:
-            chapter_url = elem.get("href", "")
-            if not chapter_url:
-                continue
-
-            # Extract chapter title
-            chapter_title = elem.get_text(strip=True)
-
-            # Extract chapter ID from URL
-            # Expected: https://manhwaraw.com/manhwa-raw/series/chapter-123/
-            match = re.search(r"/manhwa-raw/[^/]+/([^/]+)/?$", chapter_url)
-            if match:
-                chapter_id = match.group(1)
-            else:
-                chapter_id = chapter_url.rstrip("/").split("/")[-1]
-
-            # Extract chapter number if present
-            # Try patterns: "Chapter 123", "Ch. 123", "123화"
-            chapter_number = None
-            number_match = re.search(r"(?:chapter|ch\.?|화)\s*(\d+)", chapter_title, re.IGNORECASE)
-            if number_match:
-                chapter_number = int(number_match.group(1))
-            else:
-                # Try plain number
-                number_match = re.search(r"(\d+)", chapter_id)
-                if number_match:
-                    chapter_number = int(number_match.group(1))
-
-            chapters.append(ChapterInfo(
-                chapter_id=chapter_id,
-                title=chapter_title,
-                url=chapter_url,
-                chapter_number=chapter_number
-            ))
-
-        # Madara lists newest first, reverse for reading order
-        chapters.reverse()
-
+        chapters = parse_chapter_list(response.text, self.source_id, series_id)
+        if self.listing_store:
+            self.listing_store.store_series_listing(
+                self.source_id,
+                series_id,
+                [asdict(chapter) for chapter in chapters],
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
         return chapters
 
-    def download_page(self, series_id: str, chapter_id: str, page_index: int) -> PageMetadata:
-        """Download a specific page from a chapter.
+    def list_pages(self, chapter_info: ChapterInfo) -> List[PageInfo]:
+        """Return every page of a chapter, fetching the chapter HTML at most once per TTL.
 
-        Args:
-            series_id: Series identifier
-            chapter_id: Chapter identifier
-            page_index: 0-based page index
-
-        Returns:
-            Page metadata with image URL
+        Raises:
+            RuntimeError: If the chapter page cannot be fetched.
+            ValueError: If the chapter page contains no images.
         """
-        # First, get all pages for the chapter
-        pages = self._get_all_pages(series_id, chapter_id)
+        key = (chapter_info.series_id, chapter_info.chapter_id)
+        with self._cache_lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
 
-        if page_index >= len(pages):
-            raise ValueError(f"Page index {page_index} out of range (chapter has {len(pages)} pages)")
+        # Threads downloading pages of the same chapter wait for one fetch
+        with fetch_lock:
+            cached = self._page_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] <= self.page_list_ttl:
+                return cached[1]
 
-        return pages[page_index]
+            pages = self._fetch_pages(chapter_info.series_id, chapter_info.chapter_id)
+            self._page_cache[key] = (time.monotonic(), pages)
+            return pages
 
-    def _get_all_pages(self, series_id: str, chapter_id: str) -> List[PageMetadata]:
-        """Get all pages for a chapter (internal helper).
+    def invalidate_pages(self, chapter_info: ChapterInfo) -> None:
+        """Drop the cached page list of a chapter."""
+        self._page_cache.pop((chapter_info.series_id, chapter_info.chapter_id), None)
 
-        Args:
-            series_id: Series identifier
-            chapter_id: Chapter identifier
-
-        Returns:
-            List of page metadata
-        """
-        # Madara: use ?style=list to get all images in one page load
-        chapter_url = f"{self.base_url}/manhwa-raw/{series_id}/{chapter_id}/?style=list"
+    def _fetch_pages(self, series_id: str, chapter_id: str) -> List[PageInfo]:
+        """Fetch and parse a chapter's page list."""
+        page_list_url = _page_list_url(series_id, chapter_id)
 
         try:
-            response = self.session.get(chapter_url, timeout=30)
+            response = self._get(page_list_url, timeout=30)
             response.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Failed to fetch pages for {series_id}/{chapter_id}: {e}")
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        pages = []
-
-        # Madara page images: .wp-manga-chapter-img or .reading-content img
-        img_elements = soup.select(".wp-manga-chapter-img, .reading-content img, .page-break img")
+        return parse_page_list(response.text, page_list_url)
 
-        for idx, img in enumerate(img_elements):
-            # Try data-src first (lazy loading), then src
-            image_url = img.get("data-src") or img.get("src")
+    def download_page(self, chapter_info: ChapterInfo, page_index: int, output_path: Path) -> PageDownloadResult:
+        """Download a page image to output_path, streaming and hashing it in one pass.
 
-            if not image_url:
-                continue
-
-            # Make absolute URL
-            image_url = urljoin(chapter_url, image_url)
-
-            # Skip placeholder images
-            if "loading" in image_url.lower() or "placeholder" in image_url.lower():
-                continue
-
-            pages.append(PageMetadata(
-                page_index=idx,
-                image_url=image_url,
-                width=None,  # Unknown until downloaded
-                height=None
-            ))
-
-        if not pages:
-            raise ValueError(f"No pages found for {series_id}/{chapter_id}")
+        Args:
+            chapter_info: Chapter containing the page
+            page_index: 0-based page index
+            output_path: Destination file
 
-        return pages
+        Returns:
+            Download result with page metadata on success
+        """
+        try:
+            pages = self.list_pages(chapter_info)
+            if page_index >= len(pages):
+                return PageDownloadResult(
+                    index=page_index,
+                    success=False,
+                    local_path=None,
+                    error=f"Page index {page_index} out of range (chapter has {len(pages)} pages)",
+                    metadata=None,
+                )
+
+            response = self._get(
+                pages[page_index].url, headers={"Referer": chapter_info.chapter_url}, stream=True, timeout=30
+            )
+            with response:
+                if response.status_code in THROTTLE_STATUS_CODES:
+                    return PageDownloadResult(
+                        index=page_index,
+                        success=False,
+                        local_path=None,
+                        error=f"Throttled by source (HTTP {response.status_code})",
+                        metadata=None,
+                        throttled=True,
+                    )
+                if response.status_code == 404:
+                    # Image URLs may have rotated; the retry fetches a fresh list
+                    self.invalidate_pages(chapter_info)
+                response.raise_for_status()
+
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                size_bytes, sha256 = write_hashed(response.iter_content(chunk_size=64 * 1024), output_path)
+
+            with Image.open(output_path) as img:
+                width, height = img.size
+
+            metadata = PageMetadata(
+                index=page_index,
+                filename=output_path.name,
+                width=width,
+                height=height,
+                size_bytes=size_bytes,
+                sha256=sha256,
+            )
+            return PageDownloadResult(
+                index=page_index, success=True, local_path=output_path, error=None, metadata=metadata
+            )
+
+        except Exception as e:
+            return PageDownloadResult(
+                index=page_index, success=False, local_path=None, error=str(e), metadata=None
+            )
+
+    def async_variant(self, client) -> "ManhwaRawAsyncAdapter":
+        """Return an asyncio adapter for this source sharing the given AsyncHTTPClient."""
+        return ManhwaRawAsyncAdapter(self.source_id, client, self.page_list_ttl)
+
+
+class ManhwaRawAsyncAdapter(AsyncHTTPAdapter):
+    """Asyncio variant of ManhwaRawAdapter for the async acquisition engine."""
+
+    async def list_chapters(self, series_id: str) -> List[ChapterInfo]:
+        html = await self.client.get_text(_series_url(series_id), rate_limiter=self.rate_limiter)
+        return parse_chapter_list(html, self.source_id, series_id)
+
+    async def fetch_page_urls(self, chapter_info: ChapterInfo) -> List[str]:
+        page_list_url = _page_list_url(chapter_info.series_id, chapter_info.chapter_id)
+        html = await self.client.get_text(page_list_url, rate_limiter=self.rate_limiter)
+        return [page.url for page in parse_page_list(html, page_list_url)]
+
+    def request_headers(self, chapter_info: ChapterInfo) -> Optional[Dict[str, str]]:
+        return {"Referer": chapter_info.chapter_url}
@@ -0,0 +1,294 @@
+"""Asyncio chapter downloader sharing one concurrency budget across many chapters."""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from .adapter import AsyncSourceAdapter, ChapterInfo, PageDownloadResult, PageMetadata, SourceAdapter
+from .db import AcquisitionDB
+from .rate_limit import THROTTLE_STATUS_CODES, get_rate_limiter
+from .downloader import (
+    DownloadResult,
+    _backoff_seconds,
+    _ChapterProgress,
+    _count_pages,
+    _finalize_page,
+    _plan_pages,
+    _record_page_count,
+)
+from .storage import get_pages_path
+
+if TYPE_CHECKING:
+    from .http_client import AsyncHTTPClient
+
+
+class ThreadedAdapter:
+    """Run a blocking SourceAdapter inside the async engine.
+
+    Each call is handed to a worker thread, so filesystem and requests-based
+    adapters can be driven by the same downloader as native async adapters.
+    """
+
+    def __init__(self, adapter: SourceAdapter):
+        """Wrap a synchronous adapter."""
+        self.adapter = adapter
+
+    @property
+    def source_id(self) -> str:
+        return self.adapter.source_id
+
+    async def list_chapters(self, series_id: str) -> list[ChapterInfo]:
+        return await asyncio.to_thread(self.adapter.list_chapters, series_id)
+
+    async def count_pages(self, chapter_info: ChapterInfo) -> Optional[int]:
+        return await asyncio.to_thread(_count_pages, self.adapter, chapter_info)
+
+    async def download_page(self, chapter_info: ChapterInfo, page_index: int, output_path: Path) -> PageDownloadResult:
+        return await asyncio.to_thread(self.adapter.download_page, chapter_info, page_index, output_path)
+
+
+class AsyncHTTPAdapter(ABC):
+    """Base class for sources whose pages are plain image URLs.
+
+    Subclasses provide chapter listing and the page URLs of a chapter; pages
+    are streamed to disk through the shared AsyncHTTPClient. Page URL lists are
+    fetched once per chapter and reused for page_list_ttl seconds, or until an
+    image returns 404 (the source may have rotated its image URLs).
+    """
+
+    def __init__(self, source_id: str, client: "AsyncHTTPClient", page_list_ttl: float = 600.0):
+        """Initialize with a source identifier and a shared HTTP client."""
+        self.source_id = source_id
+        self.client = client
+        self.page_list_ttl = page_list_ttl
+        self.rate_limiter = get_rate_limiter(source_id)
+        self._page_urls: Dict[tuple, Tuple[float, asyncio.Future]] = {}
+
+    @abstractmethod
+    async def list_chapters(self, series_id: str) -> list[ChapterInfo]:
+        """List all available chapters for a series."""
+
+    @abstractmethod
+    async def fetch_page_urls(self, chapter_info: ChapterInfo) -> List[str]:
+        """Return the image URL of every page in a chapter, in reading order."""
+
+    async def page_urls(self, chapter_info: ChapterInfo) -> List[str]:
+        """Return the chapter's page URLs, fetching them at most once."""
+        key = (chapter_info.series_id, chapter_info.chapter_id)
+        cached = self._page_urls.get(key)
+        if cached is None or time.monotonic() - cached[0] > self.page_list_ttl:
+            # Concurrent page downloads of the same chapter share one fetch
+            cached = (time.monotonic(), asyncio.ensure_future(self.fetch_page_urls(chapter_info)))
+            self._page_urls[key] = cached
+        try:
+            return await asyncio.shield(cached[1])
+        except Exception:
+            self.invalidate_page_urls(chapter_info)
+            raise
+
+    def invalidate_page_urls(self, chapter_info: ChapterInfo) -> None:
+        """Drop the cached page URLs of a chapter."""
+        self._page_urls.pop((chapter_info.series_id, chapter_info.chapter_id), None)
+
+    async def count_pages(self, chapter_info: ChapterInfo) -> Optional[int]:
+        return len(await self.page_urls(chapter_info))
+
+    def request_headers(self, chapter_info: ChapterInfo) -> Optional[Dict[str, str]]:
+        """Extra headers sent with page image requests (e.g. a Referer)."""
+        return None
+
+    async def download_page(self, chapter_info: ChapterInfo, page_index: int, output_path: Path) -> PageDownloadResult:
+        """Stream one page image to output_path."""
+        try:
+            urls = await self.page_urls(chapter_info)
+            if page_index >= len(urls):
+                return PageDownloadResult(
+                    index=page_index,
+                    success=False,
+                    local_path=None,
+                    error=f"Page index {page_index} out of range",
+                    metadata=None,
+                )
+
+            size_bytes, sha256 = await self.client.stream_to_file(
+                urls[page_index],
+                output_path,
+                headers=self.request_headers(chapter_info),
+                rate_limiter=self.rate_limiter,
+            )
+
+            # Only the image header is read
+            with Image.open(output_path) as img:
+                width, height = img.size
+
+            metadata = PageMetadata(
+                index=page_index,
+                filename=output_path.name,
+                width=width,
+                height=height,
+                size_bytes=size_bytes,
+                sha256=sha256,
+            )
+            return PageDownloadResult(
+                index=page_index, success=True, local_path=output_path, error=None, metadata=metadata
+            )
+
+        except Exception as e:
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+            if status_code == 404:
+                # Stale page list; the retry fetches a fresh one
+                self.invalidate_page_urls(chapter_info)
+            return PageDownloadResult(
+                index=page_index,
+                success=False,
+                local_path=None,
+                error=str(e),
+                metadata=None,
+                throttled=status_code in THROTTLE_STATUS_CODES,
+            )
+
+
+async def _download_page_with_retry_async(
+    adapter: AsyncSourceAdapter,
+    chapter_info: ChapterInfo,
+    page_index: int,
+    output_path: Path,
+    slots: asyncio.Semaphore,
+    max_retries: int = 5,
+    blob_root: Optional[Path] = None,
+) -> tuple[int, bool, Optional[PageMetadata], Optional[str]]:
+    """Download a single page with exponential backoff retry.
+
+    The page holds a slot of the shared budget while downloading, but not
+    while backing off. Throttled attempts skip the per-page backoff; the
+    source's rate limiter paces them.
+    """
+    part_file = output_path.with_suffix(output_path.suffix + ".part")
+    error = "Max retries exceeded"
+
+    for attempt in range(max_retries):
+        try:
+            async with slots:
+                result = await adapter.download_page(chapter_info, page_index, part_file)
+
+            if result.success and result.metadata:
+                # Rename .part to final name on success
+                _finalize_page(part_file, output_path, result.metadata, blob_root)
+                return (page_index, True, result.metadata, None)
+            error = result.error or "Unknown error"
+            if result.throttled:
+                continue
+
+        except Exception as e:
+            error = str(e)
+
+        if attempt < max_retries - 1:
+            await asyncio.sleep(_backoff_seconds(attempt))
+
+    return (page_index, False, None, error)
+
+
+async def download_chapter_async(
+    adapter: AsyncSourceAdapter,
+    chapter_info: ChapterInfo,
+    root_path: Path,
+    db: AcquisitionDB,
+    slots: Optional[asyncio.Semaphore] = None,
+    resume: bool = True,
+    max_retries: int = 5,
+    verify: bool = False,
+    dedup: bool = False,
+) -> DownloadResult:
+    """Download all pages of a chapter on the event loop.
+
+    Produces the same files, manifests and database rows as download_chapter.
+
+    Args:
+        adapter: Async source adapter
+        chapter_info: Chapter to download
+        root_path: Data directory root
+        db: Acquisition database
+        slots: Shared semaphore bounding concurrent page downloads (default 4)
+        resume: Skip pages the database records as downloaded
+        max_retries: Attempts per page
+        verify: Re-check skipped pages against their recorded size and sha256
+        dedup: Store identical pages once in the content-addressed blob store
+    """
+    slots = slots or asyncio.Semaphore(4)
+
+    # Register chapter in database
+    db.register_chapter(
+        chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, chapter_info.chapter_title,
+        chapter_info.page_count
+    )
+
+    # Prepare output directory
+    pages_dir = get_pages_path(root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id)
+    pages_dir.mkdir(parents=True, exist_ok=True)
+
+    page_count = chapter_info.page_count or await adapter.count_pages(chapter_info)
+    total_pages = _record_page_count(db, chapter_info, page_count)
+    if verify:
+        # Hashing pages is blocking work
+        pages_to_download = await asyncio.to_thread(
+            _plan_pages, chapter_info, root_path, total_pages, resume, db, verify
+        )
+    else:
+        pages_to_download = _plan_pages(chapter_info, root_path, total_pages, resume, db)
+
+    if not pages_to_download:
+        return DownloadResult(success=True, pages_downloaded=0, pages_failed=0, errors=[])
+
+    progress = _ChapterProgress(chapter_info, pages_dir, db)
+    blob_root = root_path if dedup else None
+    tasks = [
+        _download_page_with_retry_async(adapter, chapter_info, page_idx, output_path, slots, max_retries, blob_root)
+        for page_idx, output_path in pages_to_download
+    ]
+    for finished in asyncio.as_completed(tasks):
+        page_idx, success, metadata, error = await finished
+        progress.record(page_idx, success, metadata, error)
+
+    return progress.finish(root_path, total_pages)
+
+
+async def download_chapters_async(
+    adapter: AsyncSourceAdapter,
+    chapters: List[ChapterInfo],
+    root_path: Path,
+    db: AcquisitionDB,
+    max_concurrent_pages: int = 16,
+    resume: bool = True,
+    max_retries: int = 5,
+    verify: bool = False,
+    dedup: bool = False,
+    on_chapter_complete: Optional[Callable[[ChapterInfo, DownloadResult], None]] = None,
+) -> List[DownloadResult]:
+    """Download many chapters concurrently under one page budget.
+
+    Pages from every chapter compete for the same ``max_concurrent_pages``
+    slots, so a chapter with few remaining pages does not leave the budget
+    idle.
+
+    Returns:
+        Results in the same order as chapters
+    """
+    slots = asyncio.Semaphore(max_concurrent_pages)
+
+    async def run(chapter: ChapterInfo) -> DownloadResult:
+        try:
+            result = await download_chapter_async(
+                adapter, chapter, root_path, db, slots, resume, max_retries, verify, dedup
+            )
+        except Exception as e:
+            # e.g. the page list could not be fetched; other chapters carry on
+            result = DownloadResult(success=False, pages_downloaded=0, pages_failed=0, errors=[str(e)])
+        if on_chapter_complete:
+            on_chapter_complete(chapter, result)
+        return result
+
+    return list(await asyncio.gather(*(run(chapter) for chapter in chapters)))
@@ -1,20 +1,72 @@
 """SQLite database for tracking acquisition state."""
 
+import json
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Page rows buffered before they are written in one transaction
+DEFAULT_BATCH_SIZE = 100
+# Maximum age (seconds) of the oldest buffered row before a write flushes the batch
+DEFAULT_FLUSH_INTERVAL = 0.25
+
+# Kept as module constants so the connection's statement cache reuses the
+# prepared statements for every row
+_UPSERT_PAGE_SQL = """
+    INSERT OR REPLACE INTO pages
+    (source_id, series_id, chapter_id, page_index, filename, status, error, downloaded_at, size_bytes, sha256)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columns added after the first release, created on open if missing
+_PAGE_COLUMN_MIGRATIONS = (("size_bytes", "INTEGER"), ("sha256", "TEXT"))
 
 
 class AcquisitionDB:
-    """Database for tracking series, chapters, and page download state."""
+    """Database for tracking series, chapters, and page download state.
+
+    The database runs in WAL mode, so readers (e.g. a second ``manhwa``
+    process) never block the downloader. Page status rows are buffered and
+    written in one transaction per ``batch_size`` rows, or once the oldest
+    buffered row is ``flush_interval`` seconds old. Reads and close() flush
+    first, so callers always see their own writes.
 
-    def __init__(self, db_path: Path):
+    One connection is shared by all threads behind a lock, so download worker
+    threads can record pages directly.
+
+    Args:
+        db_path: Path to the SQLite file
+        batch_size: Page rows per write transaction (1 commits every row)
+        flush_interval: Seconds a buffered row may wait for more rows
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
         """Initialize database connection and create schema if needed."""
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(db_path))
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps committed transactions durable across application crashes
+        # at NORMAL; only an OS crash can lose the last few batches
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+
+        self._lock = threading.RLock()
+        self._pending: List[Tuple] = []
+        self._pending_since = 0.0
         self._create_schema()
 
     def _create_schema(self):
@@ -57,116 +109,321 @@ class AcquisitionDB:
                 status TEXT NOT NULL DEFAULT 'pending',
                 error TEXT,
                 downloaded_at TEXT,
+                size_bytes INTEGER,
+                sha256 TEXT,
                 UNIQUE(source_id, series_id, chapter_id, page_index)
             )
         """)
 
+        existing = {row["name"] for row in cursor.execute("PRAGMA table_info(pages)")}
+        for column, column_type in _PAGE_COLUMN_MIGRATIONS:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE pages ADD COLUMN {column} {column_type}")
+
+        # Last fetched chapter list of each series, with its HTTP validators
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS series_listings (
+                source_id TEXT NOT NULL,
+                series_id TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                chapters_json TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (source_id, series_id)
+            )
+        """)
+
+        # Digests of files already hashed, valid while size and mtime are unchanged
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_digests (
+                path TEXT PRIMARY KEY,
+                size_bytes INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            )
+        """)
+
+        # Status lookups: per-chapter page counts and "what failed" queries
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pages_chapter_status
+            ON pages (source_id, series_id, chapter_id, status)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pages_status
+            ON pages (status)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chapters_status
+            ON chapters (source_id, series_id, status)
+        """)
+
         self.conn.commit()
 
     def register_series(self, source_id: str, series_id: str, title: str) -> int:
         """Register a series in the database."""
-        cursor = self.conn.cursor()
         created_at = datetime.utcnow().isoformat()
 
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO series (source_id, series_id, title, created_at)
-            VALUES (?, ?, ?, ?)
-        """,
-            (source_id, series_id, title, created_at),
-        )
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO series (source_id, series_id, title, created_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                (source_id, series_id, title, created_at),
+            )
 
-        self.conn.commit()
+            self.conn.commit()
 
-        cursor.execute(
-            """
-            SELECT id FROM series WHERE source_id = ? AND series_id = ?
-        """,
-            (source_id, series_id),
-        )
+            cursor.execute(
+                """
+                SELECT id FROM series WHERE source_id = ? AND series_id = ?
+            """,
+                (source_id, series_id),
+            )
 
-        result = cursor.fetchone()
+            result = cursor.fetchone()
         return result[0] if result else -1
 
     def register_chapter(
         self, source_id: str, series_id: str, chapter_id: str, chapter_title: str, page_count: Optional[int] = None
     ) -> int:
         """Register a chapter in the database."""
-        cursor = self.conn.cursor()
         created_at = datetime.utcnow().isoformat()
 
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO chapters
-            (source_id, series_id, chapter_id, chapter_title, page_count, created_at, status)
-            VALUES (?, ?, ?, ?, ?, ?, 'pending')
-        """,
-            (source_id, series_id, chapter_id, chapter_title, page_count, created_at),
-        )
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO chapters
+                (source_id, series_id, chapter_id, chapter_title, page_count, created_at, status)
+                VALUES (?, ?, ?, ?, ?, ?, 'pending')
+            """,
+                (source_id, series_id, chapter_id, chapter_title, page_count, created_at),
+            )
 
-        self.conn.commit()
+            self.conn.commit()
 
-        cursor.execute(
-            """
-            SELECT id FROM chapters
-            WHERE source_id = ? AND series_id = ? AND chapter_id = ?
-        """,
-            (source_id, series_id, chapter_id),
-        )
+            cursor.execute(
+                """
+                SELECT id FROM chapters
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ?
+            """,
+                (source_id, series_id, chapter_id),
+            )
 
-        result = cursor.fetchone()
+            result = cursor.fetchone()
         return result[0] if result else -1
 
+    def _queue_page_row(self, row: Tuple) -> None:
+        """Buffer a page row, writing the batch when it is full or old enough."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending:
+                self._pending_since = now
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size or now - self._pending_since >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered page rows in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            with self.conn:
+                self.conn.executemany(_UPSERT_PAGE_SQL, rows)
+
+    def get_chapter_ids(self, source_id: str, series_id: str) -> Set[str]:
+        """Return the ids of every chapter registered for a series."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT chapter_id FROM chapters WHERE source_id = ? AND series_id = ?", (source_id, series_id)
+            ).fetchall()
+        return {row["chapter_id"] for row in rows}
+
+    def get_series_listing(self, source_id: str, series_id: str) -> Optional[dict]:
+        """Return the last stored chapter list of a series.
+
+        Returns:
+            {"etag", "last_modified", "chapters", "fetched_at"} with chapters as
+            a list of dicts, or None if the series was never listed
+        """
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT etag, last_modified, chapters_json, fetched_at FROM series_listings
+                WHERE source_id = ? AND series_id = ?
+            """,
+                (source_id, series_id),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "chapters": json.loads(row["chapters_json"]),
+            "fetched_at": row["fetched_at"],
+        }
+
+    def store_series_listing(
+        self,
+        source_id: str,
+        series_id: str,
+        chapters: List[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a series' chapter list and the validators to revalidate it with."""
+        fetched_at = datetime.utcnow().isoformat()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO series_listings
+                (source_id, series_id, etag, last_modified, chapters_json, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (source_id, series_id, etag, last_modified, json.dumps(chapters, ensure_ascii=False), fetched_at),
+            )
+            self.conn.commit()
+
+    def set_chapter_page_count(self, source_id: str, series_id: str, chapter_id: str, page_count: int) -> None:
+        """Record the real page count of a chapter once the adapter reports it."""
+        with self._lock:
+            self.conn.execute(
+                """
+                UPDATE chapters SET page_count = ?
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ?
+            """,
+                (page_count, source_id, series_id, chapter_id),
+            )
+            self.conn.commit()
+
     def mark_page_downloaded(
-        self, source_id: str, series_id: str, chapter_id: str, page_index: int, filename: str
+        self,
+        source_id: str,
+        series_id: str,
+        chapter_id: str,
+        page_index: int,
+        filename: str,
+        size_bytes: Optional[int] = None,
+        sha256: Optional[str] = None,
     ) -> None:
-        """Mark a page as successfully downloaded."""
-        cursor = self.conn.cursor()
+        """Mark a page as successfully downloaded, with its size and checksum if known."""
         downloaded_at = datetime.utcnow().isoformat()
-
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO pages
-            (source_id, series_id, chapter_id, page_index, filename, status, downloaded_at)
-            VALUES (?, ?, ?, ?, ?, 'downloaded', ?)
-        """,
-            (source_id, series_id, chapter_id, page_index, filename, downloaded_at),
+        self._queue_page_row(
+            (source_id, series_id, chapter_id, page_index, filename, "downloaded", None, downloaded_at, size_bytes, sha256)
         )
 
-        self.conn.commit()
-
     def mark_page_failed(
         self, source_id: str, series_id: str, chapter_id: str, page_index: int, error: str
     ) -> None:
         """Mark a page download as failed."""
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO pages
-            (source_id, series_id, chapter_id, page_index, status, error)
-            VALUES (?, ?, ?, ?, 'failed', ?)
-        """,
-            (source_id, series_id, chapter_id, page_index, error),
-        )
-
-        self.conn.commit()
+        self._queue_page_row((source_id, series_id, chapter_id, page_index, None, "failed", error, None, None, None))
 
     def get_chapter_status(self, source_id: str, series_id: str, chapter_id: str) -> Optional[dict]:
         """Get status of a chapter."""
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT * FROM chapters
-            WHERE source_id = ? AND series_id = ? AND chapter_id = ?
-        """,
-            (source_id, series_id, chapter_id),
-        )
+        with self._lock:
+            self.flush()
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM chapters
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ?
+            """,
+                (source_id, series_id, chapter_id),
+            )
 
-        result = cursor.fetchone()
+            result = cursor.fetchone()
         return dict(result) if result else None
 
+    def get_page_rows(self, source_id: str, series_id: str, chapter_id: str) -> Dict[int, dict]:
+        """Return every recorded page of a chapter in one query.
+
+        Returns:
+            {page_index: {"status", "filename", "size_bytes", "sha256"}}
+        """
+        with self._lock:
+            self.flush()
+            cursor = self.conn.execute(
+                """
+                SELECT page_index, status, filename, size_bytes, sha256 FROM pages
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ?
+            """,
+                (source_id, series_id, chapter_id),
+            )
+            rows = cursor.fetchall()
+        return {row["page_index"]: {key: row[key] for key in row.keys() if key != "page_index"} for row in rows}
+
+    def count_pages_by_status(self, source_id: str, series_id: str, chapter_id: str) -> Dict[str, int]:
+        """Return {status: page count} for a chapter."""
+        with self._lock:
+            self.flush()
+            cursor = self.conn.execute(
+                """
+                SELECT status, COUNT(*) FROM pages
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ?
+                GROUP BY status
+            """,
+                (source_id, series_id, chapter_id),
+            )
+            return {status: count for status, count in cursor.fetchall()}
+
+    def get_failed_pages(self, source_id: str, series_id: str, chapter_id: str) -> List[dict]:
+        """Return the failed pages of a chapter with their errors, in page order."""
+        with self._lock:
+            self.flush()
+            cursor = self.conn.execute(
+                """
+                SELECT page_index, error FROM pages
+                WHERE source_id = ? AND series_id = ? AND chapter_id = ? AND status = 'failed'
+                ORDER BY page_index
+            """,
+                (source_id, series_id, chapter_id),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_downloaded_pages(self, source_id: Optional[str] = None, series_id: Optional[str] = None) -> List[dict]:
+        """Return downloaded page rows, optionally limited to a source or series.
+
+        Returns:
+            Dicts with source_id, series_id, chapter_id, page_index, filename,
+            size_bytes and sha256, in chapter and page order
+        """
+        query = """
+            SELECT source_id, series_id, chapter_id, page_index, filename, size_bytes, sha256 FROM pages
+            WHERE status = 'downloaded'
+        """
+        params: List[str] = []
+        if source_id is not None:
+            query += " AND source_id = ?"
+            params.append(source_id)
+        if series_id is not None:
+            query += " AND series_id = ?"
+            params.append(series_id)
+        query += " ORDER BY source_id, series_id, chapter_id, page_index"
+
+        with self._lock:
+            self.flush()
+            return [dict(row) for row in self.conn.execute(query, params).fetchall()]
+
+    def get_file_digests(self) -> Dict[str, Tuple[int, int, str]]:
+        """Return the digest cache as {path: (size_bytes, mtime_ns, sha256)}."""
+        with self._lock:
+            rows = self.conn.execute("SELECT path, size_bytes, mtime_ns, sha256 FROM file_digests").fetchall()
+        return {row["path"]: (row["size_bytes"], row["mtime_ns"], row["sha256"]) for row in rows}
+
+    def store_file_digests(self, digests: List[Tuple[str, int, int, str]]) -> None:
+        """Cache (path, size_bytes, mtime_ns, sha256) entries in one transaction."""
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO file_digests (path, size_bytes, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                    digests,
+                )
+
     def close(self):
-        """Close database connection."""
-        self.conn.close()
+        """Flush buffered rows and close the database connection."""
+        with self._lock:
+            self.flush()
+            self.conn.close()
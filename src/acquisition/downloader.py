@@ -1,22 +1,27 @@
 """Concurrent chapter downloader with resume support and exponential backoff."""
 
 import json
+import queue
 import random
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from .adapter import ChapterInfo, PageMetadata, SourceAdapter
 from .db import AcquisitionDB
 from .storage import (
     compute_sha256,
+    discard_damaged_blob,
     get_chapter_path,
     get_metadata_path,
     get_page_path,
     get_pages_path,
+    store_page_blob,
 )
 
 
@@ -31,14 +36,35 @@ class DownloadResult:
         self.errors = errors
 
 
+def _backoff_seconds(attempt: int) -> float:
+    """Return the exponential backoff delay (with jitter) before retry attempt+1."""
+    return (2**attempt) + random.uniform(0, 1)
+
+
+def _finalize_page(part_file: Path, output_path: Path, metadata: PageMetadata, blob_root: Optional[Path]) -> None:
+    """Move a finished .part download to its final name, via the blob store if enabled."""
+    # Adapters report the name they were given, i.e. the .part file
+    metadata.filename = output_path.name
+    if blob_root is not None and metadata.sha256:
+        store_page_blob(blob_root, part_file, metadata.sha256, output_path)
+    else:
+        part_file.rename(output_path)
+
+
 def _download_page_with_retry(
     adapter: SourceAdapter,
     chapter_info: ChapterInfo,
     page_index: int,
     output_path: Path,
     max_retries: int = 5,
+    blob_root: Optional[Path] = None,
 ) -> tuple[int, bool, Optional[PageMetadata], Optional[str]]:
-    """Download a single page with exponential backoff retry."""
+    """Download a single page with exponential backoff retry.
+
+    Throttled attempts are retried without the per-page backoff: the
+    adapter's rate limiter already holds every worker back for the source.
+    With blob_root, the page is deduplicated into the content-addressed store.
+    """
     part_file = output_path.with_suffix(output_path.suffix + ".part")
 
     for attempt in range(max_retries):
@@ -48,22 +74,21 @@ def _download_page_with_retry(
 
             if result.success and result.metadata:
                 # Rename .part to final name on success
-                part_file.rename(output_path)
+                _finalize_page(part_file, output_path, result.metadata, blob_root)
                 return (page_index, True, result.metadata, None)
             else:
                 error = result.error or "Unknown error"
                 if attempt < max_retries - 1:
-                    # Exponential backoff with jitter
-                    backoff = (2**attempt) + random.uniform(0, 1)
-                    time.sleep(backoff)
+                    if not result.throttled:
+                        # Exponential backoff with jitter
+                        time.sleep(_backoff_seconds(attempt))
                 else:
                     return (page_index, False, None, error)
 
         except Exception as e:
             error = str(e)
             if attempt < max_retries - 1:
-                backoff = (2**attempt) + random.uniform(0, 1)
-                time.sleep(backoff)
+                time.sleep(_backoff_seconds(attempt))
             else:
                 return (page_index, False, None, error)
 
@@ -87,15 +112,191 @@ def _write_page_manifest(
         json.dump(manifest, f, indent=2)
 
 
-def download_chapter(
+# Page count assumed for adapters that cannot report one
+UNKNOWN_PAGE_COUNT = 100
+
+
+def _count_pages(adapter: SourceAdapter, chapter_info: ChapterInfo) -> Optional[int]:
+    """Return the chapter's page count, listing its pages once if the listing did not say."""
+    if chapter_info.page_count:
+        return chapter_info.page_count
+    if hasattr(adapter, "list_pages"):
+        return len(adapter.list_pages(chapter_info))
+    return None
+
+
+def _page_file_matches(output_path: Path, row: dict) -> bool:
+    """Check a downloaded page against its recorded size, then its checksum.
+
+    The file is only hashed if its size matches; either check is skipped when
+    the database has no value for it.
+    """
+    try:
+        size = output_path.stat().st_size
+    except OSError:
+        return False
+    if row.get("size_bytes") is not None and size != row["size_bytes"]:
+        return False
+    if row.get("sha256"):
+        return compute_sha256(output_path) == row["sha256"]
+    return True
+
+
+def _manifest_marks_downloaded(pages_dir: Path, page_idx: int, output_path: Path) -> bool:
+    """Return True if a page's manifest says it was downloaded (chapters without database rows)."""
+    if not output_path.exists():
+        return False
+    manifest_path = pages_dir / f"page_{page_idx:03d}.json"
+    try:
+        with open(manifest_path) as f:
+            return bool(json.load(f).get("success"))
+    except Exception:
+        return False  # Re-download if manifest is missing or corrupt
+
+
+def _plan_pages(
+    chapter_info: ChapterInfo,
+    root_path: Path,
+    total_pages: int,
+    resume: bool,
+    db: Optional[AcquisitionDB] = None,
+    verify: bool = False,
+    verify_workers: int = 4,
+) -> list[tuple[int, Path]]:
+    """Return (page_index, output_path) for every page that still needs downloading.
+
+    The database's pages table is the resume index: one query decides which
+    pages are done, and only a stat confirms their files still exist. Chapters with no database rows (downloaded before the
+    index existed) fall back to reading the per-page manifests. With verify,
+    pages the index marks done are checked against their recorded size and
+    sha256 in parallel, and mismatches are downloaded again.
+    """
+    pages_dir = get_pages_path(root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id)
+    output_paths = [
+        get_page_path(root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, page_idx, "png")
+        for page_idx in range(total_pages)
+    ]
+    if not resume:
+        return list(enumerate(output_paths))
+
+    rows = db.get_page_rows(chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id) if db else {}
+    if rows:
+        done = {
+            page_idx: row
+            for page_idx, row in rows.items()
+            if row["status"] == "downloaded" and page_idx < total_pages and output_paths[page_idx].exists()
+        }
+        if verify and done:
+            with ThreadPoolExecutor(max_workers=verify_workers) as executor:
+                checks = dict(
+                    zip(done, executor.map(lambda idx: _page_file_matches(output_paths[idx], done[idx]), done))
+                )
+            for page_idx, ok in checks.items():
+                if not ok and done[page_idx].get("sha256"):
+                    discard_damaged_blob(root_path, done[page_idx]["sha256"], output_paths[page_idx])
+            done = {page_idx: row for page_idx, row in done.items() if checks[page_idx]}
+    else:
+        done = {
+            page_idx for page_idx, output_path in enumerate(output_paths)
+            if _manifest_marks_downloaded(pages_dir, page_idx, output_path)
+        }
+
+    return [(page_idx, output_path) for page_idx, output_path in enumerate(output_paths) if page_idx not in done]
+
+
+class _ChapterProgress:
+    """Collects page outcomes for a chapter and records them in manifests and the database.
+
+    record() may be called from any thread.
+    """
+
+    def __init__(self, chapter_info: ChapterInfo, pages_dir: Path, db: AcquisitionDB):
+        self.chapter_info = chapter_info
+        self.pages_dir = pages_dir
+        self.db = db
+        self.pages_downloaded = 0
+        self.pages_failed = 0
+        self.errors: list[str] = []
+        self.page_metadata_list: list[PageMetadata] = []
+        self._lock = threading.Lock()
+
+    def record(self, page_idx: int, success: bool, metadata: Optional[PageMetadata], error: Optional[str]) -> None:
+        """Record the outcome of one page."""
+        chapter_info = self.chapter_info
+        # Counted only once the outcome is saved, so a failed save can be counted as a failure instead
+        if success and metadata:
+            _write_page_manifest(self.pages_dir, page_idx, metadata, True)
+            self.db.mark_page_downloaded(
+                chapter_info.source_id,
+                chapter_info.series_id,
+                chapter_info.chapter_id,
+                page_idx,
+                metadata.filename,
+                metadata.size_bytes,
+                metadata.sha256,
+            )
+            with self._lock:
+                self.pages_downloaded += 1
+                self.page_metadata_list.append(metadata)
+        else:
+            _write_page_manifest(self.pages_dir, page_idx, None, False, error)
+            self.db.mark_page_failed(chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, page_idx, error or "Unknown error")
+            with self._lock:
+                self.pages_failed += 1
+                if error:
+                    self.errors.append(f"Page {page_idx}: {error}")
+
+    def record_unsaved(self, page_idx: int, error: str) -> None:
+        """Count a page whose download or record() raised as failed, without touching disk."""
+        with self._lock:
+            self.pages_failed += 1
+            self.errors.append(f"Page {page_idx}: {error}")
+
+    def finish(self, root_path: Path, total_pages: int) -> DownloadResult:
+        """Write chapter metadata.json and return the chapter result."""
+        # The chapter's page rows are committed before it is reported done
+        self.db.flush()
+        chapter_info = self.chapter_info
+        pages_downloaded = self.pages_downloaded
+        pages_failed = self.pages_failed
+
+        # Write chapter metadata
+        chapter_metadata = {
+            "source_id": chapter_info.source_id,
+            "series_id": chapter_info.series_id,
+            "chapter_id": chapter_info.chapter_id,
+            "chapter_title": chapter_info.chapter_title,
+            "page_count": total_pages,
+            "acquired_at": datetime.utcnow().isoformat(),
+            "source_url": chapter_info.chapter_url,
+            "status": "complete" if pages_failed == 0 else "partial" if pages_downloaded > 0 else "failed",
+            "pages": [asdict(m) for m in sorted(self.page_metadata_list, key=lambda x: x.index)],
+        }
+
+        metadata_path = get_metadata_path(
+            root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id
+        )
+        with open(metadata_path, "w") as f:
+            json.dump(chapter_metadata, f, indent=2)
+
+        return DownloadResult(
+            success=(pages_failed == 0), pages_downloaded=pages_downloaded, pages_failed=pages_failed, errors=self.errors
+        )
+
+
+def _start_chapter(
     adapter: SourceAdapter,
     chapter_info: ChapterInfo,
     root_path: Path,
     db: AcquisitionDB,
-    max_workers: int = 4,
-    resume: bool = True,
-) -> DownloadResult:
-    """Download all pages of a chapter with concurrency and resume support."""
+    resume: bool,
+    verify: bool = False,
+) -> tuple[int, Path, list[tuple[int, Path]]]:
+    """Register a chapter, create its pages directory and plan its downloads.
+
+    Returns:
+        (total_pages, pages_dir, pages_to_download)
+    """
     # Register chapter in database
     db.register_chapter(
         chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, chapter_info.chapter_title,
@@ -107,83 +308,189 @@ def download_chapter(
     pages_dir.mkdir(parents=True, exist_ok=True)
 
     # Determine pages to download
-    total_pages = chapter_info.page_count or 100  # Default to 100 if unknown
-    pages_to_download = []
+    total_pages = _record_page_count(db, chapter_info, _count_pages(adapter, chapter_info))
+    return total_pages, pages_dir, _plan_pages(chapter_info, root_path, total_pages, resume, db, verify)
 
-    for page_idx in range(total_pages):
-        output_path = get_page_path(
-            root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, page_idx, "png"
-        )
 
-        # Check if page already exists and is valid (resume support)
-        if resume and output_path.exists():
-            manifest_path = pages_dir / f"page_{page_idx:03d}.json"
-            if manifest_path.exists():
-                try:
-                    with open(manifest_path) as f:
-                        manifest = json.load(f)
-                        if manifest.get("success"):
-                            continue  # Skip already downloaded page
-                except Exception:
-                    pass  # Re-download if manifest is corrupt
+def _record_page_count(db: AcquisitionDB, chapter_info: ChapterInfo, page_count: Optional[int]) -> int:
+    """Store the adapter's page count for the chapter and return the count to plan with."""
+    if not page_count:
+        return UNKNOWN_PAGE_COUNT
+    if page_count != chapter_info.page_count:
+        db.set_chapter_page_count(chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, page_count)
+    return page_count
+
 
-        pages_to_download.append((page_idx, output_path))
+def download_chapter(
+    adapter: SourceAdapter,
+    chapter_info: ChapterInfo,
+    root_path: Path,
+    db: AcquisitionDB,
+    max_workers: int = 4,
+    resume: bool = True,
+    verify: bool = False,
+    dedup: bool = False,
+) -> DownloadResult:
+    """Download all pages of a chapter with concurrency and resume support.
+
+    With verify, pages already recorded as downloaded are re-checked against
+    their size and sha256 and downloaded again if they do not match. With
+    dedup, pages are stored once per distinct content under root_path/blobs
+    and hard-linked into the chapter.
+    """
+    total_pages, pages_dir, pages_to_download = _start_chapter(adapter, chapter_info, root_path, db, resume, verify)
 
     if not pages_to_download:
         return DownloadResult(success=True, pages_downloaded=0, pages_failed=0, errors=[])
 
-    # Download pages concurrently
-    pages_downloaded = 0
-    pages_failed = 0
-    errors = []
-    page_metadata_list = []
+    # Download pages concurrently; each worker records its own page
+    progress = _ChapterProgress(chapter_info, pages_dir, db)
+    blob_root = root_path if dedup else None
+
+    def download_and_record(page_idx: int, output_path: Path) -> None:
+        progress.record(
+            *_download_page_with_retry(adapter, chapter_info, page_idx, output_path, blob_root=blob_root)
+        )
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(_download_page_with_retry, adapter, chapter_info, page_idx, output_path): page_idx
-            for page_idx, output_path in pages_to_download
-        }
+        futures = [
+            executor.submit(download_and_record, page_idx, output_path) for page_idx, output_path in pages_to_download
+        ]
+        for future in futures:
+            future.result()
+
+    return progress.finish(root_path, total_pages)
+
+
+def download_chapters(
+    adapter: SourceAdapter,
+    chapters: list[ChapterInfo],
+    root_path: Path,
+    db: AcquisitionDB,
+    max_workers: int = 4,
+    resume: bool = True,
+    verify: bool = False,
+    dedup: bool = False,
+    queue_size: Optional[int] = None,
+    on_chapter_complete: Optional[Callable[[ChapterInfo, DownloadResult], None]] = None,
+) -> list[DownloadResult]:
+    """Download many chapters with one pool of workers fed from a shared page queue.
+
+    Pages are queued in chapter order, so workers always take pages of the
+    oldest unfinished chapter, and the next chapter's pages are queued while
+    the previous chapter's last pages are still downloading. The queue is
+    bounded, so later chapters are only planned (and their page lists
+    fetched) as workers free up. Each chapter's metadata.json is written as
+    soon as its last page finishes.
+
+    Workers write each page's manifest and database row themselves; the
+    calling thread only plans chapters and finishes them.
+
+    Args:
+        adapter: Source adapter
+        chapters: Chapters to download, oldest first
+        root_path: Data directory root
+        db: Acquisition database
+        max_workers: Concurrent page downloads across all chapters
+        resume: Skip pages the database records as downloaded
+        verify: Re-check skipped pages against their recorded size and sha256
+        dedup: Store identical pages once in the content-addressed blob store
+        queue_size: Max pages waiting for a worker (default 2 * max_workers)
+        on_chapter_complete: Optional callback invoked as each chapter finishes
+
+    Returns:
+        Results in the same order as chapters
+    """
+    work: queue.Queue = queue.Queue(maxsize=queue_size or max_workers * 2)
+    blob_root = root_path if dedup else None
+    done: queue.Queue = queue.Queue()
 
-        for future in as_completed(futures):
-            page_idx, success, metadata, error = future.result()
-
-            if success and metadata:
-                pages_downloaded += 1
-                page_metadata_list.append(metadata)
-                _write_page_manifest(pages_dir, page_idx, metadata, True)
-                db.mark_page_downloaded(
-                    chapter_info.source_id,
-                    chapter_info.series_id,
-                    chapter_info.chapter_id,
-                    page_idx,
-                    metadata.filename,
+    def worker() -> None:
+        while True:
+            task = work.get()
+            if task is None:
+                return
+            position, progress, page_idx, output_path = task
+            error: Optional[Exception] = None
+            try:
+                progress.record(
+                    *_download_page_with_retry(
+                        adapter, progress.chapter_info, page_idx, output_path, blob_root=blob_root
+                    )
                 )
-            else:
-                pages_failed += 1
-                if error:
-                    errors.append(f"Page {page_idx}: {error}")
-                _write_page_manifest(pages_dir, page_idx, None, False, error)
-                db.mark_page_failed(chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id, page_idx, error or "Unknown error")
-
-    # Write chapter metadata
-    chapter_metadata = {
-        "source_id": chapter_info.source_id,
-        "series_id": chapter_info.series_id,
-        "chapter_id": chapter_info.chapter_id,
-        "chapter_title": chapter_info.chapter_title,
-        "page_count": total_pages,
-        "acquired_at": datetime.utcnow().isoformat(),
-        "source_url": chapter_info.chapter_url,
-        "status": "complete" if pages_failed == 0 else "partial" if pages_downloaded > 0 else "failed",
-        "pages": [asdict(m) for m in sorted(page_metadata_list, key=lambda x: x.index)],
-    }
+            except Exception as e:
+                # e.g. the manifest or database write failed
+                error = e
+            finally:
+                # Always report back, or the calling thread waits for this page forever
+                done.put((position, page_idx, error))
 
-    metadata_path = get_metadata_path(
-        root_path, chapter_info.source_id, chapter_info.series_id, chapter_info.chapter_id
-    )
-    with open(metadata_path, "w") as f:
-        json.dump(chapter_metadata, f, indent=2)
+    threads = [threading.Thread(target=worker, name=f"page-worker-{i}", daemon=True) for i in range(max_workers)]
+    for thread in threads:
+        thread.start()
 
-    return DownloadResult(
-        success=(pages_failed == 0), pages_downloaded=pages_downloaded, pages_failed=pages_failed, errors=errors
-    )
+    results: list[Optional[DownloadResult]] = [None] * len(chapters)
+    # position -> [progress, pages remaining, total pages]
+    active: dict[int, list] = {}
+    waiting: deque = deque()
+    next_chapter = 0
+    outstanding = 0
+
+    def complete(position: int, result: DownloadResult) -> None:
+        results[position] = result
+        if on_chapter_complete:
+            on_chapter_complete(chapters[position], result)
+
+    def plan_next_chapter() -> None:
+        nonlocal next_chapter
+        position = next_chapter
+        next_chapter += 1
+        chapter_info = chapters[position]
+        try:
+            total_pages, pages_dir, pages_to_download = _start_chapter(
+                adapter, chapter_info, root_path, db, resume, verify
+            )
+        except Exception as e:
+            # e.g. the page list could not be fetched; other chapters carry on
+            complete(position, DownloadResult(success=False, pages_downloaded=0, pages_failed=0, errors=[str(e)]))
+            return
+
+        if not pages_to_download:
+            complete(position, DownloadResult(success=True, pages_downloaded=0, pages_failed=0, errors=[]))
+            return
+
+        progress = _ChapterProgress(chapter_info, pages_dir, db)
+        active[position] = [progress, len(pages_to_download), total_pages]
+        waiting.extend((position, progress, page_idx, output_path) for page_idx, output_path in pages_to_download)
+
+    try:
+        while True:
+            # Keep the work queue full, planning further chapters as needed
+            while not work.full():
+                if not waiting:
+                    if next_chapter >= len(chapters):
+                        break
+                    plan_next_chapter()
+                    continue
+                work.put_nowait(waiting.popleft())
+                outstanding += 1
+
+            if outstanding == 0:
+                break
+
+            position, page_idx, error = done.get()
+            outstanding -= 1
+            state = active[position]
+            if error is not None:
+                state[0].record_unsaved(page_idx, f"Failed to record page: {error}")
+            state[1] -= 1
+            if state[1] == 0:
+                del active[position]
+                complete(position, state[0].finish(root_path, state[2]))
+    finally:
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+
+    return results
@@ -1,18 +1,50 @@
 """Filesystem-based source adapter for testing and local chapter libraries."""
 
-import hashlib
+import io
+import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from PIL import Image
 
 from .adapter import (
     ChapterInfo,
     ChapterMetadata,
     PageDownloadResult,
+    PageInfo,
     PageMetadata,
     SeriesInfo,
 )
+from .storage import write_hashed
+
+
+# Bytes per read when copying a page; large reads keep syscalls per page low
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_chunks(path: Path, chunk_size: int = COPY_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in chunks."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _image_size(header: bytes, fallback_path: Path) -> Tuple[int, int]:
+    """Return (width, height) parsed from the first bytes of an image.
+
+    Formats whose header does not fit in those bytes are read from
+    fallback_path instead; PIL only reads as far as the header either way.
+    """
+    try:
+        with Image.open(io.BytesIO(header)) as img:
+            return img.size
+    except Exception:
+        with Image.open(fallback_path) as img:
+            return img.size
 
 
 class FilesystemAdapter:
@@ -22,6 +54,26 @@ class FilesystemAdapter:
         """Initialize filesystem adapter with source ID and root directory."""
         self.source_id = source_id
         self.root_path = Path(root_path)
+        # chapter dir -> (dir mtime_ns, sorted page files)
+        self._page_files: Dict[Path, Tuple[int, List[Path]]] = {}
+        self._page_files_lock = threading.Lock()
+
+    def _list_page_files(self, chapter_path: Path) -> List[Path]:
+        """Return the sorted page images of a chapter directory.
+
+        Listings are cached per directory and reused until the directory's
+        mtime changes (files added, removed or renamed).
+        """
+        mtime_ns = chapter_path.stat().st_mtime_ns
+        with self._page_files_lock:
+            cached = self._page_files.get(chapter_path)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+
+        page_files = sorted(chapter_path.glob("*.png"))
+        with self._page_files_lock:
+            self._page_files[chapter_path] = (mtime_ns, page_files)
+        return page_files
 
     def discover_series(self, query: str) -> list[SeriesInfo]:
         """Search for series by matching directory names."""
@@ -53,7 +105,7 @@ class FilesystemAdapter:
 
         for chapter_dir in sorted(series_path.iterdir()):
             if chapter_dir.is_dir():
-                page_count = len(list(chapter_dir.glob("*.png")))
+                page_count = len(self._list_page_files(chapter_dir))
                 chapters.append(
                     ChapterInfo(
                         source_id=self.source_id,
@@ -66,13 +118,22 @@ class FilesystemAdapter:
                 )
         return chapters
 
+    def list_pages(self, chapter_info: ChapterInfo) -> list[PageInfo]:
+        """List the page image files of a chapter directory."""
+        chapter_path = Path(chapter_info.chapter_url)
+        return [PageInfo(index=i, url=str(path)) for i, path in enumerate(self._list_page_files(chapter_path))]
+
     def download_page(
         self, chapter_info: ChapterInfo, page_index: int, output_path: Path
     ) -> PageDownloadResult:
-        """Copy a page from filesystem to output path."""
+        """Copy a page from filesystem to output path.
+
+        The file is read once: it is hashed while it is copied, and the
+        dimensions come from the header of the first chunk.
+        """
         try:
             chapter_path = Path(chapter_info.chapter_url)
-            page_files = sorted(chapter_path.glob("*.png"))
+            page_files = self._list_page_files(chapter_path)
 
             if page_index >= len(page_files):
                 return PageDownloadResult(
@@ -86,19 +147,20 @@ class FilesystemAdapter:
             source_file = page_files[page_index]
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Copy file
-            import shutil
-
-            shutil.copy2(source_file, output_path)
+            header = b""
 
-            # Generate metadata
-            with Image.open(output_path) as img:
-                width, height = img.size
+            def chunks() -> Iterator[bytes]:
+                nonlocal header
+                for chunk in _read_chunks(source_file):
+                    if not header:
+                        header = chunk
+                    yield chunk
 
-            file_size = output_path.stat().st_size
+            # Copy and hash in one pass
+            file_size, sha256 = write_hashed(chunks(), output_path)
+            shutil.copystat(source_file, output_path)
 
-            with open(output_path, "rb") as f:
-                sha256 = hashlib.sha256(f.read()).hexdigest()
+            width, height = _image_size(header, output_path)
 
             metadata = PageMetadata(
                 index=page_index,
@@ -0,0 +1,159 @@
+"""Async HTTP client with a global request budget and per-host connection limits."""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .rate_limit import RateLimiter
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Bytes read from the network per write when streaming to disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncHTTPClient:
+    """Shared httpx.AsyncClient for acquisition.
+
+    Connections are kept alive and reused (HTTP/1.1, or HTTP/2 when enabled
+    and the ``h2`` package is installed). ``max_connections`` bounds requests
+    in flight across all hosts; ``max_per_host`` bounds them per host so one
+    image CDN cannot take the whole budget.
+
+    Use as an async context manager::
+
+        async with AsyncHTTPClient(max_connections=32, max_per_host=8) as client:
+            size, sha256 = await client.stream_to_file(url, path)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 16,
+        max_per_host: int = 4,
+        http2: bool = False,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Configure the client; connections are opened lazily."""
+        if max_connections < 1 or max_per_host < 1:
+            raise ValueError("max_connections and max_per_host must be at least 1")
+
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.http2 = http2
+        self.timeout = timeout
+        self.headers = {"User-Agent": DEFAULT_USER_AGENT, **(headers or {})}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncHTTPClient":
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise RuntimeError("HTTP/2 requires the h2 package (pip install httpx[http2])")
+
+        self._client = httpx.AsyncClient(
+            http2=self.http2,
+            timeout=self.timeout,
+            headers=self.headers,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_connections, max_keepalive_connections=self.max_connections
+            ),
+        )
+        self._global_slots = asyncio.Semaphore(self.max_connections)
+        self._host_slots = {}
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    def _require_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("AsyncHTTPClient must be used as an async context manager")
+        return self._client
+
+    async def get_text(
+        self, url: str, headers: Optional[Dict[str, str]] = None, rate_limiter: Optional[RateLimiter] = None
+    ) -> str:
+        """GET a URL and return the response body as text.
+
+        If a rate limiter is given, the request waits for a token first and
+        the response status is fed back to it.
+
+        Raises:
+            httpx.HTTPError: On network errors or non-2xx responses.
+        """
+        client = self._require_client()
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+        async with self._host_slot(url), self._global_slots:
+            response = await client.get(url, headers=headers)
+            if rate_limiter is not None:
+                rate_limiter.record_response(response.status_code, response.headers.get("retry-after"))
+            response.raise_for_status()
+            return response.text
+
+    async def stream_to_file(
+        self,
+        url: str,
+        output_path: Path,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> Tuple[int, str]:
+        """Stream a URL to disk, hashing as the bytes arrive.
+
+        The body is never held in memory in full, and the file is hashed in
+        the same pass that writes it. Rate limiting is as for get_text.
+
+        Returns:
+            (size_bytes, sha256 hex digest)
+
+        Raises:
+            httpx.HTTPError: On network errors or non-2xx responses.
+        """
+        client = self._require_client()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        sha256_hash = hashlib.sha256()
+        size = 0
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+        async with self._host_slot(url), self._global_slots:
+            async with client.stream("GET", url, headers=headers) as response:
+                if rate_limiter is not None:
+                    rate_limiter.record_response(response.status_code, response.headers.get("retry-after"))
+                response.raise_for_status()
+                with open(output_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256_hash.update(chunk)
+                        size += len(chunk)
+
+        return size, sha256_hash.hexdigest()
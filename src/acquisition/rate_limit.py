@@ -0,0 +1,183 @@
+"""Per-source request rate limiting with adaptive backoff.
+
+Every HTTP request to a source takes a token from that source's bucket. When
+the source answers 429/503 the allowed rate is cut multiplicatively and any
+Retry-After is honoured by all workers at once; successful responses raise the
+rate again additively (AIMD), up to the configured ceiling.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+DEFAULT_RPS = 4.0
+DEFAULT_BURST = 8
+
+# Status codes a source uses to tell us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Thread-safe token bucket with AIMD rate adjustment.
+
+    The bucket is kept as a theoretical arrival time (GCRA), which is
+    equivalent to a token bucket holding ``burst`` tokens refilled at
+    ``rate`` per second but needs no background refill.
+
+    Args:
+        rate: Requests per second
+        burst: Requests allowed back-to-back after an idle period
+        min_rate: Floor the rate is never cut below
+        increase: Requests per second added after each successful response
+        decrease_factor: Multiplier applied to the rate on a throttle response
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RPS,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = 0.1,
+        increase: float = 0.1,
+        decrease_factor: float = 0.5,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+
+        self.requests = 0
+        self.throttle_events = 0
+        self.throttled_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._tat = 0.0
+        self._blocked_until = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            tolerance = interval * (self.burst - 1)
+
+            tat = max(self._tat, now)
+            allowed_at = max(tat - tolerance, self._blocked_until)
+            self._tat = max(tat, allowed_at) + interval
+
+            wait = max(0.0, allowed_at - now)
+            self.requests += 1
+            self.throttled_seconds += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Asyncio variant of acquire."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        """Additively raise the rate after a successful response."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Cut the rate and pause every caller for Retry-After (or one interval)."""
+        with self._lock:
+            self.throttle_events += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            blocked_until = time.monotonic() + pause
+            self._blocked_until = max(self._blocked_until, blocked_until)
+            # Restart paced rather than with a full burst
+            self._tat = max(self._tat, self._blocked_until + (self.burst - 1) / self.rate)
+
+    def record_response(self, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """Feed a response status back into the limiter.
+
+        Args:
+            status_code: HTTP status of the response
+            retry_after: Raw Retry-After header value, if any
+
+        Returns:
+            True if the response was a throttle response
+        """
+        if status_code in THROTTLE_STATUS_CODES:
+            self.on_throttle(parse_retry_after(retry_after))
+            return True
+        if status_code < 400:
+            self.on_success()
+        return False
+
+    def stats(self) -> dict:
+        """Return request, throttle and waiting counters."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "requests": self.requests,
+                "throttle_events": self.throttle_events,
+                "throttled_seconds": self.throttled_seconds,
+            }
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def configure_rate_limit(source_id: str, rate: float = DEFAULT_RPS, burst: int = DEFAULT_BURST) -> RateLimiter:
+    """Install a fresh rate limiter for a source and return it."""
+    limiter = RateLimiter(rate=rate, burst=burst)
+    with _LIMITERS_LOCK:
+        _LIMITERS[source_id] = limiter
+    return limiter
+
+
+def get_rate_limiter(source_id: str) -> RateLimiter:
+    """Return the process-wide rate limiter for a source, creating a default one."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(source_id)
+        if limiter is None:
+            limiter = RateLimiter()
+            _LIMITERS[source_id] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget all rate limiters (mainly for tests)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
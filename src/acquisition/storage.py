@@ -1,8 +1,15 @@
 """Storage utilities for deterministic file organization and verification."""
 
 import hashlib
+import os
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
+
+from ..hashing import sha256_file
+
+# Content-addressed page blobs live under {root}/blobs/ab/cd/abcd...
+BLOBS_DIR = "blobs"
 
 
 def get_series_path(root: Path, source_id: str, series_id: str) -> Path:
@@ -40,25 +47,152 @@ def get_metadata_path(root: Path, source_id: str, series_id: str, chapter_id: st
 
 def verify_sha256(file_path: Path, expected_sha256: str) -> bool:
     """Verify file SHA256 checksum matches expected value."""
-    if not file_path.exists():
-        return False
-
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-
-    return sha256_hash.hexdigest() == expected_sha256
+    return compute_sha256(file_path) == expected_sha256
 
 
 def compute_sha256(file_path: Path) -> Optional[str]:
-    """Compute SHA256 checksum of a file."""
-    if not file_path.exists():
+    """Compute SHA256 checksum of a file, or None if it does not exist."""
+    try:
+        return sha256_file(file_path)
+    except FileNotFoundError:
         return None
 
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
 
-    return sha256_hash.hexdigest()
+def write_hashed(chunks: Iterable[bytes], output_path: Path) -> Tuple[int, str]:
+    """Write chunks to a file, hashing them as they are written.
+
+    Returns:
+        (size_bytes, sha256 hex digest)
+    """
+    sha256_hash = hashlib.sha256()
+    size = 0
+    with open(output_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            sha256_hash.update(chunk)
+            size += len(chunk)
+    return size, sha256_hash.hexdigest()
+
+
+def get_blob_path(root: Path, sha256: str) -> Path:
+    """Return the content-addressed path of a blob, sharded by the first two hash bytes."""
+    return root / BLOBS_DIR / sha256[:2] / sha256[2:4] / sha256
+
+
+def blob_refcount(blob_path: Path) -> int:
+    """Return how many chapter files share a blob (its hard links besides the store's own)."""
+    return blob_path.stat().st_nlink - 1
+
+
+def _link_replace(source: Path, dest: Path) -> None:
+    """Atomically make dest a hard link to source."""
+    # Unique per call: concurrent downloads may link the same blob
+    tmp = dest.with_name(f"{dest.name}.{uuid.uuid4().hex[:12]}.link")
+    os.link(source, tmp)
+    try:
+        os.replace(tmp, dest)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def store_page_blob(root: Path, file_path: Path, sha256: str, dest_path: Path) -> bool:
+    """Move a downloaded file into the chapter layout, sharing identical content.
+
+    The chapter file becomes a hard link to the blob ``get_blob_path(root,
+    sha256)``; if the blob already exists, the new copy is discarded and the
+    existing blob is linked instead. Reference counts are the blobs' link
+    counts, so deleting a chapter directory releases its blobs without any
+    bookkeeping. On filesystems without hard links the file is simply moved
+    into place.
+
+    Args:
+        root: Data directory root
+        file_path: Freshly written file (e.g. the .part download)
+        sha256: Digest of file_path, computed while it was written
+        dest_path: Final page path in the chapter layout
+
+    Returns:
+        True if the content was already stored and the new copy was dropped
+    """
+    blob_path = get_blob_path(root, sha256)
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        existing = blob_path.stat()
+    except FileNotFoundError:
+        existing = None
+
+    # A blob of the wrong size was damaged in place; the new copy replaces it
+    if existing is not None and existing.st_size == file_path.stat().st_size:
+        try:
+            _link_replace(blob_path, dest_path)
+        except OSError:
+            os.replace(file_path, dest_path)
+            return False
+        file_path.unlink()
+        return True
+
+    os.replace(file_path, dest_path)
+    try:
+        if existing is None:
+            # Fails if another worker stored the same content meanwhile
+            os.link(dest_path, blob_path)
+        else:
+            _link_replace(dest_path, blob_path)
+    except FileExistsError:
+        try:
+            _link_replace(blob_path, dest_path)
+            return True
+        except OSError:
+            pass
+    except OSError:
+        pass  # No hard links here: the chapter keeps its own copy
+    return False
+
+
+def discard_damaged_blob(root: Path, sha256: str, page_path: Path) -> None:
+    """Remove a blob from the store if it is the same file as a page that failed verification.
+
+    A page damaged in place damages the blob it is linked to, so the blob must
+    not be reused when the page is downloaded again.
+    """
+    blob_path = get_blob_path(root, sha256)
+    try:
+        if os.path.samefile(blob_path, page_path):
+            blob_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def iter_blobs(root: Path) -> Iterator[Path]:
+    """Yield every blob in the store."""
+    blobs_dir = root / BLOBS_DIR
+    if not blobs_dir.is_dir():
+        return
+    for path in blobs_dir.glob("*/*/*"):
+        if path.is_file() and not path.name.endswith(".link"):
+            yield path
+
+
+def gc_blobs(root: Path, dry_run: bool = False) -> Tuple[int, int]:
+    """Delete blobs no chapter file links to any more.
+
+    Args:
+        root: Data directory root
+        dry_run: Only count what would be deleted
+
+    Returns:
+        (blobs_removed, bytes_freed)
+    """
+    removed = 0
+    freed = 0
+    for blob_path in iter_blobs(root):
+        if blob_refcount(blob_path) > 0:
+            continue
+        size = blob_path.stat().st_size
+        if not dry_run:
+            blob_path.unlink()
+        removed += 1
+        freed += size
+    return removed, freed
@@ -0,0 +1,141 @@
+"""Verification of downloaded pages against the checksums recorded at download time."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .db import AcquisitionDB
+from .storage import compute_sha256, get_pages_path
+
+
+@dataclass
+class PageCheck:
+    """The verification outcome of one page.
+
+    status is "ok", "missing", "size_mismatch" or "hash_mismatch".
+    """
+
+    source_id: str
+    series_id: str
+    chapter_id: str
+    page_index: int
+    path: Path
+    status: str
+    expected_sha256: Optional[str] = None
+    actual_sha256: Optional[str] = None
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of a verification run."""
+
+    checked: int = 0
+    hashed: int = 0
+    cached: int = 0
+    failures: List[PageCheck] = field(default_factory=list)
+
+    @property
+    def ok(self) -> int:
+        return self.checked - len(self.failures)
+
+
+def verify_pages(
+    root: Path,
+    db: AcquisitionDB,
+    source_id: Optional[str] = None,
+    series_id: Optional[str] = None,
+    workers: int = 4,
+    use_cache: bool = True,
+) -> VerifyReport:
+    """Check downloaded pages against their recorded size and sha256.
+
+    Sizes are compared first from a stat; only pages of the right size are
+    hashed, in parallel, and each file (inode) is hashed once even if
+    deduplicated pages link to it. Digests are cached in the database keyed
+    by path, size and mtime, so unchanged files are not hashed again on the
+    next run; pass use_cache=False to rehash everything.
+
+    Args:
+        root: Data directory root
+        db: Acquisition database holding the page rows
+        source_id: Only verify this source
+        series_id: Only verify this series
+        workers: Files hashed concurrently
+        use_cache: Reuse and update the digest cache
+
+    Returns:
+        Verification report
+    """
+    root = Path(root)
+    report = VerifyReport()
+    cache = db.get_file_digests() if use_cache else {}
+
+    # inode -> (path, size, mtime_ns); checks that need that file's digest
+    to_hash: Dict[Tuple[int, int], Tuple[Path, int, int]] = {}
+    pending: List[Tuple[PageCheck, Tuple[int, int]]] = []
+
+    for row in db.get_downloaded_pages(source_id, series_id):
+        path = get_pages_path(root, row["source_id"], row["series_id"], row["chapter_id"]) / row["filename"]
+        check = PageCheck(
+            row["source_id"], row["series_id"], row["chapter_id"], row["page_index"], path, "ok", row["sha256"]
+        )
+        report.checked += 1
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            check.status = "missing"
+            report.failures.append(check)
+            continue
+        if row["size_bytes"] is not None and stat.st_size != row["size_bytes"]:
+            check.status = "size_mismatch"
+            report.failures.append(check)
+            continue
+        if not row["sha256"]:
+            continue  # Downloaded before checksums were recorded
+
+        cached = cache.get(_cache_key(root, path))
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            report.cached += 1
+            check.actual_sha256 = cached[2]
+            if cached[2] != row["sha256"]:
+                check.status = "hash_mismatch"
+                report.failures.append(check)
+            continue
+
+        inode = (stat.st_dev, stat.st_ino)
+        to_hash.setdefault(inode, (path, stat.st_size, stat.st_mtime_ns))
+        pending.append((check, inode))
+
+    inodes = list(to_hash)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        digests = dict(zip(inodes, executor.map(lambda inode: compute_sha256(to_hash[inode][0]), inodes)))
+    report.hashed = len(digests)
+
+    for check, inode in pending:
+        check.actual_sha256 = digests[inode]
+        if digests[inode] is None:
+            check.status = "missing"  # Deleted while verifying
+            report.failures.append(check)
+        elif digests[inode] != check.expected_sha256:
+            check.status = "hash_mismatch"
+            report.failures.append(check)
+
+    if use_cache:
+        db.store_file_digests(
+            [
+                (_cache_key(root, check.path), to_hash[inode][1], to_hash[inode][2], digests[inode])
+                for check, inode in pending
+                if digests[inode] is not None
+            ]
+        )
+
+    report.failures.sort(key=lambda c: (c.source_id, c.series_id, c.chapter_id, c.page_index))
+    return report
+
+
+def _cache_key(root: Path, path: Path) -> str:
+    """Return the digest cache key of a file: its path relative to the data directory."""
+    return os.path.relpath(path, root)
@@ -1,21 +1,29 @@
 """Acquisition CLI commands."""
 
 import argparse
+import asyncio
 import json
+import os
 from pathlib import Path
+from typing import Optional
 
 from src.acquisition.db import AcquisitionDB
-from src.acquisition.downloader import download_chapter
+from src.acquisition.downloader import download_chapters
 from src.acquisition.filesystem_adapter import FilesystemAdapter
 from src.acquisition.adapters.manhwaraw import ManhwaRawAdapter
 from src.acquisition import registry
+from src.acquisition.rate_limit import DEFAULT_BURST, configure_rate_limit, get_rate_limiter
+from src.acquisition.storage import gc_blobs
+from src.acquisition.verify import verify_pages
 
 
-def get_adapter(source_id: str):
+def get_adapter(source_id: str, listing_store: Optional[AcquisitionDB] = None):
     """Get adapter instance for a registered source.
 
     Args:
         source_id: Source identifier
+        listing_store: Database to persist chapter lists in, for adapters
+            that revalidate them with conditional requests
 
     Returns:
         Instantiated adapter or None if source not found
@@ -26,6 +34,9 @@ def get_adapter(source_id: str):
 
     source_type = source_config.get("type")
 
+    if "rps" in source_config:
+        configure_rate_limit(source_id, source_config["rps"], source_config.get("burst", DEFAULT_BURST))
+
     if source_type == "filesystem":
         path = source_config.get("path")
         if not path:
@@ -33,7 +44,7 @@ def get_adapter(source_id: str):
             return None
         return FilesystemAdapter(source_id, Path(path))
     elif source_type == "manhwaraw":
-        return ManhwaRawAdapter()
+        return ManhwaRawAdapter(source_id, listing_store=listing_store)
     else:
         print(f"Error: Unknown source type: {source_type}")
         return None
@@ -48,7 +59,12 @@ def cmd_add_source(args):
         registry.add_source(args.source_id, args.type, path=args.path)
         print(f"Added filesystem source: {args.source_id} at {args.path}")
     elif args.type == "manhwaraw":
-        registry.add_source(args.source_id, args.type)
+        rate_limit = {}
+        if args.rps:
+            rate_limit["rps"] = args.rps
+        if args.burst:
+            rate_limit["burst"] = args.burst
+        registry.add_source(args.source_id, args.type, **rate_limit)
         print(f"Added manhwaraw source: {args.source_id}")
     else:
         print(f"Unknown source type: {args.type}")
@@ -112,7 +128,19 @@ def cmd_search(args):
 
 def cmd_sync(args):
     """Sync a series from a source."""
-    adapter = get_adapter(args.source_id)
+    # Setup database and root path
+    root_path = Path(args.data_dir)
+    db_path = root_path / "acquisition.db"
+    db = AcquisitionDB(db_path)
+    try:
+        return _sync_series(args, root_path, db)
+    finally:
+        db.close()
+
+
+def _sync_series(args, root_path: Path, db: AcquisitionDB) -> int:
+    """List and download a series' chapters."""
+    adapter = get_adapter(args.source_id, listing_store=db)
     if not adapter:
         print(f"Source not found: {args.source_id}")
         return 1
@@ -125,30 +153,140 @@ def cmd_sync(args):
 
     print(f"Found {len(chapters)} chapters for {args.series_id}")
 
-    # Setup database and root path
-    root_path = Path(args.data_dir)
-    db_path = root_path / "acquisition.db"
-    db = AcquisitionDB(db_path)
+    if args.new_only:
+        known = db.get_chapter_ids(args.source_id, args.series_id)
+        chapters = [chapter for chapter in chapters if chapter.chapter_id not in known]
+        if not chapters:
+            print("No new chapters")
+            return 0
+        print(f"{len(chapters)} new chapters")
 
     # Register series
     db.register_series(args.source_id, args.series_id, args.series_id)
 
     # Download chapters
-    for chapter in chapters:
-        print(f"Downloading {chapter.chapter_id}...")
-        result = download_chapter(adapter, chapter, root_path, db, max_workers=args.workers)
+    if args.use_async:
+        _sync_chapters_async(adapter, chapters, root_path, db, args)
+    else:
+        print(f"Downloading {len(chapters)} chapters with {args.workers} workers...")
+        download_chapters(
+            adapter,
+            chapters,
+            root_path,
+            db,
+            max_workers=args.workers,
+            verify=args.verify,
+            dedup=args.dedup,
+            on_chapter_complete=_report_chapter,
+        )
+
+    stats = get_rate_limiter(args.source_id).stats()
+    if stats["throttle_events"] or stats["throttled_seconds"] >= 1:
+        print(
+            f"Rate limiting: {stats['requests']} requests, {stats['throttle_events']} throttle responses, "
+            f"{stats['throttled_seconds']:.1f}s waiting (final rate {stats['rate']:.2f} req/s)"
+        )
 
-        if result.success:
-            print(f"  ✓ Downloaded {result.pages_downloaded} pages")
-        else:
-            print(f"  ✗ Failed: {result.pages_failed} pages failed")
-            for error in result.errors[:3]:  # Show first 3 errors
-                print(f"    - {error}")
+    return 0
+
+
+def cmd_gc(args):
+    """Delete page blobs no chapter references any more."""
+    root_path = Path(args.data_dir)
+    removed, freed = gc_blobs(root_path, dry_run=args.dry_run)
 
-    db.close()
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"{verb} {removed} unreferenced blobs ({freed / (1024 * 1024):.1f} MiB)")
     return 0
 
 
+def cmd_verify(args):
+    """Verify downloaded pages against their recorded checksums."""
+    root_path = Path(args.data_dir)
+    db_path = root_path / "acquisition.db"
+    if not db_path.exists():
+        print(f"No acquisition database found at {db_path}")
+        return 1
+
+    db = AcquisitionDB(db_path)
+    try:
+        report = verify_pages(
+            root_path,
+            db,
+            source_id=args.source_id,
+            series_id=args.series_id,
+            workers=args.workers,
+            use_cache=args.cache,
+        )
+    finally:
+        db.close()
+
+    print(
+        f"Verified {report.checked} pages ({report.hashed} files hashed, {report.cached} unchanged since last run): "
+        f"{report.ok} ok, {len(report.failures)} failed"
+    )
+    for check in report.failures:
+        print(
+            f"  ✗ {check.source_id}/{check.series_id}/{check.chapter_id} page {check.page_index}: "
+            f"{check.status.replace('_', ' ')}"
+        )
+
+    return 1 if report.failures else 0
+
+
+def _report_chapter(chapter, result) -> None:
+    """Print a chapter's outcome as soon as it finishes."""
+    print(f"Downloaded {chapter.chapter_id}:")
+    _print_chapter_result(result)
+
+
+def _print_chapter_result(result) -> None:
+    """Print the outcome of a chapter download."""
+    if result.success:
+        print(f"  ✓ Downloaded {result.pages_downloaded} pages")
+    else:
+        print(f"  ✗ Failed: {result.pages_failed} pages failed")
+        for error in result.errors[:3]:  # Show first 3 errors
+            print(f"    - {error}")
+
+
+def _async_adapter(adapter, client):
+    """Return the async variant of an adapter.
+
+    Adapters with native HTTP support provide async_variant(client); others
+    run their blocking calls in worker threads.
+    """
+    from src.acquisition.async_downloader import ThreadedAdapter
+
+    if hasattr(adapter, "async_variant"):
+        return adapter.async_variant(client)
+    return ThreadedAdapter(adapter)
+
+
+def _sync_chapters_async(adapter, chapters, root_path, db, args) -> None:
+    """Download all chapters on one event loop with a shared page budget."""
+    from src.acquisition.async_downloader import download_chapters_async
+    from src.acquisition.http_client import AsyncHTTPClient
+
+    async def run():
+        async with AsyncHTTPClient(
+            max_connections=args.workers, max_per_host=args.max_per_host, http2=args.http2
+        ) as client:
+            await download_chapters_async(
+                _async_adapter(adapter, client),
+                chapters,
+                root_path,
+                db,
+                max_concurrent_pages=args.workers,
+                verify=args.verify,
+                dedup=args.dedup,
+                on_chapter_complete=_report_chapter,
+            )
+
+    print(f"Downloading {len(chapters)} chapters with up to {args.workers} concurrent pages...")
+    asyncio.run(run())
+
+
 def setup_acquire_commands(subparsers):
     """Setup acquisition subcommands."""
     # add-source command
@@ -156,6 +294,8 @@ def setup_acquire_commands(subparsers):
     add_source_parser.add_argument("source_id", help="Unique identifier for the source")
     add_source_parser.add_argument("--type", required=True, choices=["filesystem", "manhwaraw"], help="Source adapter type")
     add_source_parser.add_argument("--path", help="Path for filesystem source (required if type=filesystem)")
+    add_source_parser.add_argument("--rps", type=float, help="Max requests per second to the source (default 4)")
+    add_source_parser.add_argument("--burst", type=int, help="Requests allowed back-to-back before --rps applies (default 8)")
     add_source_parser.set_defaults(func=cmd_add_source)
 
     # list-sources command
@@ -173,5 +313,26 @@ def setup_acquire_commands(subparsers):
     sync_parser.add_argument("source_id", help="Source identifier")
     sync_parser.add_argument("--series-id", required=True, help="Series identifier")
     sync_parser.add_argument("--data-dir", default="data", help="Data directory")
-    sync_parser.add_argument("--workers", type=int, default=4, help="Number of concurrent workers")
+    sync_parser.add_argument("--workers", type=int, default=4, help="Concurrent page downloads across all chapters")
+    sync_parser.add_argument("--async", dest="use_async", action="store_true", help="Download all chapters concurrently on an asyncio engine")
+    sync_parser.add_argument("--max-per-host", type=int, default=4, help="With --async: max concurrent requests per host")
+    sync_parser.add_argument("--http2", action="store_true", help="With --async: use HTTP/2 where supported (requires h2)")
+    sync_parser.add_argument("--verify", action="store_true", help="Re-check already downloaded pages (size and sha256) before skipping them")
+    sync_parser.add_argument("--new-only", action="store_true", help="Only download chapters not seen by a previous sync")
+    sync_parser.add_argument("--dedup", action="store_true", help="Store identical pages once in {data-dir}/blobs and hard-link them into chapters (reclaim unused blobs with `gc`)")
     sync_parser.set_defaults(func=cmd_sync)
+
+    # gc command
+    gc_parser = subparsers.add_parser("gc", help="Delete stored page blobs that no chapter uses")
+    gc_parser.add_argument("--data-dir", default="data", help="Data directory")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+    gc_parser.set_defaults(func=cmd_gc)
+
+    # verify command
+    verify_parser = subparsers.add_parser("verify", help="Check downloaded pages against their recorded checksums")
+    verify_parser.add_argument("--data-dir", default="data", help="Data directory")
+    verify_parser.add_argument("--source-id", help="Only verify this source")
+    verify_parser.add_argument("--series-id", help="Only verify this series")
+    verify_parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Files hashed in parallel (default: CPU count)")
+    verify_parser.add_argument("--no-cache", dest="cache", action="store_false", help="Rehash every file instead of trusting digests of unchanged files")
+    verify_parser.set_defaults(func=cmd_verify)
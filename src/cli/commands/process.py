@@ -1,10 +1,21 @@
 """Processing CLI commands."""
 
 import json
+import time
 from pathlib import Path
 
-from src.processing.job import PageJob
-from src.processing.runner import run_page
+from src.processing.batch import (
+    build_page_job,
+    discover_chapter_dirs,
+    discover_page_manifests,
+    run_jobs,
+)
+from src.processing.job_queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, JobQueue
+from src.processing.metrics import read_metrics_log, summarize_metrics
+from src.processing.ocr import DEFAULT_TILE_OVERLAP
+from src.processing.runner import OUTPUT_IMAGE_MODES, run_page
+from src.processing.worker import DEFAULT_POLL_SECONDS, LOST, enqueue_pages, queue_stages, run_workers
+from utils.translation_memory import TranslationMemory
 
 
 def cmd_process_page(args):
@@ -25,39 +36,15 @@ def cmd_process_page(args):
 
     # Extract metadata from manifest path
     # Expected path: data/sources/{source}/{series}/{chapter}/pages/page_XXX.json
-    parts = manifest_path.parts
+    page_index = manifest.get("page_index", 0)
     try:
-        sources_idx = parts.index("sources")
-        source_id = parts[sources_idx + 1]
-        series_id = parts[sources_idx + 2]
-        chapter_id = parts[sources_idx + 3]
-        page_index = manifest.get("page_index", 0)
-    except (ValueError, IndexError):
-        print(f"Cannot parse source/series/chapter from path: {manifest_path}")
+        job = build_page_job(manifest_path, page_index, Path(args.output_dir))
+    except ValueError as e:
+        print(str(e))
         return 1
 
-    # Construct input paths
-    input_image_path = manifest_path.parent / f"{page_index:03d}.png"
-    input_manifest_path = manifest_path
-
-    # Construct output paths
-    output_root = Path(args.output_dir)
-    output_dir = output_root / "output" / source_id / series_id / chapter_id / "pages"
-    output_image_path = output_dir / f"{page_index:03d}_processed.png"
-    output_manifest_path = output_dir / f"page_{page_index:03d}.out.json"
-
-    # Create job
-    job = PageJob(
-        source_id=source_id,
-        series_id=series_id,
-        chapter_id=chapter_id,
-        page_index=page_index,
-        input_image_path=input_image_path,
-        input_manifest_path=input_manifest_path,
-        output_image_path=output_image_path,
-        output_manifest_path=output_manifest_path,
-        status="PENDING",
-    )
+    chapter_id = job.chapter_id
+    output_dir = job.output_manifest_path.parent
 
     # Run job
     print(f"Processing page {page_index} from {chapter_id}...")
@@ -71,11 +58,13 @@ def cmd_process_page(args):
         print("  Inpainting text regions...")
     if args.with_render:
         print("  Rendering translated text...")
-    result = run_page(job, with_ocr=args.with_ocr, with_translate=args.with_translate, with_grouping=args.with_grouping, with_inpaint=args.with_inpaint, with_render=args.with_render)
+    memory_before = _memory_totals(args)
+    result = run_page(job, with_ocr=args.with_ocr, with_translate=args.with_translate, with_grouping=args.with_grouping, with_inpaint=args.with_inpaint, with_render=args.with_render, batch_translate=args.batch_translate, translation_memory_path=_translation_memory_path(args), inpaint_mode=args.inpaint_mode, metrics_log_path=_metrics_log_path(args), force=args.force, output_image=args.output_image, ocr_tile_height=args.ocr_tile_height, ocr_tile_overlap=args.ocr_tile_overlap)
 
     if result.status == "DONE":
         print(f"✓ Success")
-        print(f"  Output image: {result.output_image_path}")
+        if args.output_image != "none":
+            print(f"  Output image: {result.output_image_path}")
         print(f"  Output manifest: {result.output_manifest_path}")
         if args.with_ocr:
             ocr_path = output_dir / f"page_{page_index:03d}.ocr.json"
@@ -92,20 +81,423 @@ def cmd_process_page(args):
         if args.with_render:
             rendered_path = output_dir / f"{page_index:03d}_processed.rendered.png"
             print(f"  Rendered image: {rendered_path}")
+        _print_memory_usage(args, memory_before)
         return 0
     else:
         print(f"✗ Failed: {result.error}")
         return 1
 
 
+def _translation_memory_path(args):
+    """Return the translation memory database to use, or None if disabled."""
+    if args.no_translation_memory:
+        return None
+    if args.translation_memory:
+        return Path(args.translation_memory)
+    return Path(args.output_dir) / "translation_memory.db"
+
+
+def _memory_totals(args):
+    """Return the translation memory's hit/miss totals, or None if this run does not use it."""
+    db_path = _translation_memory_path(args)
+    if not args.with_translate or db_path is None:
+        return None
+    memory = TranslationMemory(db_path)
+    try:
+        return memory.totals()
+    finally:
+        memory.close()
+
+
+def _format_lookups(hits: int, misses: int) -> str:
+    """Format translation memory hit/miss counts with the hit rate."""
+    lookups = hits + misses
+    rate = f" ({hits / lookups:.0%} hit rate)" if lookups else ""
+    return f"{hits} hits, {misses} misses{rate}"
+
+
+def _print_memory_usage(args, before) -> None:
+    """Print translation memory lookups made since ``before`` (from _memory_totals).
+
+    Totals are read from the database, so lookups made by worker processes count too.
+    """
+    after = _memory_totals(args)
+    if before is None or after is None:
+        return
+    print(f"  Translation memory: {_format_lookups(after['hits'] - before['hits'], after['misses'] - before['misses'])}")
+
+
+def _metrics_log_path(args):
+    """Return the JSONL metrics log to append to, or None if disabled."""
+    if args.no_metrics_log:
+        return None
+    if args.metrics_log:
+        return Path(args.metrics_log)
+    return Path(args.output_dir) / "metrics.jsonl"
+
+
+def _stage_flags(args) -> dict:
+    """Collect run_page stage flags from parsed arguments."""
+    return {
+        "with_ocr": args.with_ocr,
+        "with_translate": args.with_translate,
+        "with_grouping": args.with_grouping,
+        "with_inpaint": args.with_inpaint,
+        "with_render": args.with_render,
+        "batch_translate": args.batch_translate,
+        "translation_memory_path": _translation_memory_path(args),
+        "inpaint_mode": args.inpaint_mode,
+        "metrics_log_path": _metrics_log_path(args),
+        "force": args.force,
+        "output_image": args.output_image,
+        "ocr_tile_height": args.ocr_tile_height,
+        "ocr_tile_overlap": args.ocr_tile_overlap,
+    }
+
+
+def _stage_limits(args) -> dict:
+    """Collect per-stage concurrency limits from parsed arguments."""
+    limits = {
+        "ocr": args.max_ocr,
+        "translate": args.max_translate,
+        "inpaint": args.max_inpaint,
+        "render": args.max_render,
+    }
+    return {stage: limit for stage, limit in limits.items() if limit}
+
+
+def _collect_jobs(chapter_dirs, output_root: Path) -> list:
+    """Build page jobs for every page manifest in the given chapter directories."""
+    jobs = []
+    for chapter_dir in chapter_dirs:
+        for manifest_path in discover_page_manifests(chapter_dir / "pages"):
+            try:
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                print(f"  Skipping unreadable manifest {manifest_path}: {e}")
+                continue
+
+            if not manifest.get("success", True):
+                print(f"  Skipping page {manifest.get('page_index')} of {chapter_dir.name} (not downloaded)")
+                continue
+
+            jobs.append(build_page_job(manifest_path, manifest.get("page_index", 0), output_root))
+    return jobs
+
+
+def _queue_path(args) -> Path:
+    """Return the job queue database to use."""
+    if args.queue:
+        return Path(args.queue)
+    return Path(args.output_dir) / "jobs.db"
+
+
+def _run_batch(chapter_dirs, args) -> int:
+    """Process all pages of the given chapters and print an aggregate report."""
+    jobs = _collect_jobs(chapter_dirs, Path(args.output_dir))
+    if not jobs:
+        print("No page manifests found")
+        return 1
+
+    if args.enqueue:
+        queue_path = _queue_path(args)
+        added = enqueue_pages(
+            queue_path, jobs, Path(args.output_dir), max_attempts=args.max_attempts, **_stage_flags(args)
+        )
+        stages = queue_stages(**_stage_flags(args))
+        print(
+            f"Enqueued {added} jobs ({len(jobs)} pages x {len(stages)} stages: {', '.join(stages)}) into {queue_path}"
+        )
+        if added < len(jobs) * len(stages):
+            print(f"  {len(jobs) * len(stages) - added} jobs were already queued")
+        print("Run `manhwa worker` to process them")
+        return 0
+
+    if args.pipeline:
+        print(f"Processing {len(jobs)} pages from {len(chapter_dirs)} chapter(s) as a stage pipeline...")
+    else:
+        print(f"Processing {len(jobs)} pages from {len(chapter_dirs)} chapter(s) with {args.workers} worker(s)...")
+
+    def report(job):
+        if job.status == "DONE":
+            print(f"  ✓ {job.chapter_id} page {job.page_index}")
+        else:
+            print(f"  ✗ {job.chapter_id} page {job.page_index}: {job.error}")
+
+    memory_before = _memory_totals(args)
+    result = run_jobs(
+        jobs,
+        workers=args.workers,
+        stage_limits=_stage_limits(args),
+        on_complete=report,
+        pipelined=args.pipeline,
+        **_stage_flags(args),
+    )
+
+    print(
+        f"Processed {len(result.jobs)} pages ({result.pages_done} done, {result.pages_failed} failed) "
+        f"in {result.elapsed_seconds:.1f}s ({result.pages_per_second:.2f} pages/s)"
+    )
+    _print_memory_usage(args, memory_before)
+    return 0 if result.pages_failed == 0 else 1
+
+
+def cmd_process_chapter(args):
+    """Process every page of a chapter."""
+    chapter_dir = Path(args.data_dir) / "sources" / args.source_id / args.series_id / args.chapter_id
+    if not (chapter_dir / "pages").is_dir():
+        print(f"Chapter pages not found: {chapter_dir / 'pages'}")
+        return 1
+
+    return _run_batch([chapter_dir], args)
+
+
+def cmd_process_series(args):
+    """Process every page of every chapter in a series."""
+    chapter_dirs = discover_chapter_dirs(Path(args.data_dir), args.source_id, args.series_id)
+    if not chapter_dirs:
+        print(f"No chapters found for series: {args.series_id}")
+        return 1
+
+    return _run_batch(chapter_dirs, args)
+
+
+def _report_queued_job(queued, job, queue_status) -> None:
+    """Print the outcome of a job run by a queue worker."""
+    label = f"{queued.chapter_id} page {queued.page_index} {queued.stage}"
+    if queue_status is None:
+        print(f"  ✓ {label}", flush=True)
+    elif queue_status == LOST:
+        print(f"  ⚠ {label}: lease expired before it finished; left for another worker", flush=True)
+    elif queue_status == "dead":
+        print(f"  ✗ {label} (attempt {queued.attempts}, giving up): {job.error}", flush=True)
+    else:
+        print(f"  ↻ {label} (attempt {queued.attempts}, will retry): {job.error}", flush=True)
+
+
+def cmd_worker(args):
+    """Drain the durable job queue."""
+    queue_path = Path(args.queue)
+    if not queue_path.exists():
+        print(f"Job queue not found: {queue_path}")
+        return 1
+
+    queue = JobQueue(queue_path)
+    if args.retry_dead:
+        print(f"Requeued {queue.retry_dead()} dead jobs")
+    counts = queue.counts()
+    queue.close()
+
+    print(f"Draining {queue_path} with {args.workers} worker(s): {_format_counts(counts)}")
+    start = time.perf_counter()
+    stats = run_workers(
+        queue_path,
+        workers=args.workers,
+        lease_seconds=args.lease_seconds,
+        poll_seconds=args.poll_seconds,
+        on_job=_report_queued_job,
+    )
+    elapsed = time.perf_counter() - start
+
+    queue = JobQueue(queue_path)
+    counts = queue.counts()
+    dead = queue.dead_jobs()
+    queue.close()
+
+    print(
+        f"Ran {stats.total} jobs in {elapsed:.1f}s "
+        f"({stats.done} done, {stats.retried} to retry, {stats.dead} dead, {stats.lost} lost lease). "
+        f"Queue: {_format_counts(counts)}"
+    )
+    for job in dead:
+        print(f"  dead: {job['chapter_id']} page {job['page_index']} {job['stage']}: {job['last_error']}")
+    return 1 if dead else 0
+
+
+def _format_counts(counts: dict) -> str:
+    """Format queue status counts."""
+    order = ("pending", "leased", "done", "dead", "blocked")
+    return ", ".join(f"{counts.get(status, 0)} {status}" for status in order if counts.get(status)) or "empty"
+
+
+def _format_metric(name: str, value: float) -> str:
+    """Format a metric value for the stats table."""
+    if name.endswith("_seconds"):
+        return f"{value:.3f}s"
+    return f"{value / (1024 * 1024):.1f}MB"
+
+
+def cmd_stats(args):
+    """Summarise per-stage metrics for a chapter or series."""
+    log_path = Path(args.metrics_log)
+    if not log_path.exists():
+        print(f"Metrics log not found: {log_path}")
+        return 1
+
+    records = read_metrics_log(log_path, args.source_id, args.series_id, args.chapter_id)
+    if not records:
+        print("No metrics recorded for the selected pages")
+        return 1
+
+    scope = f"{args.source_id}/{args.series_id}" + (f"/{args.chapter_id}" if args.chapter_id else "")
+    failed = sum(1 for record in records if record.get("status") == "FAILED")
+    print(f"Stage metrics for {scope}: {len(records)} pages ({failed} failed)")
+
+    summary = summarize_metrics(records)
+    columns = [("wall_seconds", "wall"), ("cpu_seconds", "cpu"), ("peak_rss_bytes", "peak rss"), ("bytes_read", "read"), ("bytes_written", "written")]
+    header = f"  {'stage':<10} {'pages':>5}" + "".join(f" {label + ' p50/p95':>22}" for _, label in columns)
+    print(header)
+    for stage, stage_summary in summary.items():
+        row = f"  {stage:<10} {stage_summary['pages']:>5}"
+        for name, _ in columns:
+            values = stage_summary.get(name)
+            if values is None:
+                cell = "-"
+            else:
+                cell = f"{_format_metric(name, values['p50'])}/{_format_metric(name, values['p95'])}"
+            row += f" {cell:>22}"
+        print(row)
+
+    total_wall = sum(s["wall_seconds"]["total"] for s in summary.values() if "wall_seconds" in s)
+    if total_wall > 0:
+        shares = ", ".join(
+            f"{stage} {100 * s['wall_seconds']['total'] / total_wall:.0f}%"
+            for stage, s in summary.items()
+            if "wall_seconds" in s
+        )
+        print(f"  Wall time share: {shares}")
+    return 0
+
+
+def cmd_tm_stats(args):
+    """Show translation memory size and lookup counts."""
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Translation memory not found: {db_path}")
+        return 1
+
+    memory = TranslationMemory(db_path)
+    stats = memory.stats()
+    memory.close()
+    print(f"Translation memory: {db_path}")
+    print(f"  Entries: {stats['entries']}")
+    print(f"  Lookups: {_format_lookups(stats['total_hits'], stats['total_misses'])}")
+    return 0
+
+
+def cmd_tm_export(args):
+    """Export translation memory entries to JSONL."""
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Translation memory not found: {db_path}")
+        return 1
+
+    memory = TranslationMemory(db_path)
+    count = memory.export_jsonl(Path(args.output))
+    memory.close()
+    print(f"Exported {count} entries to {args.output}")
+    return 0
+
+
+def cmd_tm_import(args):
+    """Import translation memory entries from JSONL."""
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"Input file not found: {input_path}")
+        return 1
+
+    memory = TranslationMemory(Path(args.db))
+    try:
+        count = memory.import_jsonl(input_path)
+    except (ValueError, KeyError) as e:
+        print(f"Failed to import translation memory: {e}")
+        return 1
+    finally:
+        memory.close()
+
+    print(f"Imported {count} entries into {args.db}")
+    return 0
+
+
+def _add_stage_arguments(parser):
+    """Add the per-stage --with-* flags shared by all processing commands."""
+    parser.add_argument("--output-dir", default="data", help="Output directory root")
+    parser.add_argument("--with-ocr", action="store_true", help="Run OCR on the page (Korean)")
+    parser.add_argument("--with-translate", action="store_true", help="Translate OCR text (Korean → English via Papago)")
+    parser.add_argument("--batch-translate", action="store_true", help="Send OCR lines to Papago in joined batches instead of one request per line")
+    parser.add_argument("--translation-memory", help="Translation memory database (default: {output-dir}/translation_memory.db)")
+    parser.add_argument("--no-translation-memory", action="store_true", help="Always call the translation engine, bypassing the translation memory")
+    parser.add_argument("--with-grouping", action="store_true", help="Group OCR lines into regions (requires OCR)")
+    parser.add_argument("--with-inpaint", action="store_true", help="Inpaint text regions (requires grouping)")
+    parser.add_argument("--inpaint-mode", choices=["full", "regions"], default="full", help="Inpaint the whole page or only padded crops around text regions")
+    parser.add_argument("--with-render", action="store_true", help="Render translated text (requires translation, grouping, and inpainting)")
+    parser.add_argument("--metrics-log", help="JSONL log of per-stage metrics (default: {output-dir}/metrics.jsonl)")
+    parser.add_argument("--no-metrics-log", action="store_true", help="Do not append per-stage metrics to the metrics log")
+    parser.add_argument("--output-image", choices=list(OUTPUT_IMAGE_MODES), default="copy", help="How to provide {idx}_processed.png: full copy (default), hard link to the source page, or none (stages read the source page either way)")
+    parser.add_argument("--ocr-tile-height", type=int, default=None, metavar="PX", help="OCR pages taller than PX as overlapping horizontal tiles of PX rows (e.g. 1024 for tall webtoon strips)")
+    parser.add_argument("--ocr-tile-overlap", type=int, default=None, metavar="PX", help=f"Rows shared by consecutive OCR tiles; must exceed the tallest text line (default: {DEFAULT_TILE_OVERLAP})")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage, even those whose inputs are unchanged since their last run")
+
+
+def _add_batch_arguments(parser):
+    """Add worker pool arguments shared by batch processing commands."""
+    parser.add_argument("source_id", help="Source identifier")
+    parser.add_argument("--series-id", required=True, help="Series identifier")
+    parser.add_argument("--data-dir", default="data", help="Data directory containing sources/")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--pipeline", action="store_true", help="Overlap stages across pages in one process (--max-<stage> sets threads per stage)")
+    parser.add_argument("--max-ocr", type=int, help="Max pages running OCR at once")
+    parser.add_argument("--max-translate", type=int, help="Max pages translating at once (network-bound)")
+    parser.add_argument("--max-inpaint", type=int, help="Max pages inpainting at once (CPU-bound)")
+    parser.add_argument("--max-render", type=int, help="Max pages rendering at once (CPU-bound)")
+    parser.add_argument("--enqueue", action="store_true", help="Add the pages to the durable job queue instead of processing them now (see `manhwa worker`)")
+    parser.add_argument("--queue", help="Job queue database for --enqueue (default: {output-dir}/jobs.db)")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="With --enqueue: attempts per page stage before it is dead-lettered")
+    _add_stage_arguments(parser)
+
+
 def setup_process_commands(subparsers):
     """Setup processing subcommands."""
     process_page_parser = subparsers.add_parser("process-page", help="Process a single page")
     process_page_parser.add_argument("--manifest", required=True, help="Path to page manifest JSON")
-    process_page_parser.add_argument("--output-dir", default="data", help="Output directory root")
-    process_page_parser.add_argument("--with-ocr", action="store_true", help="Run OCR on the page (Korean)")
-    process_page_parser.add_argument("--with-translate", action="store_true", help="Translate OCR text (Korean → English via Papago)")
-    process_page_parser.add_argument("--with-grouping", action="store_true", help="Group OCR lines into regions (requires OCR)")
-    process_page_parser.add_argument("--with-inpaint", action="store_true", help="Inpaint text regions (requires grouping)")
-    process_page_parser.add_argument("--with-render", action="store_true", help="Render translated text (requires translation, grouping, and inpainting)")
+    _add_stage_arguments(process_page_parser)
     process_page_parser.set_defaults(func=cmd_process_page)
+
+    process_chapter_parser = subparsers.add_parser("process-chapter", help="Process all pages of a chapter")
+    _add_batch_arguments(process_chapter_parser)
+    process_chapter_parser.add_argument("--chapter-id", required=True, help="Chapter identifier")
+    process_chapter_parser.set_defaults(func=cmd_process_chapter)
+
+    process_series_parser = subparsers.add_parser("process-series", help="Process all chapters of a series")
+    _add_batch_arguments(process_series_parser)
+    process_series_parser.set_defaults(func=cmd_process_series)
+
+    stats_parser = subparsers.add_parser("stats", help="Summarise per-stage processing metrics (p50/p95)")
+    stats_parser.add_argument("source_id", help="Source identifier")
+    stats_parser.add_argument("--series-id", required=True, help="Series identifier")
+    stats_parser.add_argument("--chapter-id", help="Limit to one chapter")
+    stats_parser.add_argument("--metrics-log", default="data/metrics.jsonl", help="Metrics log written by the process commands")
+    stats_parser.set_defaults(func=cmd_stats)
+
+    worker_parser = subparsers.add_parser("worker", help="Process pages from the durable job queue")
+    worker_parser.add_argument("--queue", default="data/jobs.db", help="Job queue database")
+    worker_parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    worker_parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS, help="Seconds before a job held by an unresponsive worker is handed out again")
+    worker_parser.add_argument("--poll-seconds", type=float, default=DEFAULT_POLL_SECONDS, help="Max wait between checks while other workers hold the remaining jobs")
+    worker_parser.add_argument("--retry-dead", action="store_true", help="Give dead-lettered jobs a fresh set of attempts first")
+    worker_parser.set_defaults(func=cmd_worker)
+
+    tm_stats_parser = subparsers.add_parser("tm-stats", help="Show translation memory statistics")
+    tm_stats_parser.add_argument("--db", default="data/translation_memory.db", help="Translation memory database")
+    tm_stats_parser.set_defaults(func=cmd_tm_stats)
+
+    tm_export_parser = subparsers.add_parser("tm-export", help="Export translation memory to JSONL")
+    tm_export_parser.add_argument("output", help="Output JSONL path")
+    tm_export_parser.add_argument("--db", default="data/translation_memory.db", help="Translation memory database")
+    tm_export_parser.set_defaults(func=cmd_tm_export)
+
+    tm_import_parser = subparsers.add_parser("tm-import", help="Import translation memory from JSONL")
+    tm_import_parser.add_argument("input", help="Input JSONL path")
+    tm_import_parser.add_argument("--db", default="data/translation_memory.db", help="Translation memory database")
+    tm_import_parser.set_defaults(func=cmd_tm_import)
@@ -0,0 +1,29 @@
+"""File hashing shared by the acquisition and processing layers."""
+
+import hashlib
+from pathlib import Path
+
+
+# Bytes hashed per read
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(file_path: Path) -> str:
+    """Return the hex SHA256 of a file.
+
+    The file is read into one reusable 1 MiB buffer; hashlib releases the GIL
+    for blocks this size, so files can be hashed in parallel threads.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+    return sha256_hash.hexdigest()
@@ -0,0 +1,163 @@
+"""Batch processing of whole chapters with a page worker pool."""
+
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .job import PageJob
+from .runner import STAGES, run_page, run_pages_pipelined, set_stage_limits, warm_up_ocr
+
+
+MANIFEST_PATTERN = re.compile(r"^page_(\d+)\.json$")
+
+
+@dataclass
+class BatchResult:
+    """Aggregate result of processing a batch of pages."""
+
+    jobs: List[PageJob] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def pages_done(self) -> int:
+        """Number of pages that finished successfully."""
+        return sum(1 for job in self.jobs if job.status == "DONE")
+
+    @property
+    def pages_failed(self) -> int:
+        """Number of pages that failed."""
+        return sum(1 for job in self.jobs if job.status == "FAILED")
+
+    @property
+    def pages_per_second(self) -> float:
+        """Overall throughput across all processed pages."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.jobs) / self.elapsed_seconds
+
+
+def discover_page_manifests(pages_dir: Path) -> List[Path]:
+    """Return all page_XXX.json manifests in a chapter pages directory, in page order."""
+    if not pages_dir.is_dir():
+        return []
+
+    manifests = []
+    for path in pages_dir.iterdir():
+        match = MANIFEST_PATTERN.match(path.name)
+        if match:
+            manifests.append((int(match.group(1)), path))
+
+    return [path for _, path in sorted(manifests)]
+
+
+def discover_chapter_dirs(data_dir: Path, source_id: str, series_id: str) -> List[Path]:
+    """Return all chapter directories for a series that contain a pages directory."""
+    series_path = data_dir / "sources" / source_id / series_id
+    if not series_path.is_dir():
+        return []
+
+    return sorted(p for p in series_path.iterdir() if (p / "pages").is_dir())
+
+
+def build_page_job(manifest_path: Path, page_index: int, output_root: Path) -> PageJob:
+    """Create a PageJob for a page manifest.
+
+    Expected manifest path: {root}/sources/{source}/{series}/{chapter}/pages/page_XXX.json
+
+    Raises:
+        ValueError: If source/series/chapter cannot be parsed from the path.
+    """
+    parts = manifest_path.parts
+    try:
+        sources_idx = parts.index("sources")
+        source_id = parts[sources_idx + 1]
+        series_id = parts[sources_idx + 2]
+        chapter_id = parts[sources_idx + 3]
+    except (ValueError, IndexError):
+        raise ValueError(f"Cannot parse source/series/chapter from path: {manifest_path}")
+
+    output_dir = output_root / "output" / source_id / series_id / chapter_id / "pages"
+
+    return PageJob(
+        source_id=source_id,
+        series_id=series_id,
+        chapter_id=chapter_id,
+        page_index=page_index,
+        input_image_path=manifest_path.parent / f"{page_index:03d}.png",
+        input_manifest_path=manifest_path,
+        output_image_path=output_dir / f"{page_index:03d}_processed.png",
+        output_manifest_path=output_dir / f"page_{page_index:03d}.out.json",
+        status="PENDING",
+    )
+
+
+def _init_worker(stage_limits: Dict[str, object], with_ocr: bool = False) -> None:
+    """Install shared stage semaphores in a worker process and load its OCR engine."""
+    set_stage_limits(stage_limits)
+    if with_ocr:
+        warm_up_ocr()
+
+
+def run_jobs(
+    jobs: List[PageJob],
+    workers: int = 1,
+    stage_limits: Optional[Dict[str, int]] = None,
+    on_complete: Optional[Callable[[PageJob], None]] = None,
+    pipelined: bool = False,
+    **stage_flags,
+) -> BatchResult:
+    """Run page jobs across a process pool or a streaming stage pipeline.
+
+    Args:
+        jobs: Jobs to execute
+        workers: Number of worker processes (1 runs in-process)
+        stage_limits: Optional max concurrent pages per stage across all workers,
+                      e.g. {"inpaint": 2, "translate": 8}. In pipelined mode these
+                      are the worker threads per stage.
+        on_complete: Optional callback invoked with each finished job
+        pipelined: If True, run in-process with overlapping stages
+                   (see run_pages_pipelined); workers is ignored
+        **stage_flags: with_ocr/with_translate/... flags forwarded to run_page
+    """
+    stage_limits = stage_limits or {}
+    unknown = set(stage_limits) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages in stage_limits: {sorted(unknown)}")
+
+    result = BatchResult()
+    start = time.perf_counter()
+
+    if pipelined:
+        result.jobs = run_pages_pipelined(
+            jobs, stage_workers=stage_limits, on_complete=on_complete, **stage_flags
+        )
+    elif workers <= 1:
+        if stage_flags.get("with_ocr"):
+            warm_up_ocr()
+        for job in jobs:
+            finished = run_page(job, **stage_flags)
+            result.jobs.append(finished)
+            if on_complete:
+                on_complete(finished)
+    else:
+        # Semaphores are created in the parent so every worker shares the same budget
+        ctx = multiprocessing.get_context()
+        semaphores = {stage: ctx.BoundedSemaphore(limit) for stage, limit in stage_limits.items()}
+
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(semaphores, bool(stage_flags.get("with_ocr")))
+        ) as executor:
+            futures = [executor.submit(run_page, job, **stage_flags) for job in jobs]
+            for future in as_completed(futures):
+                finished = future.result()
+                result.jobs.append(finished)
+                if on_complete:
+                    on_complete(finished)
+
+    result.jobs.sort(key=lambda job: (job.chapter_id, job.page_index))
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,62 @@
+"""Content fingerprints used to skip stages whose inputs are unchanged."""
+
+import hashlib
+import json
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..hashing import sha256_file
+
+
+# Bump to invalidate every recorded fingerprint (e.g. when a stage's output format changes)
+FINGERPRINT_VERSION = 1
+
+
+def hash_json(value: Any) -> str:
+    """Return the sha256 of a JSON-serialisable value, independent of key order."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path, previous: Optional[dict] = None) -> dict:
+    """Return {"size", "mtime_ns", "sha256"} for a file.
+
+    If ``previous`` (an earlier result for the same file) matches the file's
+    current size and mtime, its digest is reused without reading the file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat = Path(path).stat()
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        return previous
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256_file(path)}
+
+
+def written_digest(path: Path, data: bytes) -> dict:
+    """Return file_digest for a file just written with ``data``, without reading it back."""
+    stat = Path(path).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": hashlib.sha256(data).hexdigest()}
+
+
+@lru_cache(maxsize=None)
+def package_version(name: str) -> Optional[str]:
+    """Return an installed distribution's version without importing it, or None."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def stage_fingerprint(stage: str, inputs: Dict[str, Any]) -> str:
+    """Return the fingerprint of a stage run on the given inputs.
+
+    Args:
+        stage: Stage name
+        inputs: Hashes of the stage's input files and results, plus the engine
+                and parameters that affect its output
+    """
+    return hash_json({"version": FINGERPRINT_VERSION, "stage": stage, "inputs": inputs})
@@ -0,0 +1,171 @@
+"""Bounding-box geometry shared by the processing stages.
+
+OCR boxes are 4-point polygons ``[[x1, y1], [x2, y2], [x3, y3], [x4, y4]]``.
+The batch kernels work on ``(N, 4, 2)`` point arrays and ``(N, 4)`` rectangle
+arrays of ``(x_min, y_min, x_max, y_max)``; the scalar helpers handle a single
+box and return plain Python values for JSON output.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+Rect = Tuple[float, float, float, float]
+
+
+def bbox_to_rect(bbox: List[List[float]]) -> Rect:
+    """Convert 4-point bbox to (x_min, y_min, x_max, y_max)."""
+    xs = [pt[0] for pt in bbox]
+    ys = [pt[1] for pt in bbox]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def bbox_to_int_rect(bbox: List[List[float]]) -> Tuple[int, int, int, int]:
+    """Convert 4-point bbox to integer rectangle (x_min, y_min, x_max, y_max)."""
+    xs = [int(pt[0]) for pt in bbox]
+    ys = [int(pt[1]) for pt in bbox]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def compute_distance(rect1: Rect, rect2: Rect) -> float:
+    """Compute minimum edge distance between two rectangles.
+
+    Returns 0 if rectangles overlap, otherwise minimum distance between edges.
+    """
+    x1_min, y1_min, x1_max, y1_max = rect1
+    x2_min, y2_min, x2_max, y2_max = rect2
+
+    # Check overlap
+    if not (x1_max < x2_min or x2_max < x1_min or y1_max < y2_min or y2_max < y1_min):
+        return 0.0
+
+    # Compute horizontal and vertical distances
+    if x1_max < x2_min:
+        dx = x2_min - x1_max
+    elif x2_max < x1_min:
+        dx = x1_min - x2_max
+    else:
+        dx = 0.0
+
+    if y1_max < y2_min:
+        dy = y2_min - y1_max
+    elif y2_max < y1_min:
+        dy = y1_min - y2_max
+    else:
+        dy = 0.0
+
+    return (dx**2 + dy**2) ** 0.5
+
+
+def rect_iou(rect1: Rect, rect2: Rect) -> float:
+    """Compute intersection-over-union of two rectangles (0 if either is empty)."""
+    inter_w = min(rect1[2], rect2[2]) - max(rect1[0], rect2[0])
+    inter_h = min(rect1[3], rect2[3]) - max(rect1[1], rect2[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    area1 = (rect1[2] - rect1[0]) * (rect1[3] - rect1[1])
+    area2 = (rect2[2] - rect2[0]) * (rect2[3] - rect2[1])
+    return float(inter / (area1 + area2 - inter))
+
+
+def compute_vertical_distance(rect1: Rect, rect2: Rect) -> float:
+    """Compute vertical distance between two rectangles (for vertical grouping)."""
+    y1_min, y1_max = rect1[1], rect1[3]
+    y2_min, y2_max = rect2[1], rect2[3]
+
+    if y1_max < y2_min:
+        return y2_min - y1_max
+    elif y2_max < y1_min:
+        return y1_min - y2_max
+    else:
+        return 0.0  # Overlapping vertically
+
+
+def union_bbox(bboxes: List[List[List[float]]]) -> List[List[float]]:
+    """Compute union bounding box of multiple 4-point bboxes."""
+    all_xs = []
+    all_ys = []
+    for bbox in bboxes:
+        for pt in bbox:
+            all_xs.append(pt[0])
+            all_ys.append(pt[1])
+
+    x_min, x_max = min(all_xs), max(all_xs)
+    y_min, y_max = min(all_ys), max(all_ys)
+
+    # Return as 4-point bbox (clockwise from top-left)
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+
+
+def rect_to_bbox(rect: Sequence[float]) -> List[List[float]]:
+    """Convert (x_min, y_min, x_max, y_max) to a 4-point bbox of Python numbers."""
+    x_min, y_min, x_max, y_max = (v.item() if isinstance(v, np.generic) else v for v in rect)
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+
+
+def bboxes_to_array(bboxes: Sequence[List[List[float]]], dtype=np.float32) -> np.ndarray:
+    """Stack 4-point bboxes into an (N, 4, 2) array.
+
+    float32 halves memory for large pages; pass float64 when the coordinates
+    are written back to JSON and must round-trip exactly.
+    """
+    if len(bboxes) == 0:
+        return np.zeros((0, 4, 2), dtype=dtype)
+    return np.asarray(bboxes, dtype=dtype).reshape(-1, 4, 2)
+
+
+def rects_from_array(points: np.ndarray) -> np.ndarray:
+    """Convert (N, 4, 2) points to (N, 4) rectangles (x_min, y_min, x_max, y_max)."""
+    mins = points.min(axis=1)
+    maxs = points.max(axis=1)
+    return np.concatenate([mins, maxs], axis=1)
+
+
+def int_rects_from_array(points: np.ndarray) -> np.ndarray:
+    """Convert (N, 4, 2) points to integer rectangles, truncating like int()."""
+    return rects_from_array(np.trunc(points)).astype(np.int64)
+
+
+def union_rect(rects: np.ndarray) -> np.ndarray:
+    """Return the rectangle enclosing all (N, 4) rectangles."""
+    return np.concatenate([rects[:, :2].min(axis=0), rects[:, 2:].max(axis=0)])
+
+
+def pairwise_vertical_distance(rects: np.ndarray) -> np.ndarray:
+    """Return the (N, N) matrix of vertical gaps between rectangles (0 if overlapping)."""
+    y_min = rects[:, 1]
+    y_max = rects[:, 3]
+    gap_below = y_min[None, :] - y_max[:, None]
+    gap_above = y_min[:, None] - y_max[None, :]
+    return np.maximum(np.maximum(gap_below, gap_above), 0)
+
+
+def pairwise_distance(rects: np.ndarray) -> np.ndarray:
+    """Return the (N, N) matrix of minimum edge distances between rectangles."""
+    dx = np.maximum(
+        np.maximum(rects[None, :, 0] - rects[:, None, 2], rects[:, None, 0] - rects[None, :, 2]), 0
+    )
+    dy = pairwise_vertical_distance(rects)
+    return np.sqrt(dx**2 + dy**2)
+
+
+def expand_rects(rects: np.ndarray, padding: int, width: int, height: int) -> np.ndarray:
+    """Expand (N, 4) integer rectangles by padding pixels, clipped to image bounds."""
+    expanded = rects + np.array([-padding, -padding, padding, padding], dtype=rects.dtype)
+    expanded[:, [0, 2]] = np.clip(expanded[:, [0, 2]], 0, width)
+    expanded[:, [1, 3]] = np.clip(expanded[:, [1, 3]], 0, height)
+    return expanded
+
+
+def rasterize_rects(rects: np.ndarray, width: int, height: int, value: int = 255) -> np.ndarray:
+    """Rasterize (N, 4) integer rectangles into a uint8 mask.
+
+    Each rectangle is a half-open pixel range [x_min, x_max) x [y_min, y_max),
+    filled with a single slice assignment.
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for x_min, y_min, x_max, y_max in rects.tolist():
+        mask[y_min:y_max, x_min:x_max] = value
+    return mask
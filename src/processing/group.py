@@ -3,86 +3,126 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
-
-
-def bbox_to_rect(bbox: List[List[float]]) -> Tuple[float, float, float, float]:
-    """Convert 4-point bbox to (x_min, y_min, x_max, y_max)."""
-    xs = [pt[0] for pt in bbox]
-    ys = [pt[1] for pt in bbox]
-    return (min(xs), min(ys), max(xs), max(ys))
-
-
-def compute_distance(rect1: Tuple[float, float, float, float],
-                     rect2: Tuple[float, float, float, float]) -> float:
-    """Compute minimum edge distance between two rectangles.
-
-    Returns 0 if rectangles overlap, otherwise minimum distance between edges.
+from typing import List
+
+import numpy as np
+
+from .geometry import (
+    bbox_to_rect,
+    bboxes_to_array,
+    compute_distance,
+    compute_vertical_distance,
+    pairwise_vertical_distance,
+    rect_to_bbox,
+    rects_from_array,
+    union_bbox,
+    union_rect,
+)
+
+__all__ = [
+    "GROUPING_METHODS",
+    "group_lines",
+    "write_grouping_result",
+    # Bbox helpers that lived here before moving to geometry, re-exported for existing callers
+    "bbox_to_rect",
+    "compute_distance",
+    "compute_vertical_distance",
+    "union_bbox",
+]
+
+
+# Available grouping methods; "agglomerative" is the original reference implementation
+GROUPING_METHODS = ("sweep", "agglomerative")
+
+
+def _cluster_agglomerative(rects: np.ndarray, distance_threshold: float) -> List[List[int]]:
+    """Cluster lines by repeatedly merging the closest pair of groups.
+
+    Quartic in the number of lines; kept for regression comparison.
     """
-    x1_min, y1_min, x1_max, y1_max = rect1
-    x2_min, y2_min, x2_max, y2_max = rect2
-
-    # Check overlap
-    if not (x1_max < x2_min or x2_max < x1_min or y1_max < y2_min or y2_max < y1_min):
-        return 0.0
-
-    # Compute horizontal and vertical distances
-    if x1_max < x2_min:
-        dx = x2_min - x1_max
-    elif x2_max < x1_min:
-        dx = x1_min - x2_max
-    else:
-        dx = 0.0
+    # Vertical gap between every pair of lines, computed once
+    distances = pairwise_vertical_distance(rects)
 
-    if y1_max < y2_min:
-        dy = y2_min - y1_max
-    elif y2_max < y1_min:
-        dy = y1_min - y2_max
-    else:
-        dy = 0.0
+    # Initialize: each line is its own group
+    groups = [[i] for i in range(len(rects))]
 
-    return (dx**2 + dy**2) ** 0.5
+    # Agglomerative clustering: merge closest groups until threshold exceeded
+    while True:
+        if len(groups) == 1:
+            break
+
+        min_dist = float("inf")
+        merge_i, merge_j = -1, -1
 
+        # Find closest pair of groups (minimum distance between any pair of lines)
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                group_dist = distances[np.ix_(groups[i], groups[j])].min()
 
-def compute_vertical_distance(rect1: Tuple[float, float, float, float],
-                              rect2: Tuple[float, float, float, float]) -> float:
-    """Compute vertical distance between two rectangles (for vertical grouping)."""
-    y1_min, y1_max = rect1[1], rect1[3]
-    y2_min, y2_max = rect2[1], rect2[3]
+                if group_dist < min_dist:
+                    min_dist = group_dist
+                    merge_i, merge_j = i, j
 
-    if y1_max < y2_min:
-        return y2_min - y1_max
-    elif y2_max < y1_min:
-        return y1_min - y2_max
-    else:
-        return 0.0  # Overlapping vertically
+        # Stop if minimum distance exceeds threshold
+        if min_dist > distance_threshold:
+            break
 
+        # Merge the two closest groups
+        groups[merge_i].extend(groups[merge_j])
+        groups.pop(merge_j)
 
-def union_bbox(bboxes: List[List[List[float]]]) -> List[List[float]]:
-    """Compute union bounding box of multiple 4-point bboxes."""
-    all_xs = []
-    all_ys = []
-    for bbox in bboxes:
-        for pt in bbox:
-            all_xs.append(pt[0])
-            all_ys.append(pt[1])
+    # Sort lines within each group by vertical position (top to bottom)
+    for group in groups:
+        group.sort(key=lambda idx: rects[idx, 1])  # Sort by y_min
 
-    x_min, x_max = min(all_xs), max(all_xs)
-    y_min, y_max = min(all_ys), max(all_ys)
+    return groups
 
-    # Return as 4-point bbox (clockwise from top-left)
-    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
 
+def _cluster_sweep(rects: np.ndarray, distance_threshold: float) -> List[List[int]]:
+    """Cluster lines with a single sweep over their vertical extents.
 
-def group_lines(ocr_result: dict) -> dict:
+    Single-linkage merging on vertical distance with a fixed threshold yields
+    the connected components of lines whose vertical gap is <= threshold.
+    With lines sorted by y_min, a line joins the current component iff its
+    top is within the threshold of the lowest bottom seen so far, so the
+    components fall out of one pass in O(n log n).
+    """
+    # Stable sort keeps ties in original line order
+    order = np.argsort(rects[:, 1], kind="stable").tolist()
+    y_mins = rects[:, 1].tolist()
+    y_maxs = rects[:, 3].tolist()
+
+    groups: List[List[int]] = []
+    current_bottom = float("-inf")
+    for idx in order:
+        y_min, y_max = y_mins[idx], y_maxs[idx]
+        if groups and y_min - current_bottom <= distance_threshold:
+            groups[-1].append(idx)
+            current_bottom = max(current_bottom, y_max)
+        else:
+            groups.append([idx])
+            current_bottom = y_max
+
+    return groups
+
+
+def group_lines(ocr_result: dict, method: str = "sweep") -> dict:
     """Group OCR text lines into logical regions using geometric heuristics.
 
-    Uses simple agglomerative clustering based on:
-    - Vertical proximity (lines close vertically are grouped)
-    - Horizontal alignment (similar x-coordinates)
+    Lines are clustered by single-linkage on vertical proximity: lines whose
+    vertical gap is within 1.5x the average line height end up in the same
+    group.
 
     Each line belongs to exactly one group.
+
+    Args:
+        ocr_result: OCR result dict with 'lines'
+        method: "sweep" (O(n log n), default) or "agglomerative" (original
+                pairwise merging); both produce the same groups
     """
+    if method not in GROUPING_METHODS:
+        raise ValueError(f"Unknown grouping method: {method} (expected one of {', '.join(GROUPING_METHODS)})")
+
     lines = ocr_result.get("lines", [])
 
     if not lines:
@@ -94,58 +134,24 @@ def group_lines(ocr_result: dict) -> dict:
         }
 
     # Convert bboxes to rectangles for easier computation
-    rects = [bbox_to_rect(line["bbox"]) for line in lines]
-
-    # Initialize: each line is its own group
-    groups = [[i] for i in range(len(lines))]
+    # (float64 so group bboxes written to JSON keep the OCR coordinates exactly)
+    rects = rects_from_array(bboxes_to_array([line["bbox"] for line in lines], dtype=np.float64))
 
     # Compute average line height for distance thresholds
-    heights = [rect[3] - rect[1] for rect in rects]
-    avg_height = sum(heights) / len(heights)
+    avg_height = float((rects[:, 3] - rects[:, 1]).mean())
 
     # Distance threshold: 1.5x average line height
     distance_threshold = avg_height * 1.5
 
-    # Agglomerative clustering: merge closest groups until threshold exceeded
-    while True:
-        if len(groups) == 1:
-            break
-
-        min_dist = float("inf")
-        merge_i, merge_j = -1, -1
-
-        # Find closest pair of groups
-        for i in range(len(groups)):
-            for j in range(i + 1, len(groups)):
-                # Compute minimum distance between any pair of lines
-                group_dist = float("inf")
-                for line_i in groups[i]:
-                    for line_j in groups[j]:
-                        vert_dist = compute_vertical_distance(rects[line_i], rects[line_j])
-                        if vert_dist < group_dist:
-                            group_dist = vert_dist
-
-                if group_dist < min_dist:
-                    min_dist = group_dist
-                    merge_i, merge_j = i, j
-
-        # Stop if minimum distance exceeds threshold
-        if min_dist > distance_threshold:
-            break
-
-        # Merge the two closest groups
-        groups[merge_i].extend(groups[merge_j])
-        groups.pop(merge_j)
-
-    # Sort lines within each group by vertical position (top to bottom)
-    for group in groups:
-        group.sort(key=lambda idx: rects[idx][1])  # Sort by y_min
+    if method == "sweep":
+        groups = _cluster_sweep(rects, distance_threshold)
+    else:
+        groups = _cluster_agglomerative(rects, distance_threshold)
 
     # Build output format
     output_groups = []
     for group_id, line_indices in enumerate(groups, start=1):
-        group_bboxes = [lines[i]["bbox"] for i in line_indices]
-        group_bbox = union_bbox(group_bboxes)
+        group_bbox = rect_to_bbox(union_rect(rects[line_indices]))
 
         output_groups.append({
             "group_id": group_id,
@@ -154,7 +160,7 @@ def group_lines(ocr_result: dict) -> dict:
         })
 
     # Sort groups by position (top-left to bottom-right reading order)
-    output_groups.sort(key=lambda g: (bbox_to_rect(g["bbox"])[1], bbox_to_rect(g["bbox"])[0]))
+    output_groups.sort(key=lambda g: (g["bbox"][0][1], g["bbox"][0][0]))
 
     # Reassign group IDs after sorting
     for new_id, group in enumerate(output_groups, start=1):
@@ -1,17 +1,25 @@
 """Text inpainting using OpenCV Telea algorithm."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from .geometry import bbox_to_int_rect as bbox_to_rect
+from .geometry import bboxes_to_array, expand_rects, int_rects_from_array, rasterize_rects
 
-def bbox_to_rect(bbox: List[List[float]]) -> Tuple[int, int, int, int]:
-    """Convert 4-point bbox to integer rectangle (x_min, y_min, x_max, y_max)."""
-    xs = [int(pt[0]) for pt in bbox]
-    ys = [int(pt[1]) for pt in bbox]
-    return (min(xs), min(ys), max(xs), max(ys))
+
+INPAINT_MODES = ("full", "regions")
+
+# Telea radius used for every inpaint call
+INPAINT_RADIUS = 3
+
+# Context kept around each masked region when cropping. Telea only reads
+# pixels within INPAINT_RADIUS of the pixel being filled, so regions further
+# apart than this cannot influence each other.
+REGION_MARGIN = INPAINT_RADIUS + 2
 
 
 def expand_rect(rect: Tuple[int, int, int, int], padding: int, width: int, height: int) -> Tuple[int, int, int, int]:
@@ -36,34 +44,118 @@ def create_mask_from_groups(groups: dict, width: int, height: int, padding: int
     Returns:
         Binary mask (uint8) where 255 = inpaint region, 0 = preserve
     """
-    mask = np.zeros((height, width), dtype=np.uint8)
+    points = bboxes_to_array([group["bbox"] for group in groups.get("groups", [])])
+    rects = expand_rects(int_rects_from_array(points), padding, width, height)
+    return rasterize_rects(rects, width, height)
+
+
+def find_mask_regions(mask: np.ndarray, margin: int = REGION_MARGIN) -> List[Tuple[int, int, int, int, np.ndarray]]:
+    """Split an inpainting mask into independent padded crops.
+
+    Mask pixels closer than ``margin`` are merged into one region, so each
+    crop carries all the context Telea needs and no two crops interact.
 
-    for group in groups.get("groups", []):
-        bbox = group["bbox"]
-        rect = bbox_to_rect(bbox)
-        expanded = expand_rect(rect, padding, width, height)
+    Args:
+        mask: Binary mask (uint8) where 255 = inpaint region
+        margin: Pixels of surrounding context kept in each crop
+
+    Returns:
+        List of (x_min, y_min, x_max, y_max, crop_mask) where crop_mask holds
+        only that region's mask pixels
+    """
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2 * margin + 1, 2 * margin + 1))
+    dilated = cv2.dilate(mask, kernel)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(dilated, connectivity=8)
 
-        x_min, y_min, x_max, y_max = expanded
-        mask[y_min:y_max, x_min:x_max] = 255
+    regions = []
+    for label in range(1, count):
+        x, y, w, h = (int(v) for v in stats[label, :4])
+        crop_labels = labels[y:y + h, x:x + w]
+        crop_mask = np.where(crop_labels == label, mask[y:y + h, x:x + w], 0).astype(np.uint8)
+        regions.append((x, y, x + w, y + h, crop_mask))
+    return regions
 
-    return mask
 
+def inpaint_regions(image: np.ndarray, mask: np.ndarray, workers: int = 1) -> np.ndarray:
+    """Inpaint each masked region on a small crop and paste the results back.
 
-def run_inpaint(image_path: Path, groups: dict, padding: int = 5) -> Path:
-    """Inpaint text regions in image using group bounding boxes.
+    Produces the same pixels as a single full-image cv2.inpaint call while only
+    touching the neighbourhood of the mask, which matters for tall strips
+    where text covers a small fraction of the page.
 
     Args:
-        image_path: Path to input image
-        groups: Grouping result dictionary
-        padding: Pixels to expand each bbox (default 5)
+        image: BGR image
+        mask: Binary mask (uint8) where 255 = inpaint region
+        workers: Threads used for the crops (OpenCV releases the GIL)
 
     Returns:
-        Path to cleaned output image (same directory, .cleaned.png)
+        Inpainted copy of the image
+    """
+    regions = find_mask_regions(mask)
+    result = image.copy()
+
+    def inpaint_crop(region):
+        x_min, y_min, x_max, y_max, crop_mask = region
+        crop = image[y_min:y_max, x_min:x_max]
+        return cv2.inpaint(crop, crop_mask, inpaintRadius=INPAINT_RADIUS, flags=cv2.INPAINT_TELEA)
+
+    if workers > 1 and len(regions) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            inpainted = list(executor.map(inpaint_crop, regions))
+    else:
+        inpainted = [inpaint_crop(region) for region in regions]
+
+    for (x_min, y_min, x_max, y_max, crop_mask), crop in zip(regions, inpainted):
+        selected = crop_mask > 0
+        result[y_min:y_max, x_min:x_max][selected] = crop[selected]
+
+    return result
+
+
+def load_image(image_path: Path) -> np.ndarray:
+    """Decode an image file into a BGR array.
+
+    Raises:
+        ValueError: If the image cannot be loaded
     """
-    # Load image
     image = cv2.imread(str(image_path))
     if image is None:
         raise ValueError(f"Failed to load image: {image_path}")
+    return image
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode a BGR array as PNG bytes.
+
+    Raises:
+        ValueError: If the image cannot be encoded
+    """
+    ok, encoded = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("Failed to encode image as PNG")
+    return encoded.tobytes()
+
+
+def inpaint_image(image: np.ndarray, groups: dict, padding: int = 5, mode: str = "full", workers: Optional[int] = None) -> np.ndarray:
+    """Inpaint text regions of a decoded image using group bounding boxes.
+
+    Args:
+        image: BGR image
+        groups: Grouping result dictionary
+        padding: Pixels to expand each bbox (default 5)
+        mode: "full" (default) runs cv2.inpaint over the whole page;
+              "regions" inpaints padded crops around each masked region,
+              with identical output
+        workers: Threads for region mode (default 1)
+
+    Returns:
+        Inpainted copy of the image
+
+    Raises:
+        ValueError: If mode is unknown
+    """
+    if mode not in INPAINT_MODES:
+        raise ValueError(f"Unknown inpaint mode: {mode} (expected one of {INPAINT_MODES})")
 
     height, width = image.shape[:2]
 
@@ -72,7 +164,29 @@ def run_inpaint(image_path: Path, groups: dict, padding: int = 5) -> Path:
 
     # Run inpainting using Telea algorithm (deterministic, fast)
     # inpaintRadius=3 is a good balance between quality and speed
-    inpainted = cv2.inpaint(image, mask, inpaintRadius=3, flags=cv2.INPAINT_TELEA)
+    if mode == "regions":
+        return inpaint_regions(image, mask, workers=workers or 1)
+    return cv2.inpaint(image, mask, inpaintRadius=INPAINT_RADIUS, flags=cv2.INPAINT_TELEA)
+
+
+def run_inpaint(image_path: Path, groups: dict, padding: int = 5, mode: str = "full", workers: Optional[int] = None) -> Path:
+    """Inpaint text regions in an image file using group bounding boxes.
+
+    Args:
+        image_path: Path to input image
+        groups: Grouping result dictionary
+        padding, mode, workers: As for inpaint_image
+
+    Returns:
+        Path to cleaned output image (same directory, .cleaned.png)
+
+    Raises:
+        ValueError: If the image cannot be loaded or mode is unknown
+    """
+    if mode not in INPAINT_MODES:
+        raise ValueError(f"Unknown inpaint mode: {mode} (expected one of {INPAINT_MODES})")
+
+    inpainted = inpaint_image(load_image(image_path), groups, padding, mode, workers)
 
     # Save cleaned image
     output_path = image_path.parent / f"{image_path.stem}.cleaned.png"
@@ -0,0 +1,363 @@
+"""Durable page x stage job queue backed by SQLite."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .job import PageJob
+
+
+# Seconds a lease lasts without a heartbeat before another worker may take the job
+DEFAULT_LEASE_SECONDS = 300.0
+
+# Attempts (including ones lost to crashed workers) before a job is dead-lettered
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Retry delay after the n-th failed attempt: base * 2**(n-1), capped
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 3600.0
+
+# Earlier stages (p) of the same page as job j
+_EARLIER_STAGE_SQL = """
+    SELECT 1 FROM jobs AS p
+    WHERE p.source_id = j.source_id AND p.series_id = j.series_id
+    AND p.chapter_id = j.chapter_id AND p.page_index = j.page_index
+    AND p.stage_order < j.stage_order
+"""
+
+# Job statuses
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class QueuedJob:
+    """A page x stage job leased from the queue."""
+
+    id: int
+    source_id: str
+    series_id: str
+    chapter_id: str
+    page_index: int
+    stage: str
+    input_manifest_path: Path
+    output_root: Path
+    options: dict
+    attempts: int
+
+
+def retry_delay(attempts: int) -> float:
+    """Return the delay before retrying a job that has failed `attempts` times."""
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+
+class JobQueue:
+    """Crash-safe queue of page processing jobs, one per page and stage.
+
+    A page's stages are enqueued in order and a stage only becomes available
+    once every earlier stage of the same page is done. Workers lease one job
+    at a time; the lease expires unless renewed with heartbeat(), so a job
+    held by a crashed worker is handed out again. Failed jobs are retried
+    with exponential backoff and dead-lettered after ``max_attempts``.
+
+    Several worker processes may share one queue file: leases are taken in
+    an IMMEDIATE transaction, so no job is handed to two workers at once.
+    Within a process, one connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, db_path: Path, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """Open (or create) the job queue database."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        # Transactions are managed explicitly so leases can BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create database schema if it doesn't exist."""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_id TEXT NOT NULL,
+                series_id TEXT NOT NULL,
+                chapter_id TEXT NOT NULL,
+                page_index INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                stage_order INTEGER NOT NULL,
+                input_manifest_path TEXT NOT NULL,
+                output_root TEXT NOT NULL,
+                options_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                last_error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE(source_id, series_id, chapter_id, page_index, stage)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_page ON jobs (source_id, series_id, chapter_id, page_index, stage_order)
+        """)
+
+    def enqueue(
+        self,
+        jobs: Iterable[PageJob],
+        stages: List[str],
+        output_root: Path,
+        options: Optional[dict] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> int:
+        """Add a job per page and stage.
+
+        Pages already in the queue keep their existing jobs (and progress), so
+        enqueueing the same series again after a restart is safe.
+
+        Args:
+            jobs: Pages to process
+            stages: Stages to run for each page, in execution order
+            output_root: Output directory root the pages are processed into
+            options: run_page_stage keyword options (JSON-serialisable)
+            max_attempts: Attempts per job before it is dead-lettered
+
+        Returns:
+            Number of jobs added
+        """
+        now = time.time()
+        timestamp = datetime.utcnow().isoformat()
+        options_json = json.dumps(options or {})
+        rows = [
+            (
+                job.source_id, job.series_id, job.chapter_id, job.page_index, stage, order,
+                str(job.input_manifest_path), str(output_root), options_json, max_attempts, now, timestamp, timestamp,
+            )
+            for job in jobs
+            for order, stage in enumerate(stages)
+        ]
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO jobs
+                    (source_id, series_id, chapter_id, page_index, stage, stage_order,
+                     input_manifest_path, output_root, options_json, max_attempts, available_at, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                added = self.conn.total_changes - before
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def _release_expired(self, now: float, timestamp: str) -> None:
+        """Return jobs whose lease ran out to the queue, or dead-letter them if out of attempts."""
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = 'dead', lease_owner = NULL, updated_at = ?,
+                last_error = COALESCE(last_error, 'Lease expired (worker died?)')
+            WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= max_attempts
+        """,
+            (timestamp, now),
+        )
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = 'pending', lease_owner = NULL, available_at = ?, updated_at = ?
+            WHERE status = 'leased' AND lease_expires_at < ?
+        """,
+            (now, timestamp, now),
+        )
+
+    def lease(self, owner: str) -> Optional[QueuedJob]:
+        """Lease the oldest available job whose earlier stages are done.
+
+        Returns:
+            The leased job, or None if nothing is available right now
+        """
+        now = time.time()
+        timestamp = datetime.utcnow().isoformat()
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._release_expired(now, timestamp)
+                row = self.conn.execute(
+                    f"""
+                    SELECT * FROM jobs AS j
+                    WHERE j.status = 'pending' AND j.available_at <= ?
+                    AND NOT EXISTS ({_EARLIER_STAGE_SQL} AND p.status != 'done')
+                    ORDER BY j.id
+                    LIMIT 1
+                """,
+                    (now,),
+                ).fetchone()
+
+                if row is not None:
+                    self.conn.execute(
+                        """
+                        UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                            lease_expires_at = ?, updated_at = ?
+                        WHERE id = ?
+                    """,
+                        (owner, now + self.lease_seconds, timestamp, row["id"]),
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return QueuedJob(
+            id=row["id"],
+            source_id=row["source_id"],
+            series_id=row["series_id"],
+            chapter_id=row["chapter_id"],
+            page_index=row["page_index"],
+            stage=row["stage"],
+            input_manifest_path=Path(row["input_manifest_path"]),
+            output_root=Path(row["output_root"]),
+            options=json.loads(row["options_json"]),
+            attempts=row["attempts"] + 1,
+        )
+
+    def heartbeat(self, job_id: int, owner: str) -> bool:
+        """Extend a lease. Returns False if the lease was lost to another worker."""
+        with self._lock:
+            cursor = self.conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """,
+                (time.time() + self.lease_seconds, job_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, owner: str) -> bool:
+        """Mark a leased job done. Returns False if the lease was lost."""
+        with self._lock:
+            cursor = self.conn.execute(
+                """
+                UPDATE jobs SET status = 'done', lease_owner = NULL, last_error = NULL, updated_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """,
+                (datetime.utcnow().isoformat(), job_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str) -> Optional[str]:
+        """Record a failed attempt: schedule a retry with backoff, or dead-letter the job.
+
+        Returns:
+            The job's new status ("pending" or "dead"), or None if the lease was lost
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                    (job_id, owner),
+                ).fetchone()
+                status = None
+                if row is not None:
+                    status = DEAD if row["attempts"] >= row["max_attempts"] else PENDING
+                    self.conn.execute(
+                        """
+                        UPDATE jobs SET status = ?, lease_owner = NULL, last_error = ?, available_at = ?, updated_at = ?
+                        WHERE id = ?
+                    """,
+                        (status, error, now + retry_delay(row["attempts"]), datetime.utcnow().isoformat(), job_id),
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return status
+
+    def retry_dead(self) -> int:
+        """Give every dead-lettered job a fresh set of attempts. Returns the number requeued."""
+        with self._lock:
+            cursor = self.conn.execute(
+                """
+                UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ?
+                WHERE status = 'dead'
+            """,
+                (time.time(), datetime.utcnow().isoformat()),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Return {status: number of jobs}.
+
+        Pending jobs behind a dead-lettered stage of the same page are counted
+        as "blocked": they cannot run until the dead job is retried.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                f"""
+                SELECT CASE WHEN j.status = 'pending' AND EXISTS ({_EARLIER_STAGE_SQL} AND p.status = 'dead')
+                            THEN 'blocked' ELSE j.status END AS state,
+                       COUNT(*)
+                FROM jobs AS j GROUP BY state
+            """
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def next_available_in(self) -> Optional[float]:
+        """Seconds until another job may become available to lease.
+
+        Returns None once nothing is left that could run: every job is done,
+        dead, or blocked behind a dead job. Jobs leased by other workers count,
+        since completing (or abandoning) them unblocks later stages.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                f"""
+                SELECT MIN(CASE WHEN j.status = 'pending' THEN j.available_at ELSE j.lease_expires_at END)
+                FROM jobs AS j
+                WHERE j.status = 'leased'
+                OR (j.status = 'pending' AND NOT EXISTS ({_EARLIER_STAGE_SQL} AND p.status != 'done'))
+            """
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def dead_jobs(self) -> List[dict]:
+        """Return dead-lettered jobs with their last error."""
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT source_id, series_id, chapter_id, page_index, stage, attempts, last_error
+                FROM jobs WHERE status = 'dead' ORDER BY id
+            """
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,181 @@
+"""Per-stage timing, memory and I/O measurements for page processing."""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Metrics summarised by `manhwa stats`
+METRIC_FIELDS = ("wall_seconds", "cpu_seconds", "peak_rss_bytes", "bytes_read", "bytes_written")
+
+# Per-thread I/O counters (Linux); falls back to process-wide counters
+_IO_PATHS = (Path("/proc/thread-self/io"), Path("/proc/self/io"))
+
+
+@dataclass
+class StageMetrics:
+    """Resource usage of one stage for one page.
+
+    cpu_seconds and the I/O counters are taken from the calling thread where
+    the platform allows, so concurrent stages in the pipelined runner do not
+    pollute each other. peak_rss_bytes is the process high-water mark at the
+    end of the stage. Fields the platform cannot provide are None.
+    """
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        """Return the measurements without the stage name."""
+        result = asdict(self)
+        del result["stage"]
+        return result
+
+
+def _read_io_counters() -> Optional[Dict[str, int]]:
+    """Return rchar/wchar I/O counters, or None where unavailable."""
+    for path in _IO_PATHS:
+        try:
+            with open(path, "r") as f:
+                counters = dict(line.split(":", 1) for line in f if ":" in line)
+            return {"read": int(counters["rchar"]), "written": int(counters["wchar"])}
+        except (OSError, KeyError, ValueError):
+            continue
+    return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Return the process peak resident set size in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def measure_stage(stage: str) -> Iterator[StageMetrics]:
+    """Measure the enclosed block; the yielded metrics are filled in on exit.
+
+    Metrics are recorded even if the block raises.
+    """
+    metrics = StageMetrics(stage=stage)
+    io_start = _read_io_counters()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - wall_start
+        metrics.cpu_seconds = time.thread_time() - cpu_start
+        metrics.peak_rss_bytes = _peak_rss_bytes()
+        io_end = _read_io_counters()
+        if io_start is not None and io_end is not None:
+            metrics.bytes_read = io_end["read"] - io_start["read"]
+            metrics.bytes_written = io_end["written"] - io_start["written"]
+
+
+_LOG_LOCK = threading.Lock()
+
+
+def append_metrics_record(log_path: Path, record: dict) -> None:
+    """Append one page's metrics to a JSONL log.
+
+    Each record is written as a single line with one append, so worker
+    processes can share a log file.
+    """
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _LOG_LOCK:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def read_metrics_log(
+    log_path: Path,
+    source_id: Optional[str] = None,
+    series_id: Optional[str] = None,
+    chapter_id: Optional[str] = None,
+) -> List[dict]:
+    """Load page records from a metrics log, optionally filtered.
+
+    If a page was processed more than once, its latest record is kept; stages
+    missing from it (recorded separately, e.g. by queue workers) are taken
+    from earlier records.
+    """
+    filters = {"source_id": source_id, "series_id": series_id, "chapter_id": chapter_id}
+    latest: Dict[tuple, dict] = {}
+
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if any(value is not None and record.get(key) != value for key, value in filters.items()):
+                continue
+            key = (record.get("source_id"), record.get("series_id"), record.get("chapter_id"), record.get("page_index"))
+            previous = latest.get(key)
+            if previous is not None:
+                record["stages"] = {**previous.get("stages", {}), **record.get("stages", {})}
+            latest[key] = record
+
+    return list(latest.values())
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) using linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile of empty list")
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_metrics(records: Iterable[dict]) -> Dict[str, dict]:
+    """Summarise per-stage metrics across page records.
+
+    Returns:
+        {stage: {"pages": n, metric: {"p50": ..., "p95": ..., "total": ...}}}
+        with stages in first-seen order; metrics with no samples are omitted.
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    pages: Dict[str, int] = {}
+
+    for record in records:
+        for stage, stage_metrics in record.get("stages", {}).items():
+            pages[stage] = pages.get(stage, 0) + 1
+            stage_samples = samples.setdefault(stage, {name: [] for name in METRIC_FIELDS})
+            for name in METRIC_FIELDS:
+                value = stage_metrics.get(name)
+                if value is not None:
+                    stage_samples[name].append(value)
+
+    summary: Dict[str, dict] = {}
+    for stage, stage_samples in samples.items():
+        summary[stage] = {"pages": pages[stage]}
+        for name, values in stage_samples.items():
+            if values:
+                summary[stage][name] = {
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "total": sum(values),
+                }
+
+    return summary
@@ -1,32 +1,291 @@
 """OCR functionality for processing pipeline."""
 
 import json
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from .geometry import Rect, bbox_to_rect, rect_iou
 from .job import PageJob
+from .page_image import PageImage
 
 
-def run_ocr(job: PageJob) -> dict:
-    """Run whole-page OCR on input image using PaddleOCR."""
-    from paddleocr import PaddleOCR
+# Default number of engines a single pool may hold (one per worker thread)
+DEFAULT_POOL_SIZE = 1
 
-    # Initialize PaddleOCR for Korean
-    ocr_engine = PaddleOCR(lang="korean", use_angle_cls=False, show_log=False)
+# Rows shared by consecutive tiles in tiled OCR; must exceed the tallest text
+# line so that every line lies whole inside at least one tile
+DEFAULT_TILE_OVERLAP = 160
+
+# Lines from neighbouring tiles overlapping by at least this IoU are the same line
+TILE_DEDUP_IOU = 0.5
+
+# A detection within this many pixels of an inner tile edge is treated as cut off
+TILE_EDGE_MARGIN = 2
+
+
+class OCREnginePool:
+    """Bounded pool of lazily-constructed PaddleOCR engines.
+
+    All engines in a pool share the same configuration. Engines are created on
+    demand up to ``max_size``; once that many exist, callers block until one
+    is released. Each process has its own pools, so worker processes each
+    load their own models.
+    """
+
+    def __init__(self, lang: str = "korean", use_angle_cls: bool = False, max_size: int = DEFAULT_POOL_SIZE):
+        """Initialize an empty pool for the given engine configuration."""
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+
+        self.lang = lang
+        self.use_angle_cls = use_angle_cls
+        self.max_size = max_size
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the number of engines constructed so far."""
+        return self._created
+
+    def _create_engine(self) -> Any:
+        """Construct a new PaddleOCR engine for this pool's configuration."""
+        from paddleocr import PaddleOCR
+
+        return PaddleOCR(lang=self.lang, use_angle_cls=self.use_angle_cls, show_log=False)
+
+    def _checkout(self) -> Any:
+        """Take an idle engine, constructing one if the pool is not yet full."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._create_engine()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool is full: wait for another worker to release an engine
+        return self._idle.get()
+
+    @contextmanager
+    def engine(self) -> Iterator[Any]:
+        """Borrow an engine for the duration of the ``with`` block."""
+        ocr_engine = self._checkout()
+        try:
+            yield ocr_engine
+        finally:
+            self._idle.put(ocr_engine)
+
+    def warm_up(self, count: int = 1) -> int:
+        """Eagerly construct engines so the first pages don't pay model load.
+
+        Args:
+            count: Number of engines to have ready (capped at max_size)
+
+        Returns:
+            Number of engines in the pool after warm-up
+        """
+        count = min(count, self.max_size)
+        engines = []
+        try:
+            while self.size < count:
+                engines.append(self._checkout())
+        finally:
+            for ocr_engine in engines:
+                self._idle.put(ocr_engine)
+        return self.size
+
+
+_POOLS: Dict[Tuple[str, bool], OCREnginePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_engine_pool(lang: str = "korean", use_angle_cls: bool = False, max_size: int | None = None) -> OCREnginePool:
+    """Return the process-wide engine pool for a configuration, creating it if needed.
+
+    Args:
+        lang: PaddleOCR language name
+        use_angle_cls: Whether engines load the angle classifier
+        max_size: Optional pool bound; an existing pool is only ever grown
+    """
+    key = (lang, use_angle_cls)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = OCREnginePool(lang, use_angle_cls, max_size or DEFAULT_POOL_SIZE)
+            _POOLS[key] = pool
+        elif max_size is not None and max_size > pool.max_size:
+            pool.max_size = max_size
+    return pool
+
+
+def warm_up(count: int = 1, lang: str = "korean", use_angle_cls: bool = False) -> OCREnginePool:
+    """Pre-load ``count`` engines into the default pool (e.g. one per worker)."""
+    pool = get_engine_pool(lang, use_angle_cls, max_size=count)
+    pool.warm_up(count)
+    return pool
 
-    # Run OCR on input image
-    result = ocr_engine.ocr(str(job.input_image_path), cls=False)
 
-    # Parse results into structured format
+def reset_engine_pools() -> None:
+    """Drop all cached engines (mainly for tests)."""
+    with _POOLS_LOCK:
+        _POOLS.clear()
+
+
+def _parse_lines(result: Any, y_offset: int = 0) -> List[dict]:
+    """Convert a PaddleOCR result into ``lines`` entries, shifting bboxes down by y_offset."""
     lines = []
     if result and result[0]:
         for detection in result[0]:
             bbox = detection[0]  # [[x1,y1],[x2,y2],[x3,y3],[x4,y4]]
+            if y_offset:
+                bbox = [[pt[0], pt[1] + y_offset] for pt in bbox]
             text_info = detection[1]  # (text, confidence)
             text = text_info[0]
             confidence = float(text_info[1])
 
             lines.append({"text": text, "confidence": confidence, "bbox": bbox})
+    return lines
+
+
+def _same_line(rect: Rect, cut: bool, other_rect: Rect, other_cut: bool) -> bool:
+    """Whether two detections from neighbouring tiles are the same text line.
+
+    Whole detections match by IoU. A detection cut off by a tile edge covers
+    only part of the line, so it matches when most of it lies inside the other.
+    """
+    if rect_iou(rect, other_rect) >= TILE_DEDUP_IOU:
+        return True
+    for part, part_cut, whole in ((rect, cut, other_rect), (other_rect, other_cut, rect)):
+        area = (part[2] - part[0]) * (part[3] - part[1])
+        if part_cut and area > 0:
+            inter_w = min(part[2], whole[2]) - max(part[0], whole[0])
+            inter_h = min(part[3], whole[3]) - max(part[1], whole[1])
+            if inter_w > 0 and inter_h > 0 and inter_w * inter_h / area >= TILE_DEDUP_IOU:
+                return True
+    return False
+
+
+def merge_tile_lines(tiles: List[Tuple[int, int, List[dict]]], page_height: int) -> List[dict]:
+    """Merge lines OCRed from overlapping tiles into one page-level list.
+
+    A line in an overlap band is usually detected by both tiles. Each line is
+    compared with the lines kept from the previous tile; of two detections of
+    the same line, one not cut off by a tile edge wins, then the more
+    confident one. Unmatched lines are kept even if cut off.
+
+    Args:
+        tiles: (y_offset, rows, lines) per tile, top to bottom, with bboxes
+               already in page coordinates
+        page_height: Page height in pixels (the bottom of the last tile is not an inner edge)
+
+    Returns:
+        Lines in tile order
+    """
+    merged: List[dict] = []
+    previous: List[int] = []  # indices into merged of the previous tile's lines
+    cut_flags: Dict[int, bool] = {}
+
+    for y_offset, rows, lines in tiles:
+        current = []
+        top_edge = y_offset + TILE_EDGE_MARGIN if y_offset > 0 else None
+        bottom_edge = y_offset + rows - TILE_EDGE_MARGIN if y_offset + rows < page_height else None
+
+        for line in lines:
+            rect = bbox_to_rect(line["bbox"])
+            cut = (top_edge is not None and rect[1] <= top_edge) or (bottom_edge is not None and rect[3] >= bottom_edge)
+
+            match = next(
+                (
+                    index for index in previous
+                    if _same_line(rect, cut, bbox_to_rect(merged[index]["bbox"]), cut_flags[index])
+                ),
+                None,
+            )
+            if match is None:
+                merged.append(line)
+                match = len(merged) - 1
+                cut_flags[match] = cut
+            elif (cut, -line["confidence"]) < (cut_flags[match], -merged[match]["confidence"]):
+                merged[match] = line
+                cut_flags[match] = cut
+            # Matched lines stay comparable with the next tile too, which
+            # may still cover them when the overlap exceeds half a tile
+            if match not in current:
+                current.append(match)
+
+        previous = current
+
+    return merged
+
+
+def _ocr_tiled(ocr_engine: Any, page: PageImage, tile_height: int, tile_overlap: int) -> Tuple[List[dict], int]:
+    """OCR a page as overlapping horizontal tiles with one engine.
+
+    Returns:
+        (lines in page coordinates, number of tiles)
+    """
+    tiles = []
+    for y_offset, rows in page.tiles(tile_height, tile_overlap):
+        result = ocr_engine.ocr(rows, cls=False)
+        tiles.append((y_offset, rows.shape[0], _parse_lines(result, y_offset)))
+    return merge_tile_lines(tiles, page.size[1]), len(tiles)
+
+
+def run_ocr(job: PageJob, image: Any = None, tile_height: Optional[int] = None, tile_overlap: Optional[int] = None) -> dict:
+    """Run OCR on input image using a pooled PaddleOCR engine.
+
+    Pages taller than ``tile_height`` (e.g. webtoon strips) are recognised as
+    overlapping horizontal tiles instead of being downscaled as a whole:
+    all tiles go through the same engine, lines detected twice in an overlap
+    band are merged, and bboxes are mapped back to page coordinates, so the
+    result has the same ``lines`` as whole-page OCR.
+
+    Args:
+        job: Page job whose input image is recognised
+        image: The input image already decoded (BGR array), if available;
+               otherwise the engine decodes job.input_image_path
+        tile_height: Rows per tile; None recognises the whole page at once
+        tile_overlap: Rows shared by consecutive tiles (default DEFAULT_TILE_OVERLAP)
+
+    Raises:
+        ValueError: If the tiling is invalid or the image cannot be loaded
+    """
+    pool = get_engine_pool(lang="korean", use_angle_cls=False)
+
+    page = None
+    if tile_height is not None:
+        if tile_overlap is None:
+            tile_overlap = DEFAULT_TILE_OVERLAP
+        if tile_height < 1 or not 0 <= tile_overlap < tile_height:
+            raise ValueError(f"Need 0 <= tile_overlap < tile_height, got {tile_overlap} and {tile_height}")
+        page = PageImage(job.input_image_path, image)
+        if page.size[1] <= tile_height:
+            image, page = page.array, None
+
+    # Run OCR on input image
+    tiles = 1
+    with pool.engine() as ocr_engine:
+        if page is not None:
+            lines, tiles = _ocr_tiled(ocr_engine, page, tile_height, tile_overlap)
+        else:
+            result = ocr_engine.ocr(image if image is not None else str(job.input_image_path), cls=False)
+            lines = _parse_lines(result)
 
     # Construct OCR result
     ocr_result = {
@@ -36,6 +295,8 @@ def run_ocr(job: PageJob) -> dict:
         "source_image": str(job.input_image_path),
         "created_at": datetime.utcnow().isoformat(),
     }
+    if page is not None:
+        ocr_result["tiling"] = {"tile_height": tile_height, "overlap": tile_overlap, "tiles": tiles}
 
     return ocr_result
 
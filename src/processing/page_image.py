@@ -0,0 +1,94 @@
+"""Page images decoded once and shared between processing stages."""
+
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class PageImage:
+    """Handle to a page image that is decoded at most once.
+
+    The pixels are held as a BGR array (the layout OpenCV and PaddleOCR
+    use), decoded from ``path`` on first access. Stages take what they need
+    from the handle instead of decoding the file again: the array itself,
+    row tiles that are views into it, or a PIL image for drawing, which is
+    converted once and cached.
+    """
+
+    def __init__(self, path: Path, array: Optional[np.ndarray] = None):
+        """Create a handle for an image file, optionally already decoded."""
+        self.path = Path(path)
+        self._array = array
+        self._pil: Optional[Image.Image] = None
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, path: Path) -> "PageImage":
+        """Wrap pixels that are already in memory (e.g. a stage result saved at path)."""
+        return cls(path, array)
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the pixels are in memory."""
+        return self._array is not None
+
+    @property
+    def array(self) -> np.ndarray:
+        """The BGR pixels, decoding the file on first access.
+
+        Raises:
+            ValueError: If the image cannot be loaded
+        """
+        if self._array is None:
+            image = cv2.imread(str(self.path))
+            if image is None:
+                raise ValueError(f"Failed to load image: {self.path}")
+            self._array = image
+        return self._array
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) in pixels."""
+        height, width = self.array.shape[:2]
+        return width, height
+
+    def to_pil(self) -> Image.Image:
+        """Return the image as an RGB PIL image, converted once and cached.
+
+        Drawing on the returned image changes the cached copy (not the array).
+        """
+        if self._pil is None:
+            self._pil = Image.fromarray(cv2.cvtColor(self.array, cv2.COLOR_BGR2RGB))
+        return self._pil
+
+    def tiles(self, tile_height: int, overlap: int = 0) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (y_offset, rows) for horizontal bands of the image.
+
+        Bands are views into the decoded array, not copies, and are produced
+        as they are iterated. Consecutive bands share ``overlap`` rows.
+
+        Args:
+            tile_height: Rows per band
+            overlap: Rows repeated at the top of each band after the first
+
+        Raises:
+            ValueError: If overlap is not smaller than tile_height
+        """
+        if tile_height < 1 or not 0 <= overlap < tile_height:
+            raise ValueError(f"Need 0 <= overlap < tile_height, got overlap={overlap}, tile_height={tile_height}")
+
+        array = self.array
+        height = array.shape[0]
+        y = 0
+        while True:
+            yield y, array[y:y + tile_height]
+            if y + tile_height >= height:
+                return
+            y += tile_height - overlap
+
+    def release(self) -> None:
+        """Drop the decoded pixels; they are decoded again if needed."""
+        self._array = None
+        self._pil = None
@@ -1,16 +1,39 @@
 """Text rendering onto cleaned page images."""
 
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from .geometry import bbox_to_int_rect as bbox_to_rect
 
-def bbox_to_rect(bbox: List[List[float]]) -> Tuple[int, int, int, int]:
-    """Convert 4-point bbox to integer rectangle (x_min, y_min, x_max, y_max)."""
-    xs = [int(pt[0]) for pt in bbox]
-    ys = [int(pt[1]) for pt in bbox]
-    return (min(xs), min(ys), max(xs), max(ys))
+
+FONT_PATHS = [
+    "/System/Library/Fonts/Supplemental/Arial.ttf",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",  # Linux
+    "C:\\Windows\\Fonts\\arial.ttf",  # Windows
+]
+
+# Distinct (path, size) pairs kept open; pages use a handful of sizes between 10 and 24
+FONT_CACHE_SIZE = 64
+
+# Outline drawn around each glyph for contrast
+OUTLINE_WIDTH = 1
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _open_font(font_path: str, size: int) -> Optional[ImageFont.FreeTypeFont]:
+    """Open a TrueType font, returning None if it is unavailable.
+
+    Misses are cached too, so missing font paths are only probed once.
+    """
+    try:
+        return ImageFont.truetype(font_path, size)
+    except (OSError, IOError):
+        return None
 
 
 def load_font(size: int = 14) -> ImageFont.FreeTypeFont:
@@ -20,25 +43,61 @@ def load_font(size: int = 14) -> ImageFont.FreeTypeFont:
     - Noto Sans
     - DejaVu Sans
     - Arial
-    Falls back to PIL default if none found.
+    Falls back to PIL default if none found. Fonts are cached by (path, size).
     """
-    font_names = [
-        "/System/Library/Fonts/Supplemental/Arial.ttf",  # macOS
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-        "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",  # Linux
-        "C:\\Windows\\Fonts\\arial.ttf",  # Windows
-    ]
-
-    for font_path in font_names:
-        try:
-            return ImageFont.truetype(font_path, size)
-        except (OSError, IOError):
-            continue
+    for font_path in FONT_PATHS:
+        font = _open_font(font_path, size)
+        if font is not None:
+            return font
 
     # Fallback to default font
     return ImageFont.load_default()
 
 
+def font_path() -> Optional[str]:
+    """Return the font file load_font renders with, or None for PIL's default font."""
+    for path in FONT_PATHS:
+        if _open_font(path, 14) is not None:
+            return path
+    return None
+
+
+_TEXT_WIDTHS: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+
+def _measure(font: ImageFont.FreeTypeFont, text: str) -> int:
+    """Return the rendered width of text."""
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0]
+
+
+def text_width(font: ImageFont.FreeTypeFont, text: str) -> int:
+    """Return the rendered width of a word, memoised per font.
+
+    Only use this for single words, which repeat across pages; whole lines
+    rarely do and would grow the cache without bound, so measure them with
+    _measure.
+    """
+    widths = _TEXT_WIDTHS.get(font)
+    if widths is None:
+        widths = {}
+        _TEXT_WIDTHS[font] = widths
+
+    width = widths.get(text)
+    if width is None:
+        width = _measure(font, text)
+        widths[text] = width
+    return width
+
+
+def _space_width(font: ImageFont.FreeTypeFont) -> int:
+    """Return the advance a space adds between two words.
+
+    A lone space has no ink, so measure it between two glyphs.
+    """
+    return text_width(font, "x x") - text_width(font, "xx")
+
+
 def calculate_font_size(bbox_width: int, bbox_height: int, text_length: int) -> int:
     """Calculate appropriate font size based on bbox dimensions and text length.
 
@@ -58,23 +117,27 @@ def calculate_font_size(bbox_width: int, bbox_height: int, text_length: int) ->
 def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
     """Wrap text to fit within max_width using the given font.
 
-    Simple word-based wrapping.
+    Simple word-based wrapping. Each word is measured once and line widths
+    are accumulated from word and space widths.
     """
     words = text.split()
     lines = []
     current_line = []
+    current_width = 0
+    space_width = _space_width(font) if len(words) > 1 else 0
 
     for word in words:
-        test_line = " ".join(current_line + [word])
-        bbox = font.getbbox(test_line)
-        width = bbox[2] - bbox[0]
+        word_width = text_width(font, word)
+        width = current_width + space_width + word_width if current_line else word_width
 
         if width <= max_width:
             current_line.append(word)
+            current_width = width
         else:
             if current_line:
                 lines.append(" ".join(current_line))
                 current_line = [word]
+                current_width = word_width
             else:
                 # Single word too long, add anyway
                 lines.append(word)
@@ -107,7 +170,8 @@ def render_text_in_bbox(
     lines = wrap_text(text, font, box_width - 10)  # 5px padding on each side
 
     # Calculate total text height
-    line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1] + 2
+    ascent_bbox = font.getbbox("Ay")
+    line_height = ascent_bbox[3] - ascent_bbox[1] + 2
     total_height = len(lines) * line_height
 
     # Start y position (vertically centered)
@@ -116,36 +180,33 @@ def render_text_in_bbox(
     # Render each line
     for line in lines:
         # Get line width for horizontal centering
-        line_bbox = font.getbbox(line)
-        line_width = line_bbox[2] - line_bbox[0]
+        line_width = _measure(font, line)
         x_offset = x_min + max(0, (box_width - line_width) // 2)
 
-        # Draw text with white outline for contrast
-        outline_width = 1
-        for dx in [-outline_width, 0, outline_width]:
-            for dy in [-outline_width, 0, outline_width]:
-                if dx != 0 or dy != 0:
-                    draw.text((x_offset + dx, y_offset + dy), line, font=font, fill="white")
-
-        # Draw main text in black
-        draw.text((x_offset, y_offset), line, font=font, fill="black")
+        # Draw black text with a white outline for contrast in a single pass
+        draw.text(
+            (x_offset, y_offset), line, font=font, fill="black", stroke_width=OUTLINE_WIDTH, stroke_fill="white"
+        )
 
         y_offset += line_height
 
 
-def render_page(image_path: Path, groups: dict, translations: dict) -> Path:
+def render_page(image_path: Path, groups: dict, translations: dict, image: Optional[Image.Image] = None) -> Path:
     """Render translated text onto cleaned page image.
 
     Args:
         image_path: Path to cleaned image (page.cleaned.png)
         groups: Grouping result dictionary
         translations: Translation result dictionary
+        image: The cleaned image already decoded, if available; it is drawn
+               on in place and image_path is then only used to name the output
 
     Returns:
         Path to rendered output image (page.rendered.png)
     """
     # Load cleaned image
-    image = Image.open(image_path)
+    if image is None:
+        image = Image.open(image_path)
     draw = ImageDraw.Draw(image)
 
     # Get translation lines
@@ -1,14 +1,537 @@
 """Processing runner for executing page jobs."""
 
 import json
+import logging
+import os
+import queue
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
 
+from .fingerprint import file_digest, hash_json, package_version, stage_fingerprint, written_digest
 from .job import PageJob
+from .metrics import StageMetrics, append_metrics_record, measure_stage
 
+if TYPE_CHECKING:
+    from .page_image import PageImage
 
-def run_page(job: PageJob, with_ocr: bool = False, with_translate: bool = False, with_grouping: bool = False, with_inpaint: bool = False, with_render: bool = False) -> PageJob:
+
+logger = logging.getLogger(__name__)
+
+
+# Pipeline stages in execution order
+STAGES = ("ocr", "translate", "grouping", "inpaint", "render")
+
+# Optional per-stage semaphores bounding how many pages run a stage at once
+_STAGE_LIMITS: Dict[str, object] = {}
+
+# Default worker threads per stage for the pipelined runner
+DEFAULT_STAGE_WORKERS = {"translate": 2}
+
+# How prepare provides {idx}_processed.png: a hard link to the source page
+# (falling back to a copy across filesystems), a full copy, or nothing.
+# Stages always read the source page itself.
+OUTPUT_IMAGE_MODES = ("link", "copy", "none")
+
+
+def set_stage_limits(limits: Dict[str, object]) -> None:
+    """Install per-stage concurrency limits.
+
+    Args:
+        limits: Mapping of stage name to a semaphore-like object (threading or
+                multiprocessing). Stages without an entry are unbounded.
+    """
+    _STAGE_LIMITS.clear()
+    _STAGE_LIMITS.update(limits)
+
+
+@contextmanager
+def _stage_slot(stage: str) -> Iterator[None]:
+    """Hold the concurrency slot for a stage, if one is configured."""
+    semaphore = _STAGE_LIMITS.get(stage)
+    if semaphore is None:
+        yield
+        return
+
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+class StageError(Exception):
+    """Raised when a stage cannot run because its inputs are missing."""
+
+    pass
+
+
+# Persists a result: writer(write_fn, result, path)
+Writer = Callable[[Callable[[dict, Path], None], dict, Path], None]
+
+
+@dataclass
+class _PageState:
+    """In-memory results for one page as it moves through the stages."""
+
+    job: PageJob
+    ocr_result: Optional[dict] = None
+    translation_result: Optional[dict] = None
+    grouping_result: Optional[dict] = None
+    cleaned_image_path: Optional[Path] = None
+    batch_translate: bool = False
+    translation_memory_path: Optional[Path] = None
+    inpaint_mode: str = "full"
+    metrics_log_path: Optional[Path] = None
+    force: bool = False
+    output_image: str = "copy"
+    ocr_tile_height: Optional[int] = None
+    ocr_tile_overlap: Optional[int] = None
+    # Stages this run will execute, in order
+    stages: List[str] = field(default_factory=list)
+    # Decoded pages shared between stages: the source page (OCR, inpaint)
+    # and the inpainted page handed to render without a PNG round-trip
+    source_image: Optional["PageImage"] = None
+    cleaned_image: Optional["PageImage"] = None
+    output_manifest: Optional[dict] = None
+    metrics: Dict[str, StageMetrics] = field(default_factory=dict)
+    pending_writes: List[Future] = field(default_factory=list)
+    # Stage fingerprints and file digests, carried over from earlier runs
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    digests: Dict[str, dict] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def output_dir(self) -> Path:
+        return self.job.output_manifest_path.parent
+
+    @property
+    def ocr_path(self) -> Path:
+        return self.output_dir / f"page_{self.job.page_index:03d}.ocr.json"
+
+    @property
+    def translation_path(self) -> Path:
+        return self.output_dir / f"page_{self.job.page_index:03d}.translated.json"
+
+    @property
+    def grouping_path(self) -> Path:
+        return self.output_dir / f"page_{self.job.page_index:03d}.groups.json"
+
+    @property
+    def cleaned_path(self) -> Path:
+        image_path = self.job.output_image_path
+        return image_path.parent / f"{image_path.stem}.cleaned.png"
+
+    @property
+    def rendered_path(self) -> Path:
+        image_path = self.job.output_image_path
+        return image_path.parent / f"{image_path.stem}.rendered.png"
+
+    def page_image(self) -> "PageImage":
+        """Return the shared handle to the source page; it is decoded on first use."""
+        from .page_image import PageImage
+
+        if self.source_image is None:
+            self.source_image = PageImage(self.job.input_image_path)
+        return self.source_image
+
+    def restore_fingerprints(self, manifest: dict) -> None:
+        """Adopt the fingerprints and digests recorded in an earlier output manifest."""
+        self.fingerprints = dict(manifest.get("fingerprints", {}))
+        self.digests = dict(manifest.get("digests", {}))
+
+    def digest(self, name: str, path: Path) -> str:
+        """Return the sha256 of a file, reusing the recorded digest if the file is unchanged."""
+        self.digests[name] = file_digest(path, self.digests.get(name))
+        return self.digests[name]["sha256"]
+
+
+def _write_json(result: dict, output_path: Path) -> None:
+    """Write a JSON result file (used for the output manifest)."""
+    with open(output_path, "w") as f:
+        json.dump(result, f, indent=2)
+
+
+def _write_now(write_fn: Callable[[dict, Path], None], result: dict, path: Path) -> None:
+    """Writer that persists results synchronously."""
+    write_fn(result, path)
+
+
+def _load_json(path: Path, missing_error: str) -> dict:
+    """Read an intermediate result written by a previous run."""
+    if not path.exists():
+        raise StageError(f"{missing_error}: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _place_output_image(source: Path, dest: Path, link: bool) -> None:
+    """Make dest a hard link to (or copy of) source.
+
+    dest is replaced rather than overwritten, so a previous hard link never
+    has the source page (or the acquisition blob it shares) written through it.
+    """
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    if link:
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copy2(source, tmp)  # e.g. a different filesystem
+    else:
+        shutil.copy2(source, tmp)
+    os.replace(tmp, dest)
+
+
+def _prepare(state: _PageState, write: Writer) -> None:
+    """Validate inputs, provide the output page image and write the output manifest."""
+    job = state.job
+
+    if state.output_image not in OUTPUT_IMAGE_MODES:
+        raise ValueError(f"Unknown output image mode: {state.output_image} (expected one of {OUTPUT_IMAGE_MODES})")
+
+    # Validate input files exist
+    if not job.input_image_path.exists():
+        raise StageError(f"Input image not found: {job.input_image_path}")
+
+    if not job.input_manifest_path.exists():
+        raise StageError(f"Input manifest not found: {job.input_manifest_path}")
+
+    # Create output directory
+    job.output_image_path.parent.mkdir(parents=True, exist_ok=True)
+    job.output_manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Fingerprints from the previous run decide which stages can be skipped
+    if job.output_manifest_path.exists():
+        try:
+            state.restore_fingerprints(_load_json(job.output_manifest_path, "Output manifest not found"))
+        except ValueError:
+            pass  # Unreadable manifest: run everything
+
+    # Link or copy the input image to the output, unless the one from the last run is current
+    fingerprint = stage_fingerprint(
+        "prepare", {"image": state.digest("input_image", job.input_image_path), "output_image": state.output_image}
+    )
+    if state.force or state.fingerprints.get("prepare") != fingerprint or not job.output_image_path.exists():
+        if state.output_image != "none":
+            _place_output_image(job.input_image_path, job.output_image_path, link=state.output_image == "link")
+        state.fingerprints["prepare"] = fingerprint
+
+    # Read input manifest
+    with open(job.input_manifest_path, "r") as f:
+        input_manifest = json.load(f)
+
+    # Write output manifest
+    output_manifest = {
+        "input_manifest": str(job.input_manifest_path),
+        "input_image": str(job.input_image_path),
+        "output_image": str(job.output_image_path) if state.output_image != "none" else None,
+        "status": "DONE",
+        "processed_at": datetime.utcnow().isoformat(),
+        "source_id": job.source_id,
+        "series_id": job.series_id,
+        "chapter_id": job.chapter_id,
+        "page_index": job.page_index,
+    }
+
+    state.output_manifest = output_manifest
+    write(_write_json, output_manifest, job.output_manifest_path)
+
+
+def _ocr_stage(state: _PageState, write: Writer) -> None:
+    """Run OCR and persist page_XXX.ocr.json."""
+    from .ocr import run_ocr, write_ocr_result
+
+    with _stage_slot("ocr"):
+        state.ocr_result = run_ocr(
+            state.job,
+            image=state.page_image().array,
+            tile_height=state.ocr_tile_height,
+            tile_overlap=state.ocr_tile_overlap,
+        )
+    if "inpaint" not in state.stages:
+        state.source_image = None
+
+    write(write_ocr_result, state.ocr_result, state.ocr_path)
+
+
+def _translate_stage(state: _PageState, write: Writer) -> None:
+    """Translate OCR lines and persist page_XXX.translated.json."""
+    from .translate import run_translation, write_translation_result
+    from utils.translation_memory import open_translation_memory
+
+    if state.ocr_result is None:
+        state.ocr_result = _load_json(state.ocr_path, "OCR file not found for translation")
+
+    memory = None
+    if state.translation_memory_path is not None:
+        memory = open_translation_memory(state.translation_memory_path)
+
+    with _stage_slot("translate"):
+        state.translation_result = run_translation(
+            state.ocr_result, str(state.ocr_path), batch=state.batch_translate, memory=memory
+        )
+
+    write(write_translation_result, state.translation_result, state.translation_path)
+
+
+def _grouping_stage(state: _PageState, write: Writer) -> None:
+    """Group OCR lines into regions and persist page_XXX.groups.json."""
+    from .group import group_lines, write_grouping_result
+
+    if state.ocr_result is None:
+        state.ocr_result = _load_json(state.ocr_path, "OCR file not found for grouping")
+
+    with _stage_slot("grouping"):
+        state.grouping_result = group_lines(state.ocr_result)
+
+    write(write_grouping_result, state.grouping_result, state.grouping_path)
+
+
+def _inpaint_stage(state: _PageState, write: Writer) -> None:
+    """Inpaint grouped text regions into {stem}.cleaned.png, keeping the result for render."""
+    from .inpaint import encode_png, inpaint_image
+    from .page_image import PageImage
+
+    if state.grouping_result is None:
+        state.grouping_result = _load_json(state.grouping_path, "Grouping file not found for inpainting")
+
+    # Inpaint the source page (decoded once, e.g. already by OCR); nothing writes to it
+    with _stage_slot("inpaint"):
+        cleaned = inpaint_image(state.page_image().array, state.grouping_result, mode=state.inpaint_mode)
+        data = encode_png(cleaned)
+    state.source_image = None
+
+    state.cleaned_path.write_bytes(data)
+    # Hashed from memory so render's fingerprint does not read the file back
+    state.digests["cleaned_image"] = written_digest(state.cleaned_path, data)
+    state.cleaned_image = PageImage.from_array(cleaned, state.cleaned_path)
+    state.cleaned_image_path = state.cleaned_path
+
+
+def _render_stage(state: _PageState, write: Writer) -> None:
+    """Render translated text onto the cleaned image."""
+    from .render import render_page
+
+    # Determine cleaned image path
+    if state.cleaned_image_path is None:
+        # Check if cleaned image exists from previous run
+        if not state.cleaned_path.exists():
+            raise StageError(f"Cleaned image not found for rendering: {state.cleaned_path}")
+        state.cleaned_image_path = state.cleaned_path
+
+    if state.grouping_result is None:
+        state.grouping_result = _load_json(state.grouping_path, "Grouping file not found for rendering")
+
+    if state.translation_result is None:
+        state.translation_result = _load_json(state.translation_path, "Translation file not found for rendering")
+
+    image = None
+    if state.cleaned_image is not None:
+        image = state.cleaned_image.to_pil()
+        state.cleaned_image = None
+
+    with _stage_slot("render"):
+        render_page(state.cleaned_image_path, state.grouping_result, state.translation_result, image=image)
+
+
+_STAGE_FUNCS = {
+    "ocr": _ocr_stage,
+    "translate": _translate_stage,
+    "grouping": _grouping_stage,
+    "inpaint": _inpaint_stage,
+    "render": _render_stage,
+}
+
+
+def _ocr_inputs(state: _PageState) -> dict:
+    """Inputs that determine the OCR result."""
+    inputs = {
+        "image": state.digest("input_image", state.job.input_image_path),
+        "engine": "paddleocr",
+        "engine_version": package_version("paddleocr"),
+        "language": "korean",
+    }
+    if state.ocr_tile_height is not None:
+        inputs["tiling"] = [state.ocr_tile_height, state.ocr_tile_overlap]
+    return inputs
+
+
+def _translate_inputs(state: _PageState) -> dict:
+    """Inputs that determine the translation result."""
+    from .translate import MEMORY_KEY
+
+    if state.ocr_result is None:
+        state.ocr_result = _load_json(state.ocr_path, "OCR file not found for translation")
+    # The translation memory only caches engine output, so it is not an input
+    return {"ocr": hash_json(state.ocr_result), "engine": list(MEMORY_KEY), "batch": state.batch_translate}
+
+
+def _grouping_inputs(state: _PageState) -> dict:
+    """Inputs that determine the grouping result."""
+    if state.ocr_result is None:
+        state.ocr_result = _load_json(state.ocr_path, "OCR file not found for grouping")
+    return {"ocr": hash_json(state.ocr_result)}
+
+
+def _inpaint_inputs(state: _PageState) -> dict:
+    """Inputs that determine the cleaned image.
+
+    The inpaint mode is not an input: both modes produce the same image.
+    """
+    import cv2
+
+    from .inpaint import INPAINT_RADIUS
+
+    if state.grouping_result is None:
+        state.grouping_result = _load_json(state.grouping_path, "Grouping file not found for inpainting")
+    return {
+        "image": state.digest("input_image", state.job.input_image_path),
+        "groups": hash_json(state.grouping_result),
+        "radius": INPAINT_RADIUS,
+        "engine_version": cv2.__version__,
+    }
+
+
+def _render_inputs(state: _PageState) -> dict:
+    """Inputs that determine the rendered image, including the font."""
+    import PIL
+
+    from .render import OUTLINE_WIDTH, font_path
+
+    cleaned_image_path = state.cleaned_image_path or state.cleaned_path
+    if not cleaned_image_path.exists():
+        raise StageError(f"Cleaned image not found for rendering: {cleaned_image_path}")
+    if state.grouping_result is None:
+        state.grouping_result = _load_json(state.grouping_path, "Grouping file not found for rendering")
+    if state.translation_result is None:
+        state.translation_result = _load_json(state.translation_path, "Translation file not found for rendering")
+    return {
+        "cleaned_image": state.digest("cleaned_image", cleaned_image_path),
+        "groups": hash_json(state.grouping_result),
+        "translation": hash_json(state.translation_result),
+        "font": font_path(),
+        "outline_width": OUTLINE_WIDTH,
+        "engine_version": PIL.__version__,
+    }
+
+
+# Per stage: (inputs that determine its output, the output file)
+_STAGE_INPUTS = {
+    "ocr": (_ocr_inputs, lambda state: state.ocr_path),
+    "translate": (_translate_inputs, lambda state: state.translation_path),
+    "grouping": (_grouping_inputs, lambda state: state.grouping_path),
+    "inpaint": (_inpaint_inputs, lambda state: state.cleaned_path),
+    "render": (_render_inputs, lambda state: state.rendered_path),
+}
+
+
+def _enabled_stages(with_ocr: bool, with_translate: bool, with_grouping: bool, with_inpaint: bool, with_render: bool) -> List[str]:
+    """Return the requested stages in execution order."""
+    flags = {
+        "ocr": with_ocr,
+        "translate": with_translate,
+        "grouping": with_grouping,
+        "inpaint": with_inpaint,
+        "render": with_render,
+    }
+    return [stage for stage in STAGES if flags[stage]]
+
+
+def warm_up_ocr(engines: int = 1) -> None:
+    """Size the OCR engine pool for ``engines`` concurrent pages and load the engines.
+
+    A failure to load is logged once with its traceback rather than raised;
+    each page's OCR stage then fails with the same error.
+    """
+    from .ocr import warm_up
+
+    try:
+        warm_up(count=engines)
+    except Exception:
+        logger.warning("Failed to load the OCR engine; pages will fail their OCR stage", exc_info=True)
+
+
+def _fail(job: PageJob, error: Exception) -> None:
+    """Mark a job as failed with the given error."""
+    job.status = "FAILED"
+    job.error = str(error)
+
+
+def _run_stage(state: _PageState, stage: str, stage_func, write: Writer) -> None:
+    """Run one stage for a page, recording its metrics.
+
+    Stages in _STAGE_INPUTS are skipped if their fingerprint matches the one
+    recorded by the run that produced their output file, i.e. none of their
+    inputs changed since. Skipped stages record no metrics.
+    """
+    fingerprint = None
+    with measure_stage(stage) as metrics:
+        try:
+            if stage in _STAGE_INPUTS:
+                inputs, output_path = _STAGE_INPUTS[stage]
+                fingerprint = stage_fingerprint(stage, inputs(state))
+                if (
+                    not state.force
+                    and state.fingerprints.get(stage) == fingerprint
+                    and output_path(state).exists()
+                ):
+                    state.skipped.append(stage)
+                    return
+            stage_func(state, write)
+        finally:
+            if stage not in state.skipped:
+                state.metrics[stage] = metrics
+
+    if fingerprint is not None:
+        state.fingerprints[stage] = fingerprint
+
+
+def _record_metrics(state: _PageState) -> None:
+    """Add stage metrics to the output manifest and append them to the metrics log.
+
+    Called once the page has finished and its other outputs are on disk.
+    """
+    job = state.job
+    stages = {stage: metrics.to_dict() for stage, metrics in state.metrics.items()}
+
+    if state.output_manifest is not None:
+        # Stages run separately (e.g. by queue workers) add to the page's metrics
+        state.output_manifest["metrics"] = {**state.output_manifest.get("metrics", {}), **stages}
+        state.output_manifest["fingerprints"] = state.fingerprints
+        state.output_manifest["digests"] = state.digests
+        _write_json(state.output_manifest, job.output_manifest_path)
+
+    if state.metrics_log_path is not None:
+        append_metrics_record(
+            state.metrics_log_path,
+            {
+                "source_id": job.source_id,
+                "series_id": job.series_id,
+                "chapter_id": job.chapter_id,
+                "page_index": job.page_index,
+                "status": job.status,
+                "recorded_at": datetime.utcnow().isoformat(),
+                "stages": stages,
+                "skipped": state.skipped,
+            },
+        )
+
+
+def _finish(state: _PageState) -> None:
+    """Record metrics for a finished page; a failure to do so fails the page."""
+    try:
+        _record_metrics(state)
+    except OSError as e:
+        _fail(state.job, e)
+
+
+def run_page(job: PageJob, with_ocr: bool = False, with_translate: bool = False, with_grouping: bool = False, with_inpaint: bool = False, with_render: bool = False, batch_translate: bool = False, translation_memory_path: Optional[Path] = None, inpaint_mode: str = "full", metrics_log_path: Optional[Path] = None, force: bool = False, output_image: str = "copy", ocr_tile_height: Optional[int] = None, ocr_tile_overlap: Optional[int] = None) -> PageJob:
     """Execute a single page processing job.
 
     Args:
@@ -22,158 +545,249 @@ def run_page(job: PageJob, with_ocr: bool = False, with_translate: bool = False,
                       Requires grouping file to exist (either from with_grouping or previous run)
         with_render: If True, render translated text onto cleaned image and write page.rendered.png
                      Requires grouping, translation, and cleaned image to exist
+        batch_translate: If True, send OCR lines to Papago in joined batches
+        translation_memory_path: Optional SQLite translation memory consulted before Papago
+        inpaint_mode: "full" page inpainting or "regions" (cropped per text region)
+        metrics_log_path: Optional JSONL log receiving per-stage metrics for the page.
+                          Metrics are always added to the output manifest.
+        force: If True, run every stage even if its inputs are unchanged.
+               Otherwise a stage is skipped when the fingerprint of its inputs
+               (content hashes, engine and parameters) matches the one recorded
+               in the output manifest and its output file exists.
+        output_image: How the output page image is provided: "copy" (default),
+                      "link" (hard link to the source page, copying if that
+                      fails) or "none". Stages read the source page either way.
+        ocr_tile_height: If set, OCR pages taller than this as overlapping
+                         horizontal tiles of this many rows (see run_ocr)
+        ocr_tile_overlap: Rows shared by consecutive OCR tiles (default DEFAULT_TILE_OVERLAP)
     """
+    stages = _enabled_stages(with_ocr, with_translate, with_grouping, with_inpaint, with_render)
+    state = _PageState(
+        job,
+        batch_translate=batch_translate,
+        translation_memory_path=translation_memory_path,
+        inpaint_mode=inpaint_mode,
+        metrics_log_path=metrics_log_path,
+        force=force,
+        output_image=output_image,
+        ocr_tile_height=ocr_tile_height,
+        ocr_tile_overlap=ocr_tile_overlap,
+        stages=stages,
+    )
+
     try:
-        # Validate input files exist
-        if not job.input_image_path.exists():
-            job.status = "FAILED"
-            job.error = f"Input image not found: {job.input_image_path}"
-            return job
-
-        if not job.input_manifest_path.exists():
-            job.status = "FAILED"
-            job.error = f"Input manifest not found: {job.input_manifest_path}"
-            return job
-
-        # Create output directory
-        job.output_image_path.parent.mkdir(parents=True, exist_ok=True)
-        job.output_manifest_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Copy input image to output
-        shutil.copy2(job.input_image_path, job.output_image_path)
-
-        # Read input manifest
-        with open(job.input_manifest_path, "r") as f:
-            input_manifest = json.load(f)
-
-        # Write output manifest
-        output_manifest = {
-            "input_manifest": str(job.input_manifest_path),
-            "input_image": str(job.input_image_path),
-            "output_image": str(job.output_image_path),
-            "status": "DONE",
-            "processed_at": datetime.utcnow().isoformat(),
-            "source_id": job.source_id,
-            "series_id": job.series_id,
-            "chapter_id": job.chapter_id,
-            "page_index": job.page_index,
-        }
-
-        with open(job.output_manifest_path, "w") as f:
-            json.dump(output_manifest, f, indent=2)
-
-        # Run OCR if requested
-        ocr_output_path = job.output_manifest_path.parent / f"page_{job.page_index:03d}.ocr.json"
-        if with_ocr:
-            from .ocr import run_ocr, write_ocr_result
-
-            ocr_result = run_ocr(job)
-
-            # Write OCR result to separate file
-            write_ocr_result(ocr_result, ocr_output_path)
-
-        # Run translation if requested
-        if with_translate:
-            from .translate import run_translation, write_translation_result
-
-            # Check if OCR file exists
-            if not ocr_output_path.exists():
-                job.status = "FAILED"
-                job.error = f"OCR file not found for translation: {ocr_output_path}"
-                return job
-
-            # Read OCR result
-            with open(ocr_output_path, "r", encoding="utf-8") as f:
-                ocr_result = json.load(f)
-
-            # Run translation
-            translation_result = run_translation(ocr_result, str(ocr_output_path))
-
-            # Write translation result
-            translation_output_path = job.output_manifest_path.parent / f"page_{job.page_index:03d}.translated.json"
-            write_translation_result(translation_result, translation_output_path)
-
-        # Run grouping if requested
-        grouping_output_path = job.output_manifest_path.parent / f"page_{job.page_index:03d}.groups.json"
-        if with_grouping:
-            from .group import group_lines, write_grouping_result
-
-            # Check if OCR file exists
-            if not ocr_output_path.exists():
-                job.status = "FAILED"
-                job.error = f"OCR file not found for grouping: {ocr_output_path}"
-                return job
-
-            # Read OCR result
-            with open(ocr_output_path, "r", encoding="utf-8") as f:
-                ocr_result = json.load(f)
-
-            # Run grouping
-            grouping_result = group_lines(ocr_result)
-
-            # Write grouping result
-            write_grouping_result(grouping_result, grouping_output_path)
-
-        # Run inpainting if requested
-        cleaned_image_path = None
-        if with_inpaint:
-            from .inpaint import run_inpaint
-
-            # Check if grouping file exists
-            if not grouping_output_path.exists():
-                job.status = "FAILED"
-                job.error = f"Grouping file not found for inpainting: {grouping_output_path}"
-                return job
-
-            # Read grouping result
-            with open(grouping_output_path, "r", encoding="utf-8") as f:
-                grouping_result = json.load(f)
-
-            # Run inpainting on the output image (which is a copy of input)
-            cleaned_image_path = run_inpaint(job.output_image_path, grouping_result)
-
-        # Run rendering if requested
-        if with_render:
-            from .render import render_page
-
-            # Determine cleaned image path
-            if cleaned_image_path is None:
-                # Check if cleaned image exists from previous run
-                cleaned_image_path = job.output_image_path.parent / f"{job.output_image_path.stem}.cleaned.png"
-                if not cleaned_image_path.exists():
-                    job.status = "FAILED"
-                    job.error = f"Cleaned image not found for rendering: {cleaned_image_path}"
-                    return job
-
-            # Check if grouping file exists
-            if not grouping_output_path.exists():
-                job.status = "FAILED"
-                job.error = f"Grouping file not found for rendering: {grouping_output_path}"
-                return job
-
-            # Check if translation file exists
-            translation_output_path = job.output_manifest_path.parent / f"page_{job.page_index:03d}.translated.json"
-            if not translation_output_path.exists():
-                job.status = "FAILED"
-                job.error = f"Translation file not found for rendering: {translation_output_path}"
-                return job
-
-            # Read grouping and translation results
-            with open(grouping_output_path, "r", encoding="utf-8") as f:
-                grouping_result = json.load(f)
-
-            with open(translation_output_path, "r", encoding="utf-8") as f:
-                translation_result = json.load(f)
-
-            # Run rendering
-            rendered_image_path = render_page(cleaned_image_path, grouping_result, translation_result)
+        _run_stage(state, "prepare", _prepare, _write_now)
+        for stage in stages:
+            _run_stage(state, stage, _STAGE_FUNCS[stage], _write_now)
 
         # Update job status
         job.status = "DONE"
         job.error = None
 
     except Exception as e:
-        job.status = "FAILED"
-        job.error = str(e)
+        _fail(job, e)
 
+    _finish(state)
     return job
+
+
+def run_page_stage(
+    job: PageJob,
+    stage: str,
+    batch_translate: bool = False,
+    translation_memory_path: Optional[Path] = None,
+    inpaint_mode: str = "full",
+    metrics_log_path: Optional[Path] = None,
+    force: bool = False,
+    output_image: str = "copy",
+    ocr_tile_height: Optional[int] = None,
+    ocr_tile_overlap: Optional[int] = None,
+) -> PageJob:
+    """Execute one stage of a page on top of the outputs of its earlier stages.
+
+    Used by the job queue, where each page x stage is a separate job. The
+    "prepare" stage must run first; later stages read earlier results from
+    disk, as when run_page is re-run with fewer stages. The stage's metrics
+    are merged into the output manifest and appended to the metrics log.
+
+    Args:
+        job: PageJob to execute
+        stage: "prepare" or one of STAGES
+        batch_translate, translation_memory_path, inpaint_mode, metrics_log_path, force, output_image,
+            ocr_tile_height, ocr_tile_overlap: As for run_page
+    """
+    stage_funcs = {"prepare": _prepare, **_STAGE_FUNCS}
+    if stage not in stage_funcs:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    state = _PageState(
+        job,
+        batch_translate=batch_translate,
+        translation_memory_path=translation_memory_path,
+        inpaint_mode=inpaint_mode,
+        metrics_log_path=metrics_log_path,
+        force=force,
+        output_image=output_image,
+        ocr_tile_height=ocr_tile_height,
+        ocr_tile_overlap=ocr_tile_overlap,
+        stages=[stage],
+    )
+
+    try:
+        if stage != "prepare":
+            state.output_manifest = _load_json(job.output_manifest_path, "Output manifest not found; run prepare first")
+            state.restore_fingerprints(state.output_manifest)
+        _run_stage(state, stage, stage_funcs[stage], _write_now)
+        job.status = "DONE"
+        job.error = None
+    except Exception as e:
+        _fail(job, e)
+
+    _finish(state)
+    return job
+
+
+_END = object()
+
+
+def run_pages_pipelined(
+    jobs: List[PageJob],
+    stage_workers: Optional[Dict[str, int]] = None,
+    queue_size: int = 2,
+    with_ocr: bool = False,
+    with_translate: bool = False,
+    with_grouping: bool = False,
+    with_inpaint: bool = False,
+    with_render: bool = False,
+    batch_translate: bool = False,
+    translation_memory_path: Optional[Path] = None,
+    inpaint_mode: str = "full",
+    metrics_log_path: Optional[Path] = None,
+    force: bool = False,
+    output_image: str = "copy",
+    ocr_tile_height: Optional[int] = None,
+    ocr_tile_overlap: Optional[int] = None,
+    on_complete: Optional[Callable[[PageJob], None]] = None,
+) -> List[PageJob]:
+    """Execute many page jobs as a streaming stage pipeline.
+
+    Each stage runs in its own worker threads fed by a bounded queue, so
+    different pages occupy different stages at the same time (e.g. page N is
+    translating while page N-1 is inpainting). Intermediate results are handed
+    to the next stage in memory; JSON outputs are written by a background
+    writer and flushed before a page is reported DONE. Output files are the
+    same as calling run_page for each job.
+
+    Args:
+        jobs: Jobs to execute
+        stage_workers: Worker threads per stage (default 1, translate 2)
+        queue_size: Max pages waiting in front of each stage
+        with_*: Stage flags, as for run_page
+        batch_translate, translation_memory_path, inpaint_mode, metrics_log_path, force, output_image,
+            ocr_tile_height, ocr_tile_overlap: As for run_page
+        on_complete: Optional callback invoked with each finished job
+
+    Returns:
+        The jobs in completion order, with status and error set
+    """
+    workers = dict(DEFAULT_STAGE_WORKERS)
+    workers.update(stage_workers or {})
+
+    enabled = _enabled_stages(with_ocr, with_translate, with_grouping, with_inpaint, with_render)
+    if "ocr" in enabled:
+        # One engine per OCR thread, loaded before the first page arrives
+        warm_up_ocr(max(1, workers.get("ocr", 1)))
+    stages = [("prepare", _prepare)] + [(stage, _STAGE_FUNCS[stage]) for stage in enabled]
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages] + [queue.Queue()]
+    writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-writer")
+
+    def stage_worker(index: int, stage: str, stage_func, remaining: List[int], lock: threading.Lock) -> None:
+        inbox, outbox = queues[index], queues[index + 1]
+        while True:
+            state = inbox.get()
+            if state is _END:
+                # Let sibling workers see the end marker; the last one forwards it
+                inbox.put(_END)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_END)
+                return
+
+            if state.job.status != "FAILED":
+
+                def write(write_fn, result, path, state=state):
+                    state.pending_writes.append(writer_pool.submit(write_fn, result, path))
+
+                try:
+                    _run_stage(state, stage, stage_func, write)
+                except Exception as e:
+                    _fail(state.job, e)
+
+            outbox.put(state)
+
+    threads = []
+    for index, (stage, stage_func) in enumerate(stages):
+        count = max(1, workers.get(stage, 1))
+        remaining, lock = [count], threading.Lock()
+        for _ in range(count):
+            thread = threading.Thread(
+                target=stage_worker, args=(index, stage, stage_func, remaining, lock), name=f"stage-{stage}", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+    def feed() -> None:
+        for job in jobs:
+            queues[0].put(
+                _PageState(
+                    job,
+                    batch_translate=batch_translate,
+                    translation_memory_path=translation_memory_path,
+                    inpaint_mode=inpaint_mode,
+                    metrics_log_path=metrics_log_path,
+                    force=force,
+                    output_image=output_image,
+                    ocr_tile_height=ocr_tile_height,
+                    ocr_tile_overlap=ocr_tile_overlap,
+                    stages=enabled,
+                )
+            )
+        queues[0].put(_END)
+
+    feeder = threading.Thread(target=feed, name="stage-feeder", daemon=True)
+    feeder.start()
+
+    finished = []
+    try:
+        while True:
+            state = queues[-1].get()
+            if state is _END:
+                break
+
+            # A page is only done once its outputs are on disk
+            for pending in state.pending_writes:
+                try:
+                    pending.result()
+                except Exception as e:
+                    if state.job.status != "FAILED":
+                        _fail(state.job, e)
+                    # Outputs of this run may be missing or stale
+                    for stage in state.metrics:
+                        state.fingerprints.pop(stage, None)
+
+            if state.job.status != "FAILED":
+                state.job.status = "DONE"
+                state.job.error = None
+            _finish(state)
+            finished.append(state.job)
+            if on_complete:
+                on_complete(state.job)
+    finally:
+        feeder.join()
+        for thread in threads:
+            thread.join()
+        writer_pool.shutdown(wait=True)
+
+    return finished
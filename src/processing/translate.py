@@ -4,13 +4,35 @@ import base64
 import hmac
 import json
 import re
+import threading
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, List
 
 import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from utils.translation_memory import TranslationMemory
+
+
+# How long a scraped Papago version is reused before fetching it again
+PAPAGO_VERSION_TTL_SECONDS = 3600
+
+# Lines are joined with the same breaker as BaseTranslator.textlist2text
+BATCH_DELIMITER = "\n##\n"
+
+# Keep each batched request comfortably below Papago's per-request text limit
+BATCH_MAX_CHARS = 3000
+
+# (engine, source_language, target_language) used for translation memory entries
+MEMORY_KEY = ("papago", "ko", "en")
+
+_version_cache: dict = {"version": None, "fetched_at": 0.0}
+_version_lock = threading.Lock()
+_session_local = threading.local()
 
 
 class PapagoTranslationError(Exception):
@@ -19,7 +41,55 @@ class PapagoTranslationError(Exception):
     pass
 
 
-def _get_papago_version() -> str:
+class PapagoAuthError(PapagoTranslationError):
+    """Raised when Papago rejects a request's authentication (e.g. a stale version)."""
+
+    pass
+
+
+# HTTP statuses Papago answers when the signing version is out of date
+_AUTH_FAILURE_STATUSES = (401, 403)
+
+
+def _get_session() -> requests.Session:
+    """Return this thread's pooled HTTP session for Papago requests."""
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        session.mount("https://", adapter)
+        _session_local.session = session
+    return session
+
+
+def _get_papago_version(force_refresh: bool = False) -> str:
+    """Return the Papago API version, reusing a cached value within the TTL.
+
+    Args:
+        force_refresh: If True, ignore the cached version.
+
+    Raises:
+        PapagoTranslationError: If version cannot be fetched.
+    """
+    with _version_lock:
+        age = time.monotonic() - _version_cache["fetched_at"]
+        if not force_refresh and _version_cache["version"] and age < PAPAGO_VERSION_TTL_SECONDS:
+            return _version_cache["version"]
+
+        version = _fetch_papago_version()
+        _version_cache["version"] = version
+        _version_cache["fetched_at"] = time.monotonic()
+        return version
+
+
+def clear_papago_version_cache() -> None:
+    """Forget the cached Papago version (e.g. after an auth failure)."""
+    with _version_lock:
+        _version_cache["version"] = None
+        _version_cache["fetched_at"] = 0.0
+
+
+def _fetch_papago_version() -> str:
     """Fetch the current Papago API version from their website.
 
     Returns:
@@ -29,13 +99,14 @@ def _get_papago_version() -> str:
         PapagoTranslationError: If version cannot be fetched.
     """
     try:
-        script = requests.get("https://papago.naver.com", timeout=10)
+        session = _get_session()
+        script = session.get("https://papago.naver.com", timeout=10)
         main_js_match = re.search(r"\/(main.*\.js)", script.text)
         if not main_js_match:
             raise PapagoTranslationError("Could not find Papago main.js")
 
         main_js = main_js_match.group(1)
-        papago_ver_data = requests.get(f"https://papago.naver.com/{main_js}", timeout=10)
+        papago_ver_data = session.get(f"https://papago.naver.com/{main_js}", timeout=10)
         ver_match = re.search(r'"PPG .*,"(v[^"]*)', papago_ver_data.text)
         if not ver_match:
             raise PapagoTranslationError("Could not extract Papago version")
@@ -56,6 +127,7 @@ def _translate_text_papago(text: str, papago_version: str) -> str:
         Translated English text.
 
     Raises:
+        PapagoAuthError: If Papago rejects the request's authentication.
         PapagoTranslationError: If translation fails.
     """
     if not text.strip():
@@ -84,7 +156,9 @@ def _translate_text_papago(text: str, papago_version: str) -> str:
     }
 
     try:
-        resp = requests.post(papago_url, data=data, headers=headers, timeout=30)
+        resp = _get_session().post(papago_url, data=data, headers=headers, timeout=30)
+        if resp.status_code in _AUTH_FAILURE_STATUSES:
+            raise PapagoAuthError(f"Papago rejected the request ({resp.status_code}); version {papago_version} may be stale")
         resp.raise_for_status()
         result = resp.json()
         return result.get("translatedText", "")
@@ -94,12 +168,79 @@ def _translate_text_papago(text: str, papago_version: str) -> str:
         raise PapagoTranslationError(f"Invalid Papago response: {e}") from e
 
 
-def run_translation(ocr_result: dict, source_ocr_path: str | None = None) -> dict:
+def _split_batches(texts: List[str]) -> List[List[int]]:
+    """Group indices of non-empty texts into batches below BATCH_MAX_CHARS."""
+    batches = []
+    current: List[int] = []
+    current_chars = 0
+
+    for idx, text in enumerate(texts):
+        if not text.strip():
+            continue
+
+        size = len(text) + len(BATCH_DELIMITER)
+        if current and current_chars + size > BATCH_MAX_CHARS:
+            batches.append(current)
+            current, current_chars = [], 0
+
+        current.append(idx)
+        current_chars += size
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def _translate_batch_papago(texts: List[str], papago_version: str) -> List[str]:
+    """Translate many strings with as few Papago requests as possible.
+
+    Non-empty texts are joined with BATCH_DELIMITER and sent together; the
+    response is split back on the delimiter. If the number of pieces does not
+    match (Papago merged or dropped a breaker), that batch falls back to one
+    request per line.
+
+    Returns:
+        Translations in the same order as texts ("" for blank input).
+
+    Raises:
+        PapagoTranslationError: If translation fails.
+    """
+    translations = [""] * len(texts)
+    breaker = BATCH_DELIMITER.replace("\n", "")
+
+    for batch in _split_batches(texts):
+        if len(batch) == 1:
+            translations[batch[0]] = _translate_text_papago(texts[batch[0]], papago_version)
+            continue
+
+        joined = BATCH_DELIMITER.join(texts[idx] for idx in batch)
+        pieces = [piece.strip() for piece in _translate_text_papago(joined, papago_version).split(breaker)]
+
+        if len(pieces) == len(batch):
+            for idx, piece in zip(batch, pieces):
+                translations[idx] = piece
+        else:
+            for idx in batch:
+                translations[idx] = _translate_text_papago(texts[idx], papago_version)
+
+    return translations
+
+
+def run_translation(
+    ocr_result: dict,
+    source_ocr_path: str | None = None,
+    batch: bool = False,
+    memory: "TranslationMemory | None" = None,
+) -> dict:
     """Translate OCR result from Korean to English using Papago.
 
     Args:
         ocr_result: OCR result dict with 'lines' array, each containing 'text'.
         source_ocr_path: Optional path to source OCR file for reference.
+        batch: If True, send lines in joined batches instead of one request per line.
+        memory: Optional translation memory consulted before calling Papago;
+                new translations are written back to it.
 
     Returns:
         Translation result dict with same line order as input.
@@ -107,22 +248,41 @@ def run_translation(ocr_result: dict, source_ocr_path: str | None = None) -> dic
     Raises:
         PapagoTranslationError: If translation fails.
     """
-    # Get Papago version for authentication
-    papago_version = _get_papago_version()
-
     # Extract lines from OCR result
     ocr_lines = ocr_result.get("lines", [])
 
-    # Translate each line independently, preserving order
-    translated_lines = []
-    for line in ocr_lines:
-        source_text = line.get("text", "")
+    source_texts = [line.get("text", "") for line in ocr_lines]
+
+    # Lines already in the translation memory need no request
+    cached = memory.get_many(*MEMORY_KEY, source_texts) if memory is not None else {}
+    pending = ["" if text in cached else text for text in source_texts]
+
+    def translate_pending(papago_version: str) -> List[str]:
+        if batch:
+            return _translate_batch_papago(pending, papago_version)
+        # Translate each line independently, preserving order
+        return [_translate_text_papago(text, papago_version) for text in pending]
+
+    if memory is None or any(text.strip() for text in pending):
+        # Get Papago version for authentication
         try:
-            translated_text = _translate_text_papago(source_text, papago_version)
-        except PapagoTranslationError:
-            # Re-raise to fail the entire translation
-            raise
+            translated_texts = translate_pending(_get_papago_version())
+        except PapagoAuthError:
+            # The cached version went stale: scrape it again and retry once
+            clear_papago_version_cache()
+            translated_texts = translate_pending(_get_papago_version())
+    else:
+        translated_texts = [""] * len(pending)
+
+    if memory is not None:
+        memory.put_many(
+            *MEMORY_KEY,
+            {text: translated for text, translated in zip(pending, translated_texts) if text.strip()},
+        )
+        translated_texts = [cached.get(text, translated) for text, translated in zip(source_texts, translated_texts)]
 
+    translated_lines = []
+    for source_text, translated_text in zip(source_texts, translated_texts):
         translated_lines.append(
             {
                 "source_text": source_text,
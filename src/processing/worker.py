@@ -0,0 +1,194 @@
+"""Workers that drain the durable job queue."""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .batch import build_page_job
+from .job import PageJob
+from .job_queue import DEAD, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, JobQueue, QueuedJob
+from .runner import STAGES, run_page_stage
+
+
+# Longest a worker sleeps between checks while other workers hold the remaining jobs
+DEFAULT_POLL_SECONDS = 5.0
+
+# run_page_stage options that are paths (stored as strings in the queue)
+_PATH_OPTIONS = ("translation_memory_path", "metrics_log_path")
+
+# on_job status for a job whose lease expired while it ran; its outcome is not recorded
+LOST = "lost"
+
+
+@dataclass
+class WorkerStats:
+    """Counts of job outcomes for one or more workers."""
+
+    done: int = 0
+    retried: int = 0
+    dead: int = 0
+    # Jobs whose lease expired before they finished; another worker reruns them
+    lost: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of jobs run."""
+        return self.done + self.retried + self.dead + self.lost
+
+    def __add__(self, other: "WorkerStats") -> "WorkerStats":
+        return WorkerStats(
+            self.done + other.done, self.retried + other.retried, self.dead + other.dead, self.lost + other.lost
+        )
+
+
+def queue_stages(**stage_flags) -> List[str]:
+    """Return the queue stages for run_page-style with_* flags: prepare, then the enabled stages."""
+    return ["prepare"] + [stage for stage in STAGES if stage_flags.get(f"with_{stage}")]
+
+
+def enqueue_pages(
+    queue_path: Path,
+    jobs: List[PageJob],
+    output_root: Path,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    **stage_flags,
+) -> int:
+    """Enqueue a job per page and enabled stage.
+
+    Args:
+        queue_path: Job queue database
+        jobs: Pages to process
+        output_root: Output directory root
+        max_attempts: Attempts per job before it is dead-lettered
+        **stage_flags: with_* flags and run_page_stage options, as for run_page
+
+    Returns:
+        Number of jobs added
+    """
+    options = {key: value for key, value in stage_flags.items() if not key.startswith("with_")}
+    for key in _PATH_OPTIONS:
+        if options.get(key) is not None:
+            options[key] = str(options[key])
+
+    queue = JobQueue(queue_path)
+    try:
+        return queue.enqueue(jobs, queue_stages(**stage_flags), output_root, options, max_attempts)
+    finally:
+        queue.close()
+
+
+def process_queued_job(queued: QueuedJob) -> PageJob:
+    """Run the stage of a leased job."""
+    job = build_page_job(queued.input_manifest_path, queued.page_index, queued.output_root)
+    options = dict(queued.options)
+    for key in _PATH_OPTIONS:
+        if options.get(key) is not None:
+            options[key] = Path(options[key])
+    return run_page_stage(job, queued.stage, **options)
+
+
+def _keep_lease(queue: JobQueue, job_id: int, owner: str, stop: threading.Event) -> None:
+    """Renew a lease every third of its duration until stopped."""
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.heartbeat(job_id, owner):
+            return
+
+
+def drain_queue(
+    queue_path: Path,
+    owner: Optional[str] = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    on_job: Optional[Callable[[QueuedJob, PageJob, Optional[str]], None]] = None,
+) -> WorkerStats:
+    """Lease and run jobs until nothing is left that could run.
+
+    While other workers hold leases whose completion may unblock further
+    stages, the worker waits for them rather than exiting.
+
+    Args:
+        queue_path: Job queue database
+        owner: Lease owner name (default host:pid:thread)
+        lease_seconds: Lease duration; renewed by a heartbeat while a job runs
+        poll_seconds: Longest wait between checks for newly available jobs
+        on_job: Optional callback(queued, job, queue_status) after each job;
+                queue_status is None on success, "pending" or "dead" after a
+                failure, or LOST if the lease expired before the job finished
+
+    Returns:
+        Outcome counts for this worker
+    """
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    queue = JobQueue(queue_path, lease_seconds=lease_seconds)
+    stats = WorkerStats()
+
+    try:
+        while True:
+            queued = queue.lease(owner)
+            if queued is None:
+                wait = queue.next_available_in()
+                if wait is None:
+                    break
+                time.sleep(min(poll_seconds, max(wait, 0.05)))
+                continue
+
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=_keep_lease, args=(queue, queued.id, owner, stop), daemon=True)
+            heartbeat.start()
+            try:
+                job = process_queued_job(queued)
+            except Exception as e:
+                # e.g. the manifest path no longer parses
+                job = PageJob(
+                    queued.source_id, queued.series_id, queued.chapter_id, queued.page_index,
+                    queued.input_manifest_path, queued.input_manifest_path,
+                    queued.output_root, queued.output_root, status="FAILED", error=str(e),
+                )
+            finally:
+                stop.set()
+                heartbeat.join()
+
+            if job.status == "DONE":
+                status = None if queue.complete(queued.id, owner) else LOST
+            else:
+                status = queue.fail(queued.id, owner, job.error or "Unknown error") or LOST
+
+            if status is None:
+                stats.done += 1
+            elif status == LOST:
+                stats.lost += 1
+            elif status == DEAD:
+                stats.dead += 1
+            else:
+                stats.retried += 1
+
+            if on_job:
+                on_job(queued, job, status)
+    finally:
+        queue.close()
+
+    return stats
+
+
+def run_workers(queue_path: Path, workers: int = 1, **drain_options) -> WorkerStats:
+    """Drain the queue with several worker processes.
+
+    Args:
+        queue_path: Job queue database
+        workers: Number of worker processes (1 runs in-process)
+        **drain_options: Passed to drain_queue (on_job must be picklable)
+    """
+    if workers <= 1:
+        return drain_queue(queue_path, **drain_options)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(drain_queue, queue_path, **drain_options) for _ in range(workers)]
+        total = WorkerStats()
+        for future in futures:
+            total = total + future.result()
+    return total
@@ -0,0 +1,13 @@
+"""Shared fixtures for acquisition tests."""
+
+import pytest
+
+from src.acquisition.rate_limit import reset_rate_limiters
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiters():
+    """Ensure each test starts with unused per-source rate limiters."""
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
@@ -0,0 +1,239 @@
+"""Tests for the asyncio acquisition engine."""
+
+import asyncio
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.acquisition.adapter import ChapterInfo
+from src.acquisition.async_downloader import (
+    AsyncHTTPAdapter,
+    ThreadedAdapter,
+    download_chapter_async,
+    download_chapters_async,
+)
+from src.acquisition.db import AcquisitionDB
+from src.acquisition.filesystem_adapter import FilesystemAdapter
+from src.acquisition.storage import get_metadata_path, get_pages_path
+
+
+def _png_bytes(index: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 60 + index), color=(index * 20, 0, 0)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _StandInServer:
+    """Local HTTP server serving /<chapter>/<index>.png with a small delay."""
+
+    def __init__(self, pages_per_chapter: int, delay: float = 0.02):
+        self.images = {i: _png_bytes(i) for i in range(pages_per_chapter)}
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.fail_paths = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay)
+                    stem = Path(self.path).stem
+                    index = int(stem) if self.path.endswith(".png") and stem.isdigit() else -1
+                    if self.path in server.fail_paths or index not in server.images:
+                        self.send_response(404)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    body = server.images[index]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _StandInAdapter(AsyncHTTPAdapter):
+    """Adapter for the stand-in server."""
+
+    def __init__(self, client, base_url, pages_per_chapter):
+        super().__init__("standin", client)
+        self.base_url = base_url
+        self.pages_per_chapter = pages_per_chapter
+        self.page_list_fetches = 0
+
+    async def list_chapters(self, series_id):
+        return [_chapter(f"ch{i:03d}", self.base_url) for i in range(3)]
+
+    async def fetch_page_urls(self, chapter_info):
+        self.page_list_fetches += 1
+        await asyncio.sleep(0)
+        return [f"{chapter_info.chapter_url}/{i}.png" for i in range(self.pages_per_chapter)]
+
+
+def _chapter(chapter_id, base_url, page_count=None):
+    return ChapterInfo(
+        source_id="standin",
+        series_id="series",
+        chapter_id=chapter_id,
+        chapter_title=chapter_id,
+        chapter_url=f"{base_url}/{chapter_id}",
+        page_count=page_count,
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = AcquisitionDB(tmp_path / "acquisition.db")
+    yield database
+    database.close()
+
+
+def test_download_chapters_async_over_http(tmp_path, db):
+    """Test chapters stream to disk with per-host limits and shared page lists."""
+    httpx = pytest.importorskip("httpx")  # noqa: F841
+    from src.acquisition.http_client import AsyncHTTPClient
+
+    async def run(server):
+        async with AsyncHTTPClient(max_connections=8, max_per_host=3) as client:
+            adapter = _StandInAdapter(client, server.base_url, pages_per_chapter=5)
+            chapters = await adapter.list_chapters("series")
+            results = await download_chapters_async(adapter, chapters, tmp_path, db, max_concurrent_pages=8)
+            return adapter, results
+
+    with _StandInServer(pages_per_chapter=5) as server:
+        adapter, results = asyncio.run(run(server))
+
+    assert [r.pages_downloaded for r in results] == [5, 5, 5]
+    assert all(r.success for r in results)
+    assert server.requests == 15
+    assert server.max_in_flight <= 3
+    assert adapter.page_list_fetches == 3
+
+    pages_dir = get_pages_path(tmp_path, "standin", "series", "ch001")
+    assert (pages_dir / "004.png").read_bytes() == _png_bytes(4)
+    assert not list(pages_dir.glob("*.part"))
+    with open(pages_dir / "page_002.json") as f:
+        manifest = json.load(f)
+    assert manifest["success"] is True
+    assert manifest["metadata"]["height"] == 62
+    with open(get_metadata_path(tmp_path, "standin", "series", "ch001")) as f:
+        assert json.load(f)["page_count"] == 5
+
+
+def test_download_chapter_async_records_http_failures(tmp_path, db):
+    """Test HTTP errors fail only the affected page."""
+    pytest.importorskip("httpx")
+    from src.acquisition.http_client import AsyncHTTPClient
+
+    async def run(server):
+        async with AsyncHTTPClient(max_connections=4, max_per_host=4) as client:
+            adapter = _StandInAdapter(client, server.base_url, pages_per_chapter=3)
+            chapter = _chapter("ch000", server.base_url)
+            return await download_chapter_async(adapter, chapter, tmp_path, db, max_retries=1)
+
+    with _StandInServer(pages_per_chapter=3) as server:
+        server.fail_paths.add("/ch000/1.png")
+        result = asyncio.run(run(server))
+
+    assert result.pages_downloaded == 2
+    assert result.pages_failed == 1
+    assert "Page 1" in result.errors[0]
+
+
+def test_http_client_requires_context_manager():
+    """Test the client refuses requests before it is opened."""
+    pytest.importorskip("httpx")
+    from src.acquisition.http_client import AsyncHTTPClient
+
+    with pytest.raises(RuntimeError, match="context manager"):
+        asyncio.run(AsyncHTTPClient().get_text("http://127.0.0.1:1/"))
+
+
+@pytest.fixture
+def filesystem_source(tmp_path):
+    source = tmp_path / "source"
+    for chapter in ["ch001", "ch002"]:
+        chapter_path = source / "test-series" / chapter
+        chapter_path.mkdir(parents=True)
+        for i in range(4):
+            Image.new("RGB", (30, 50), color=(i * 50, 0, 0)).save(chapter_path / f"page_{i:03d}.png")
+    return source
+
+
+def test_threaded_adapter_matches_sync_downloader(tmp_path, filesystem_source, db):
+    """Test a blocking adapter can drive the async engine, with resume."""
+    adapter = ThreadedAdapter(FilesystemAdapter("filesystem", filesystem_source))
+    output = tmp_path / "output"
+
+    chapters = asyncio.run(adapter.list_chapters("test-series"))
+    results = asyncio.run(download_chapters_async(adapter, chapters, output, db, max_concurrent_pages=3))
+
+    assert [r.pages_downloaded for r in results] == [4, 4]
+    for chapter in chapters:
+        pages_dir = get_pages_path(output, "filesystem", "test-series", chapter.chapter_id)
+        assert sorted(p.name for p in pages_dir.glob("*.png")) == ["000.png", "001.png", "002.png", "003.png"]
+
+    # Second run resumes and downloads nothing
+    results = asyncio.run(download_chapters_async(adapter, chapters, output, db))
+    assert [r.pages_downloaded for r in results] == [0, 0]
+
+
+def test_async_adapter_refetches_page_list_after_404(tmp_path, db, monkeypatch):
+    """Test an image 404 drops the cached page list before the retry."""
+    pytest.importorskip("httpx")
+    from src.acquisition import async_downloader
+    from src.acquisition.http_client import AsyncHTTPClient
+
+    monkeypatch.setattr(async_downloader, "_backoff_seconds", lambda attempt: 0)
+
+    class RotatingAdapter(_StandInAdapter):
+        async def fetch_page_urls(self, chapter_info):
+            urls = await super().fetch_page_urls(chapter_info)
+            # The first listing is stale and points at an image that no longer exists
+            return [f"{chapter_info.chapter_url}/stale.png"] if self.page_list_fetches == 1 else urls
+
+    async def run(server):
+        async with AsyncHTTPClient(max_connections=2, max_per_host=2) as client:
+            adapter = RotatingAdapter(client, server.base_url, pages_per_chapter=1)
+            chapter = _chapter("ch000", server.base_url, page_count=1)
+            result = await download_chapter_async(adapter, chapter, tmp_path, db, max_retries=2)
+            return adapter, result
+
+    with _StandInServer(pages_per_chapter=1) as server:
+        adapter, result = asyncio.run(run(server))
+
+    assert result.pages_downloaded == 1
+    assert adapter.page_list_fetches == 2
@@ -0,0 +1,113 @@
+"""Tests for the acquisition database."""
+
+import sqlite3
+import threading
+
+from src.acquisition.db import AcquisitionDB
+
+
+def _page_rows(db_path):
+    """Read page rows through a separate connection."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT page_index, status FROM pages ORDER BY page_index").fetchall()
+    finally:
+        conn.close()
+
+
+def test_wal_mode(tmp_path):
+    """Test the database is opened in WAL mode."""
+    db = AcquisitionDB(tmp_path / "acq.db")
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    db.close()
+
+
+def test_page_rows_are_batched(tmp_path):
+    """Test page rows are written once the batch fills, not per row."""
+    db_path = tmp_path / "acq.db"
+    db = AcquisitionDB(db_path, batch_size=3, flush_interval=60)
+
+    db.mark_page_downloaded("src", "series", "ch1", 0, "000.png")
+    db.mark_page_failed("src", "series", "ch1", 1, "boom")
+    assert _page_rows(db_path) == []
+
+    db.mark_page_downloaded("src", "series", "ch1", 2, "002.png")
+    assert _page_rows(db_path) == [(0, "downloaded"), (1, "failed"), (2, "downloaded")]
+    db.close()
+
+
+def test_old_rows_flush_on_next_write(tmp_path):
+    """Test a write flushes the batch once its oldest row exceeds flush_interval."""
+    db_path = tmp_path / "acq.db"
+    db = AcquisitionDB(db_path, batch_size=100, flush_interval=0)
+
+    db.mark_page_downloaded("src", "series", "ch1", 0, "000.png")
+    assert _page_rows(db_path) == [(0, "downloaded")]
+    db.close()
+
+
+def test_reads_and_close_flush(tmp_path):
+    """Test reads see buffered writes and close() persists them."""
+    db_path = tmp_path / "acq.db"
+    db = AcquisitionDB(db_path, batch_size=100, flush_interval=60)
+    db.register_chapter("src", "series", "ch1", "Chapter 1")
+
+    db.mark_page_downloaded("src", "series", "ch1", 0, "000.png")
+    db.mark_page_downloaded("src", "series", "ch1", 1, "001.png")
+    db.mark_page_failed("src", "series", "ch1", 2, "timeout")
+    assert db.count_pages_by_status("src", "series", "ch1") == {"downloaded": 2, "failed": 1}
+    assert db.get_failed_pages("src", "series", "ch1") == [{"page_index": 2, "error": "timeout"}]
+
+    db.mark_page_downloaded("src", "series", "ch1", 2, "002.png")
+    db.close()
+    assert _page_rows(db_path) == [(0, "downloaded"), (1, "downloaded"), (2, "downloaded")]
+
+
+def test_status_queries_use_index(tmp_path):
+    """Test per-chapter status queries are served by an index."""
+    db = AcquisitionDB(tmp_path / "acq.db")
+    plan = db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT status, COUNT(*) FROM pages "
+        "WHERE source_id = ? AND series_id = ? AND chapter_id = ? GROUP BY status",
+        ("src", "series", "ch1"),
+    ).fetchall()
+    assert any("idx_pages_chapter_status" in row[-1] for row in plan)
+    db.close()
+
+
+def test_concurrent_writers(tmp_path):
+    """Test worker threads can record pages on a shared instance."""
+    db_path = tmp_path / "acq.db"
+    db = AcquisitionDB(db_path, batch_size=7)
+
+    def record(worker):
+        for i in range(50):
+            db.mark_page_downloaded("src", "series", f"ch{worker}", i, f"{i:03d}.png")
+
+    threads = [threading.Thread(target=record, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    db.close()
+
+    assert len(_page_rows(db_path)) == 200
+
+
+def test_series_listing_round_trip(tmp_path):
+    """Test a stored chapter list and its validators are returned as stored."""
+    db = AcquisitionDB(tmp_path / "acq.db")
+    assert db.get_series_listing("src", "series") is None
+
+    chapters = [{"chapter_id": "ch1", "chapter_title": "제1화", "page_count": None}]
+    db.store_series_listing("src", "series", chapters, etag='"abc"')
+    listing = db.get_series_listing("src", "series")
+
+    assert listing["chapters"] == chapters
+    assert listing["etag"] == '"abc"'
+    assert listing["last_modified"] is None
+
+    db.register_chapter("src", "series", "ch1", "Chapter 1")
+    db.register_chapter("src", "other", "ch9", "Chapter 9")
+    assert db.get_chapter_ids("src", "series") == {"ch1"}
+    db.close()
@@ -0,0 +1,173 @@
+"""Tests for the cross-chapter download scheduler."""
+
+import json
+import threading
+from collections import Counter
+import time
+
+import pytest
+from PIL import Image
+
+from src.acquisition.db import AcquisitionDB
+from src.acquisition.downloader import download_chapters
+from src.acquisition.filesystem_adapter import FilesystemAdapter
+from src.acquisition.storage import get_metadata_path, get_pages_path
+
+
+@pytest.fixture
+def series_source(tmp_path):
+    """Create a source series with chapters of different lengths."""
+    source = tmp_path / "source"
+    for chapter, pages in [("ch001", 5), ("ch002", 1), ("ch003", 3)]:
+        chapter_path = source / "test-series" / chapter
+        chapter_path.mkdir(parents=True)
+        for i in range(pages):
+            Image.new("RGB", (30, 40), color=(i * 40, 0, 0)).save(chapter_path / f"page_{i:03d}.png")
+    return source
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = AcquisitionDB(tmp_path / "output" / "acquisition.db")
+    yield database
+    database.close()
+
+
+class _SlowAdapter(FilesystemAdapter):
+    """Filesystem adapter that records peak concurrency across chapters."""
+
+    def __init__(self, *args, delay=0.02, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chapters_in_flight = Counter()
+        self.overlapped_chapters = False
+        self.later_chapter_started = threading.Event()
+
+    def download_page(self, chapter_info, page_index, output_path):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.chapters_in_flight[chapter_info.chapter_id] += 1
+            if len(+self.chapters_in_flight) > 1:
+                self.overlapped_chapters = True
+        try:
+            if chapter_info.chapter_id != "ch001":
+                self.later_chapter_started.set()
+            elif page_index == chapter_info.page_count - 1:
+                # Hold the first chapter's last page until the scheduler moves on (or gives up)
+                self.later_chapter_started.wait(timeout=2)
+            time.sleep(self.delay)
+            return super().download_page(chapter_info, page_index, output_path)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.chapters_in_flight[chapter_info.chapter_id] -= 1
+
+
+def test_download_chapters_all_pages(series_source, tmp_path, db):
+    """Test every chapter is downloaded with metadata written per chapter."""
+    adapter = _SlowAdapter("filesystem", series_source)
+    chapters = adapter.list_chapters("test-series")
+    output = tmp_path / "output"
+    completed = []
+
+    results = download_chapters(
+        adapter, chapters, output, db, max_workers=3, on_chapter_complete=lambda c, r: completed.append(c.chapter_id)
+    )
+
+    assert [r.pages_downloaded for r in results] == [5, 1, 3]
+    assert all(r.success for r in results)
+    assert sorted(completed) == ["ch001", "ch002", "ch003"]
+    # Workers move on to later chapters while earlier ones finish
+    assert adapter.overlapped_chapters
+    assert adapter.max_in_flight <= 3
+    for chapter in chapters:
+        with open(get_metadata_path(output, "filesystem", "test-series", chapter.chapter_id)) as f:
+            metadata = json.load(f)
+        assert metadata["status"] == "complete"
+        assert len(metadata["pages"]) == chapter.page_count
+
+
+def test_download_chapters_oldest_first(series_source, tmp_path, db):
+    """Test a single worker finishes chapters strictly in order."""
+    adapter = FilesystemAdapter("filesystem", series_source)
+    chapters = adapter.list_chapters("test-series")
+    completed = []
+
+    download_chapters(
+        adapter, chapters, tmp_path / "output", db, max_workers=1,
+        on_chapter_complete=lambda c, r: completed.append(c.chapter_id),
+    )
+
+    assert completed == ["ch001", "ch002", "ch003"]
+
+
+def test_download_chapters_resume(series_source, tmp_path, db):
+    """Test completed chapters are skipped on a second run."""
+    adapter = FilesystemAdapter("filesystem", series_source)
+    chapters = adapter.list_chapters("test-series")
+    output = tmp_path / "output"
+    download_chapters(adapter, chapters, output, db, max_workers=2)
+
+    # Lose one page of the first chapter
+    pages_dir = get_pages_path(output, "filesystem", "test-series", "ch001")
+    (pages_dir / "002.png").unlink()
+
+    results = download_chapters(adapter, chapters, output, db, max_workers=2)
+
+    assert [r.pages_downloaded for r in results] == [1, 0, 0]
+
+
+def test_download_chapters_failed_listing_does_not_block(series_source, tmp_path, db):
+    """Test a chapter whose page list cannot be fetched fails on its own."""
+
+    class BrokenListing(FilesystemAdapter):
+        def list_pages(self, chapter_info):
+            if chapter_info.chapter_id == "ch002":
+                raise RuntimeError("listing unavailable")
+            return super().list_pages(chapter_info)
+
+    adapter = BrokenListing("filesystem", series_source)
+    chapters = adapter.list_chapters("test-series")
+    for chapter in chapters:
+        chapter.page_count = None
+
+    results = download_chapters(adapter, chapters, tmp_path / "output", db, max_workers=2)
+
+    assert [r.success for r in results] == [True, False, True]
+    assert results[1].errors == ["listing unavailable"]
+    assert [r.pages_downloaded for r in results] == [5, 0, 3]
+
+
+def test_download_chapters_record_failure_does_not_hang(series_source, tmp_path, db, monkeypatch):
+    """Test a page whose outcome cannot be saved fails its chapter instead of stalling the scheduler."""
+    from src.acquisition import downloader
+
+    write_manifest = downloader._write_page_manifest
+
+    def failing_write(pages_dir, page_idx, *args, **kwargs):
+        if pages_dir.parent.name == "ch003" and page_idx == 1:
+            raise OSError("disk full")
+        return write_manifest(pages_dir, page_idx, *args, **kwargs)
+
+    monkeypatch.setattr(downloader, "_write_page_manifest", failing_write)
+
+    adapter = FilesystemAdapter("filesystem", series_source)
+    chapters = adapter.list_chapters("test-series")
+
+    outcome = []
+    thread = threading.Thread(
+        target=lambda: outcome.append(download_chapters(adapter, chapters, tmp_path / "output", db, max_workers=2)),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "download_chapters hung"
+
+    results = outcome[0]
+    assert [r.success for r in results] == [True, True, False]
+    assert [(r.pages_downloaded, r.pages_failed) for r in results] == [(5, 0), (1, 0), (2, 1)]
+    assert results[2].errors == ["Page 1: Failed to record page: disk full"]
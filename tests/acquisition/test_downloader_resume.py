@@ -174,3 +174,54 @@ def test_download_chapter_corrupted_manifest_redownloads(test_chapter_source, ou
         assert manifest["success"] is True
 
     db.close()
+
+
+def test_resume_uses_database_index(test_chapter_source, output_dir):
+    """Test resume decisions come from the database, not the page manifests."""
+    adapter = FilesystemAdapter("filesystem", test_chapter_source)
+    chapters = adapter.list_chapters("test-series")
+    db = AcquisitionDB(output_dir / "test.db")
+
+    download_chapter(adapter, chapters[0], output_dir, db, max_workers=2)
+
+    # Manifests are no longer consulted once the chapter has database rows
+    pages_dir = get_pages_path(output_dir, "filesystem", "test-series", "ch001")
+    for manifest_path in pages_dir.glob("page_*.json"):
+        manifest_path.unlink()
+
+    result = download_chapter(adapter, chapters[0], output_dir, db, max_workers=2)
+
+    assert result.success is True
+    assert result.pages_downloaded == 0
+    rows = db.get_page_rows("filesystem", "test-series", "ch001")
+    assert len(rows) == 5
+    assert all(row["sha256"] and row["size_bytes"] for row in rows.values())
+    assert db.get_chapter_status("filesystem", "test-series", "ch001")["page_count"] == 5
+
+    db.close()
+
+
+def test_resume_verify_redownloads_corrupted_pages(test_chapter_source, output_dir):
+    """Test verify re-downloads pages whose contents no longer match the index."""
+    adapter = FilesystemAdapter("filesystem", test_chapter_source)
+    chapters = adapter.list_chapters("test-series")
+    db = AcquisitionDB(output_dir / "test.db")
+
+    download_chapter(adapter, chapters[0], output_dir, db, max_workers=2)
+
+    pages_dir = get_pages_path(output_dir, "filesystem", "test-series", "ch001")
+    original = (pages_dir / "001.png").read_bytes()
+    # Same size, different bytes: only the checksum catches this
+    (pages_dir / "001.png").write_bytes(original[:-1] + bytes([original[-1] ^ 0xFF]))
+    (pages_dir / "003.png").write_bytes(b"truncated")
+
+    without_verify = download_chapter(adapter, chapters[0], output_dir, db, max_workers=2)
+    assert without_verify.pages_downloaded == 0
+
+    result = download_chapter(adapter, chapters[0], output_dir, db, max_workers=2, verify=True)
+
+    assert result.success is True
+    assert result.pages_downloaded == 2
+    assert (pages_dir / "001.png").read_bytes() == original
+
+    db.close()
@@ -97,3 +97,45 @@ def test_download_page_out_of_range(temp_source_dir):
         assert result.success is False
         assert result.error is not None
         assert "out of range" in result.error
+
+
+def test_download_page_metadata_single_pass(temp_source_dir, tmp_path):
+    """Test size, checksum and dimensions come from the copy pass."""
+    import hashlib
+
+    adapter = FilesystemAdapter("filesystem", temp_source_dir)
+    chapter = adapter.list_chapters("test-series")[0]
+    source_file = temp_source_dir / "test-series" / "ch001" / "page_001.png"
+
+    result = adapter.download_page(chapter, 1, tmp_path / "001.png")
+
+    assert result.success is True
+    data = source_file.read_bytes()
+    assert (tmp_path / "001.png").read_bytes() == data
+    assert result.metadata.size_bytes == len(data)
+    assert result.metadata.sha256 == hashlib.sha256(data).hexdigest()
+    assert (result.metadata.width, result.metadata.height) == (100, 200)
+
+
+def test_page_listing_cached_until_directory_changes(temp_source_dir, monkeypatch):
+    """Test the chapter directory is globbed once, and again only after it changes."""
+    adapter = FilesystemAdapter("filesystem", temp_source_dir)
+    chapter = adapter.list_chapters("test-series")[0]
+    chapter_path = Path(chapter.chapter_url)
+
+    globs = []
+    original_glob = Path.glob
+
+    def counting_glob(self, pattern):
+        globs.append(self)
+        return original_glob(self, pattern)
+
+    monkeypatch.setattr(Path, "glob", counting_glob)
+
+    for _ in range(3):
+        assert len(adapter.list_pages(chapter)) == 3
+    assert globs == []
+
+    Image.new("RGB", (10, 10)).save(chapter_path / "page_003.png")
+    assert len(adapter.list_pages(chapter)) == 4
+    assert globs == [chapter_path]
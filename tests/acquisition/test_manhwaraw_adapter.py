@@ -0,0 +1,203 @@
+"""Tests for the ManhwaRaw adapter page-list and chapter-list caching (no network)."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.acquisition.adapter import ChapterInfo
+from src.acquisition.adapters.manhwaraw import ManhwaRawAdapter, parse_chapter_list, parse_page_list
+from src.acquisition.db import AcquisitionDB
+
+
+CHAPTER_HTML = """
+<div class="reading-content">
+  <div class="page-break"><img data-src=" https://cdn.example/ch1/001.jpg "></div>
+  <div class="page-break"><img src="/images/loading.gif"></div>
+  <div class="page-break"><img src="/uploads/ch1/002.jpg"></div>
+  <div class="page-break"><img data-src="https://cdn.example/ch1/003.jpg"></div>
+</div>
+"""
+
+SERIES_HTML = """
+<ul>
+  <li class="wp-manga-chapter"><a href="https://manhwaraw.com/manhwa-raw/series/chapter-2/">Chapter 2</a></li>
+  <li class="wp-manga-chapter"><a href="https://manhwaraw.com/manhwa-raw/series/chapter-1/">Chapter 1</a></li>
+</ul>
+"""
+
+
+def _png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (20, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _response(status_code=200, text="", content=b""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    response.text = text
+    response.iter_content.return_value = [content[:10], content[10:]]
+    response.__enter__.return_value = response
+    if status_code >= 400:
+        response.raise_for_status.side_effect = RuntimeError(f"{status_code} error")
+    return response
+
+
+@pytest.fixture
+def chapter():
+    return ChapterInfo(
+        source_id="mr",
+        series_id="series",
+        chapter_id="chapter-1",
+        chapter_title="Chapter 1",
+        chapter_url="https://manhwaraw.com/manhwa-raw/series/chapter-1/",
+        page_count=None,
+    )
+
+
+@pytest.fixture
+def adapter():
+    adapter = ManhwaRawAdapter("mr")
+    adapter._local.session = MagicMock()
+    return adapter
+
+
+def _route(adapter, image_status=200):
+    """Serve the chapter HTML for page-list URLs and a PNG for image URLs."""
+    png = _png_bytes()
+
+    def get(url, **kwargs):
+        if "style=list" in url:
+            return _response(text=CHAPTER_HTML)
+        return _response(status_code=image_status, content=png)
+
+    adapter.session.get.side_effect = get
+
+
+def _page_list_requests(adapter):
+    return [c for c in adapter.session.get.call_args_list if "style=list" in c.args[0]]
+
+
+def test_parse_page_list_skips_placeholders():
+    """Test image URLs are made absolute and placeholders skipped."""
+    pages = parse_page_list(CHAPTER_HTML, "https://manhwaraw.com/manhwa-raw/series/chapter-1/?style=list")
+
+    assert [p.index for p in pages] == [0, 1, 2]
+    assert pages[0].url == "https://cdn.example/ch1/001.jpg"
+    assert pages[1].url == "https://manhwaraw.com/uploads/ch1/002.jpg"
+
+
+def test_parse_page_list_empty():
+    """Test a chapter page without images is an error."""
+    with pytest.raises(ValueError, match="No pages found"):
+        parse_page_list("<html></html>", "https://example/")
+
+
+def test_parse_chapter_list_reading_order():
+    """Test chapters are returned oldest first as protocol ChapterInfo objects."""
+    chapters = parse_chapter_list(SERIES_HTML, "mr", "series")
+
+    assert [c.chapter_id for c in chapters] == ["chapter-1", "chapter-2"]
+    assert chapters[0].source_id == "mr"
+    assert chapters[0].chapter_title == "Chapter 1"
+
+
+def test_download_pages_fetches_page_list_once(adapter, chapter, tmp_path):
+    """Test downloading every page parses the chapter HTML once."""
+    _route(adapter)
+
+    results = [adapter.download_page(chapter, i, tmp_path / f"{i:03d}.png") for i in range(3)]
+
+    assert all(r.success for r in results)
+    assert len(_page_list_requests(adapter)) == 1
+    assert results[0].metadata.width == 20
+    assert results[0].metadata.size_bytes == len(_png_bytes())
+    image_call = adapter.session.get.call_args_list[-1]
+    assert image_call.kwargs["stream"] is True
+    assert image_call.kwargs["headers"]["Referer"] == chapter.chapter_url
+
+
+def test_page_list_cache_expires(adapter, chapter):
+    """Test the page list is fetched again after the TTL."""
+    _route(adapter)
+    adapter.page_list_ttl = 0
+
+    adapter.list_pages(chapter)
+    adapter._page_cache[("series", "chapter-1")] = (0.0, adapter._page_cache[("series", "chapter-1")][1])
+    adapter.list_pages(chapter)
+
+    assert len(_page_list_requests(adapter)) == 2
+
+
+def test_image_404_invalidates_page_list(adapter, chapter, tmp_path):
+    """Test a 404 image drops the cached page list so a retry refetches it."""
+    _route(adapter, image_status=404)
+
+    result = adapter.download_page(chapter, 0, tmp_path / "000.png")
+    assert result.success is False
+
+    adapter.session.reset_mock()
+    _route(adapter)
+    assert adapter.download_page(chapter, 0, tmp_path / "000.png").success
+    assert len(_page_list_requests(adapter)) == 1
+
+
+def test_page_index_out_of_range(adapter, chapter, tmp_path):
+    """Test out-of-range pages fail without requesting an image."""
+    _route(adapter)
+
+    result = adapter.download_page(chapter, 5, tmp_path / "005.png")
+
+    assert result.success is False
+    assert "out of range" in result.error
+    assert len(adapter.session.get.call_args_list) == 1
+
+
+def test_throttled_image_reports_to_rate_limiter(adapter, chapter, tmp_path):
+    """Test a 429 image is reported as throttled and slows the source down."""
+    png = _png_bytes()
+
+    def get(url, **kwargs):
+        if "style=list" in url:
+            return _response(text=CHAPTER_HTML)
+        response = _response(status_code=429, content=png)
+        response.headers = {"Retry-After": "0"}
+        return response
+
+    adapter.session.get.side_effect = get
+    rate_before = adapter.rate_limiter.rate
+
+    result = adapter.download_page(chapter, 0, tmp_path / "000.png")
+
+    assert result.success is False
+    assert result.throttled is True
+    assert adapter.rate_limiter.throttle_events == 1
+    assert adapter.rate_limiter.rate < rate_before
+
+
+def test_list_chapters_revalidates_stored_listing(tmp_path):
+    """Test a stored chapter list is revalidated and reused on 304 Not Modified."""
+    db = AcquisitionDB(tmp_path / "acquisition.db")
+    adapter = ManhwaRawAdapter("mr", listing_store=db)
+    adapter._local.session = MagicMock()
+
+    first = _response(text=SERIES_HTML)
+    first.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    adapter.session.get.return_value = first
+    chapters = adapter.list_chapters("series")
+
+    assert adapter.session.get.call_args.kwargs["headers"] == {}
+    assert [c.chapter_id for c in chapters] == ["chapter-1", "chapter-2"]
+
+    adapter.session.get.return_value = _response(status_code=304)
+    with patch("src.acquisition.adapters.manhwaraw.parse_chapter_list") as parse:
+        assert adapter.list_chapters("series") == chapters
+    parse.assert_not_called()
+    assert adapter.session.get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    db.close()
@@ -0,0 +1,128 @@
+"""Tests for per-source rate limiting."""
+
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from PIL import Image
+
+from src.acquisition.adapter import PageDownloadResult
+from src.acquisition.db import AcquisitionDB
+from src.acquisition.downloader import download_chapter
+from src.acquisition.filesystem_adapter import FilesystemAdapter
+from src.acquisition.rate_limit import (
+    RateLimiter,
+    configure_rate_limit,
+    get_rate_limiter,
+    parse_retry_after,
+)
+
+
+def test_burst_then_paced():
+    """Test a burst is allowed immediately and later requests are spaced by 1/rate."""
+    limiter = RateLimiter(rate=10, burst=3)
+
+    waits = [limiter._reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+    assert limiter.stats()["requests"] == 5
+    assert limiter.stats()["throttled_seconds"] == pytest.approx(0.3, abs=0.05)
+
+
+def test_acquire_sleeps():
+    """Test acquire blocks once the burst is used up."""
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.perf_counter()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.perf_counter() - start >= 0.035
+
+
+def test_throttle_cuts_rate_and_honours_retry_after():
+    """Test a throttle response halves the rate and pauses all callers."""
+    limiter = RateLimiter(rate=8, burst=4)
+
+    assert limiter.record_response(429, "0.3") is True
+
+    assert limiter.rate == 4
+    assert limiter.throttle_events == 1
+    assert limiter._reserve() == pytest.approx(0.3, abs=0.05)
+    # Paced after the pause rather than a fresh burst
+    assert limiter._reserve() == pytest.approx(0.3 + 0.25, abs=0.05)
+
+
+def test_success_raises_rate_up_to_ceiling():
+    """Test additive increase never exceeds the configured rate."""
+    limiter = RateLimiter(rate=2, burst=1, increase=0.5)
+    limiter.on_throttle(0)
+    assert limiter.rate == 1
+
+    limiter.record_response(200)
+    assert limiter.rate == 1.5
+    for _ in range(5):
+        limiter.record_response(200)
+    assert limiter.rate == 2
+
+    limiter.record_response(404)
+    assert limiter.rate == 2
+
+
+def test_rate_never_below_floor():
+    """Test repeated throttling stops at min_rate."""
+    limiter = RateLimiter(rate=1, burst=1, min_rate=0.25)
+    for _ in range(10):
+        limiter.on_throttle(0)
+    assert limiter.rate == 0.25
+
+
+def test_parse_retry_after():
+    """Test delta-seconds and HTTP-date Retry-After values."""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(future, usegmt=True)) == pytest.approx(30, abs=2)
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_limiters_are_per_source():
+    """Test each source gets its own shared limiter."""
+    assert get_rate_limiter("a") is get_rate_limiter("a")
+    assert get_rate_limiter("a") is not get_rate_limiter("b")
+
+    configured = configure_rate_limit("a", rate=2, burst=1)
+    assert get_rate_limiter("a") is configured
+    assert configured.max_rate == 2
+
+
+def test_throttled_pages_skip_exponential_backoff(tmp_path):
+    """Test throttled results are retried without the per-page backoff."""
+    source = tmp_path / "source" / "series" / "ch001"
+    source.mkdir(parents=True)
+    for i in range(2):
+        Image.new("RGB", (10, 10)).save(source / f"page_{i:03d}.png")
+
+    class ThrottlingAdapter(FilesystemAdapter):
+        calls = 0
+
+        def download_page(self, chapter_info, page_index, output_path):
+            ThrottlingAdapter.calls += 1
+            if ThrottlingAdapter.calls <= 2:
+                return PageDownloadResult(page_index, False, None, "Throttled", None, throttled=True)
+            return super().download_page(chapter_info, page_index, output_path)
+
+    adapter = ThrottlingAdapter("filesystem", tmp_path / "source")
+    chapter = adapter.list_chapters("series")[0]
+    db = AcquisitionDB(tmp_path / "out" / "acquisition.db")
+
+    start = time.perf_counter()
+    result = download_chapter(adapter, chapter, tmp_path / "out", db, max_workers=1)
+    db.close()
+
+    assert result.pages_downloaded == 2
+    assert time.perf_counter() - start < 0.5
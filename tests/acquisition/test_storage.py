@@ -0,0 +1,157 @@
+"""Tests for the content-addressed page store."""
+
+import hashlib
+import os
+from pathlib import Path
+
+from src.acquisition.db import AcquisitionDB
+from src.acquisition.downloader import download_chapter
+from src.acquisition.filesystem_adapter import FilesystemAdapter
+from src.acquisition.storage import (
+    blob_refcount,
+    gc_blobs,
+    get_blob_path,
+    get_pages_path,
+    iter_blobs,
+    store_page_blob,
+    write_hashed,
+)
+from PIL import Image
+
+
+def _part(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path, hashlib.sha256(data).hexdigest()
+
+
+def test_write_hashed(tmp_path):
+    """Test the digest is computed from the chunks as they are written."""
+    size, sha256 = write_hashed([b"abc", b"def"], tmp_path / "out.bin")
+
+    assert size == 6
+    assert sha256 == hashlib.sha256(b"abcdef").hexdigest()
+    assert (tmp_path / "out.bin").read_bytes() == b"abcdef"
+
+
+def test_identical_pages_share_one_blob(tmp_path):
+    """Test a second copy of the same content is linked, not stored again."""
+    root = tmp_path / "data"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+
+    part, sha256 = _part(tmp_path, "1.part", b"page bytes")
+    assert store_page_blob(root, part, sha256, root / "a" / "000.png") is False
+    part, _ = _part(tmp_path, "2.part", b"page bytes")
+    assert store_page_blob(root, part, sha256, root / "b" / "000.png") is True
+
+    blob = get_blob_path(root, sha256)
+    assert blob.parent.parent.name == sha256[:2]
+    assert blob_refcount(blob) == 2
+    assert not part.exists()
+    assert (root / "b" / "000.png").read_bytes() == b"page bytes"
+    assert (root / "a" / "000.png").stat().st_ino == (root / "b" / "000.png").stat().st_ino
+
+
+def test_page_stored_concurrently_shares_blob(tmp_path, monkeypatch):
+    """Test a blob created by another worker mid-store is shared rather than duplicated."""
+    root = tmp_path / "data"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    first, sha256 = _part(tmp_path, "1.part", b"page bytes")
+    second, _ = _part(tmp_path, "2.part", b"page bytes")
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if Path(src) == first:
+            # The other worker stores the same content after this one found no blob
+            monkeypatch.setattr(os, "replace", real_replace)
+            assert store_page_blob(root, second, sha256, root / "b" / "000.png") is False
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    assert store_page_blob(root, first, sha256, root / "a" / "000.png") is True
+
+    blob = get_blob_path(root, sha256)
+    assert blob_refcount(blob) == 2
+    assert (root / "a" / "000.png").stat().st_ino == blob.stat().st_ino
+    assert list(iter_blobs(root)) == [blob]
+    assert not list((root / "a").glob("*.link"))
+
+
+def test_damaged_blob_is_replaced(tmp_path):
+    """Test a blob whose size no longer matches is replaced by the new copy."""
+    root = tmp_path / "data"
+    root.mkdir()
+    data = b"original page"
+    part, sha256 = _part(tmp_path, "1.part", data)
+    store_page_blob(root, part, sha256, root / "000.png")
+    # Truncated in place through the chapter link
+    (root / "000.png").write_bytes(b"oops")
+
+    part, _ = _part(tmp_path, "2.part", data)
+    assert store_page_blob(root, part, sha256, root / "001.png") is False
+    assert get_blob_path(root, sha256).read_bytes() == data
+
+
+def test_gc_removes_unreferenced_blobs(tmp_path):
+    """Test gc keeps linked blobs and deletes ones no chapter uses."""
+    root = tmp_path / "data"
+    root.mkdir()
+    for i, data in enumerate([b"kept", b"dropped"]):
+        part, sha256 = _part(tmp_path, f"{i}.part", data)
+        store_page_blob(root, part, sha256, root / f"{i:03d}.png")
+    (root / "001.png").unlink()
+
+    assert gc_blobs(root, dry_run=True) == (1, len(b"dropped"))
+    assert len(list(iter_blobs(root))) == 2
+
+    assert gc_blobs(root) == (1, len(b"dropped"))
+    assert [blob.read_bytes() for blob in iter_blobs(root)] == [b"kept"]
+
+
+def test_download_chapter_dedup(tmp_path):
+    """Test duplicate pages across chapters are stored once."""
+    source = tmp_path / "source" / "series"
+    for chapter in ("ch001", "ch002"):
+        (source / chapter).mkdir(parents=True)
+        for i in range(3):
+            Image.new("RGB", (20, 20), color=(i * 60, 0, 0)).save(source / chapter / f"page_{i:03d}.png")
+
+    adapter = FilesystemAdapter("filesystem", tmp_path / "source")
+    root = tmp_path / "out"
+    db = AcquisitionDB(root / "acquisition.db")
+    for chapter in adapter.list_chapters("series"):
+        result = download_chapter(adapter, chapter, root, db, max_workers=2, dedup=True)
+        assert result.pages_downloaded == 3
+    db.close()
+
+    blobs = list(iter_blobs(root))
+    assert len(blobs) == 3
+    assert all(blob_refcount(blob) == 2 for blob in blobs)
+    pages_dir = get_pages_path(root, "filesystem", "series", "ch002")
+    assert sorted(p.name for p in pages_dir.iterdir() if p.suffix == ".png") == ["000.png", "001.png", "002.png"]
+
+
+def test_verify_discards_blob_damaged_through_page(tmp_path):
+    """Test a page corrupted in place is re-downloaded rather than relinked to its damaged blob."""
+    source = tmp_path / "source" / "series" / "ch001"
+    source.mkdir(parents=True)
+    Image.new("RGB", (20, 20), color=(200, 0, 0)).save(source / "page_000.png")
+
+    adapter = FilesystemAdapter("filesystem", tmp_path / "source")
+    chapter = adapter.list_chapters("series")[0]
+    root = tmp_path / "out"
+    db = AcquisitionDB(root / "acquisition.db")
+    download_chapter(adapter, chapter, root, db, dedup=True)
+
+    page = get_pages_path(root, "filesystem", "series", "ch001") / "000.png"
+    original = page.read_bytes()
+    page.write_bytes(original[:-1] + bytes([original[-1] ^ 0xFF]))
+
+    result = download_chapter(adapter, chapter, root, db, verify=True, dedup=True)
+    db.close()
+
+    assert result.pages_downloaded == 1
+    assert page.read_bytes() == original
+    assert [blob.read_bytes() for blob in iter_blobs(root)] == [original]
@@ -0,0 +1,91 @@
+"""Tests for page verification."""
+
+import hashlib
+
+import pytest
+from PIL import Image
+
+from src.acquisition.db import AcquisitionDB
+from src.acquisition.downloader import download_chapters
+from src.acquisition.filesystem_adapter import FilesystemAdapter
+from src.acquisition.storage import compute_sha256, get_pages_path, verify_sha256
+from src.acquisition.verify import verify_pages
+
+
+@pytest.fixture
+def synced(tmp_path):
+    """Download two chapters (with one duplicated page) and return (root, db)."""
+    source = tmp_path / "source" / "series"
+    for chapter in ("ch001", "ch002"):
+        (source / chapter).mkdir(parents=True)
+        for i in range(3):
+            color = (0, 0, 0) if i == 0 else (i * 40, 0, 0) if chapter == "ch001" else (0, i * 40, 0)
+            Image.new("RGB", (20, 20), color=color).save(source / chapter / f"page_{i:03d}.png")
+
+    adapter = FilesystemAdapter("filesystem", tmp_path / "source")
+    root = tmp_path / "data"
+    db = AcquisitionDB(root / "acquisition.db")
+    download_chapters(adapter, adapter.list_chapters("series"), root, db, dedup=True)
+    yield root, db
+    db.close()
+
+
+def test_compute_sha256_large_file(tmp_path):
+    """Test hashing across several read buffers."""
+    data = bytes(range(256)) * 10_000
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+
+    assert compute_sha256(path) == hashlib.sha256(data).hexdigest()
+    assert verify_sha256(path, hashlib.sha256(data).hexdigest())
+    assert compute_sha256(tmp_path / "missing.bin") is None
+    assert not verify_sha256(tmp_path / "missing.bin", hashlib.sha256(data).hexdigest())
+
+
+def test_verify_clean_tree(synced):
+    """Test an untouched download verifies, hashing each linked file once."""
+    root, db = synced
+
+    report = verify_pages(root, db, workers=2)
+
+    assert report.checked == 6
+    assert report.failures == []
+    # The duplicated first page is one blob
+    assert report.hashed == 5
+
+
+def test_verify_uses_digest_cache(synced):
+    """Test unchanged files are not rehashed on the next run."""
+    root, db = synced
+    verify_pages(root, db)
+
+    page = get_pages_path(root, "filesystem", "series", "ch001") / "002.png"
+    page.write_bytes(page.read_bytes())  # New mtime, same content
+
+    report = verify_pages(root, db)
+    assert report.hashed == 1
+    assert report.cached == 5
+    assert report.failures == []
+
+    report = verify_pages(root, db, use_cache=False)
+    assert report.hashed == 5
+
+
+def test_verify_reports_failures(synced):
+    """Test missing, truncated and corrupted pages are reported."""
+    root, db = synced
+    pages_dir = get_pages_path(root, "filesystem", "series", "ch002")
+    (pages_dir / "001.png").unlink()
+    (pages_dir / "002.png").write_bytes(b"short")
+    other = get_pages_path(root, "filesystem", "series", "ch001") / "001.png"
+    data = other.read_bytes()
+    other.write_bytes(data[:-1] + bytes([data[-1] ^ 0xFF]))
+
+    report = verify_pages(root, db, series_id="series")
+
+    assert [(c.chapter_id, c.page_index, c.status) for c in report.failures] == [
+        ("ch001", 1, "hash_mismatch"),
+        ("ch002", 1, "missing"),
+        ("ch002", 2, "size_mismatch"),
+    ]
+    assert verify_pages(root, db, source_id="elsewhere").checked == 0
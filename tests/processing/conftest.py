@@ -0,0 +1,13 @@
+"""Shared fixtures for processing tests."""
+
+import pytest
+
+from src.processing.ocr import reset_engine_pools
+
+
+@pytest.fixture(autouse=True)
+def fresh_ocr_engine_pools():
+    """Ensure each test constructs its own (possibly mocked) OCR engines."""
+    reset_engine_pools()
+    yield
+    reset_engine_pools()
@@ -0,0 +1,105 @@
+"""Tests for chapter-level batch processing."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.processing.batch import (
+    build_page_job,
+    discover_chapter_dirs,
+    discover_page_manifests,
+    run_jobs,
+)
+
+
+@pytest.fixture
+def chapter_source():
+    """Create a source chapter with three downloaded pages."""
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        input_path = Path(input_dir)
+        pages_dir = input_path / "data" / "sources" / "test-source" / "test-series" / "ch001" / "pages"
+        pages_dir.mkdir(parents=True)
+
+        # Create pages out of order to check sorting
+        for i in [2, 0, 1]:
+            Image.new("RGB", (100, 200), color=(i * 50, 0, 0)).save(pages_dir / f"{i:03d}.png")
+            with open(pages_dir / f"page_{i:03d}.json", "w") as f:
+                json.dump({"page_index": i, "success": True}, f)
+
+        # Unrelated files are ignored
+        (pages_dir / "page_000.json.part").write_text("")
+        (pages_dir / "notes.json").write_text("{}")
+
+        yield {
+            "data_dir": input_path / "data",
+            "pages_dir": pages_dir,
+            "output_dir": Path(output_dir),
+        }
+
+
+def test_discover_page_manifests_sorted(chapter_source):
+    """Test manifests are discovered in page order and other files are skipped."""
+    manifests = discover_page_manifests(chapter_source["pages_dir"])
+    assert [m.name for m in manifests] == ["page_000.json", "page_001.json", "page_002.json"]
+
+
+def test_discover_page_manifests_missing_dir(tmp_path):
+    """Test a missing pages directory yields no manifests."""
+    assert discover_page_manifests(tmp_path / "missing") == []
+
+
+def test_discover_chapter_dirs(chapter_source):
+    """Test chapter directories are discovered per series."""
+    chapters = discover_chapter_dirs(chapter_source["data_dir"], "test-source", "test-series")
+    assert [c.name for c in chapters] == ["ch001"]
+    assert discover_chapter_dirs(chapter_source["data_dir"], "test-source", "missing") == []
+
+
+def test_build_page_job(chapter_source):
+    """Test PageJob paths match the single-page command layout."""
+    manifest = chapter_source["pages_dir"] / "page_001.json"
+    job = build_page_job(manifest, 1, chapter_source["output_dir"])
+
+    expected_dir = chapter_source["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    assert job.source_id == "test-source"
+    assert job.series_id == "test-series"
+    assert job.chapter_id == "ch001"
+    assert job.input_image_path == chapter_source["pages_dir"] / "001.png"
+    assert job.output_image_path == expected_dir / "001_processed.png"
+    assert job.output_manifest_path == expected_dir / "page_001.out.json"
+    assert job.status == "PENDING"
+
+
+def test_build_page_job_bad_path(tmp_path):
+    """Test an unparseable manifest path raises ValueError."""
+    with pytest.raises(ValueError, match="Cannot parse"):
+        build_page_job(tmp_path / "page_000.json", 0, tmp_path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_jobs(chapter_source, workers):
+    """Test all pages are processed in-process and with a process pool."""
+    jobs = [
+        build_page_job(m, i, chapter_source["output_dir"])
+        for i, m in enumerate(discover_page_manifests(chapter_source["pages_dir"]))
+    ]
+    completed = []
+
+    result = run_jobs(jobs, workers=workers, stage_limits={"inpaint": 1}, on_complete=completed.append)
+
+    assert result.pages_done == 3
+    assert result.pages_failed == 0
+    assert len(completed) == 3
+    assert [job.page_index for job in result.jobs] == [0, 1, 2]
+    assert result.pages_per_second > 0
+    for job in result.jobs:
+        assert job.output_manifest_path.exists()
+
+
+def test_run_jobs_unknown_stage(chapter_source):
+    """Test unknown stage names in stage_limits are rejected."""
+    with pytest.raises(ValueError, match="Unknown stages"):
+        run_jobs([], stage_limits={"bogus": 1})
@@ -0,0 +1,35 @@
+"""Tests for stage fingerprints."""
+
+import os
+
+from src.processing.fingerprint import file_digest, hash_json, stage_fingerprint
+
+
+def test_hash_json_ignores_key_order():
+    """Test equal values hash equally regardless of key order."""
+    assert hash_json({"a": 1, "b": [1, 2]}) == hash_json({"b": [1, 2], "a": 1})
+    assert hash_json({"a": 1}) != hash_json({"a": 2})
+
+
+def test_file_digest_reuses_unchanged_stat(tmp_path):
+    """Test a recorded digest is reused while size and mtime are unchanged."""
+    path = tmp_path / "page.png"
+    path.write_bytes(b"first")
+    digest = file_digest(path)
+    assert digest["size"] == 5
+
+    # Same stat: the stale digest is trusted without reading the file
+    stale = dict(digest, sha256="cached")
+    assert file_digest(path, stale)["sha256"] == "cached"
+
+    path.write_bytes(b"second")
+    os.utime(path, ns=(digest["mtime_ns"] + 1, digest["mtime_ns"] + 1))
+    assert file_digest(path, stale)["sha256"] == file_digest(path)["sha256"] != digest["sha256"]
+
+
+def test_stage_fingerprint_depends_on_stage_and_inputs():
+    """Test fingerprints change with the stage and any input."""
+    inputs = {"ocr": "abc", "batch": False}
+    assert stage_fingerprint("translate", inputs) == stage_fingerprint("translate", dict(inputs))
+    assert stage_fingerprint("translate", inputs) != stage_fingerprint("grouping", inputs)
+    assert stage_fingerprint("translate", inputs) != stage_fingerprint("translate", {**inputs, "batch": True})
@@ -0,0 +1,108 @@
+"""Tests for shared bounding-box geometry kernels."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.processing.geometry import (
+    bbox_to_int_rect,
+    bbox_to_rect,
+    bboxes_to_array,
+    compute_distance,
+    compute_vertical_distance,
+    expand_rects,
+    int_rects_from_array,
+    pairwise_distance,
+    pairwise_vertical_distance,
+    rasterize_rects,
+    rect_iou,
+    rect_to_bbox,
+    rects_from_array,
+    union_bbox,
+    union_rect,
+)
+
+
+@pytest.fixture
+def random_bboxes():
+    """Generate random (possibly rotated) 4-point boxes."""
+    rng = random.Random(0)
+    bboxes = []
+    for _ in range(30):
+        x, y = rng.uniform(0, 500), rng.uniform(0, 2000)
+        w, h = rng.uniform(5, 100), rng.uniform(5, 40)
+        skew = rng.uniform(-3, 3)
+        bboxes.append([[x, y + skew], [x + w, y], [x + w, y + h], [x, y + h - skew]])
+    return bboxes
+
+
+def test_bboxes_to_array_shape():
+    """Test bboxes stack into an (N, 4, 2) float32 array."""
+    arr = bboxes_to_array([[[0, 0], [1, 0], [1, 1], [0, 1]]] * 3)
+    assert arr.shape == (3, 4, 2)
+    assert arr.dtype == np.float32
+    assert bboxes_to_array([]).shape == (0, 4, 2)
+
+
+def test_rects_match_scalar(random_bboxes):
+    """Test batch rect conversion matches bbox_to_rect / bbox_to_int_rect."""
+    points = bboxes_to_array(random_bboxes, dtype=np.float64)
+
+    rects = rects_from_array(points)
+    int_rects = int_rects_from_array(points)
+
+    for bbox, rect, int_rect in zip(random_bboxes, rects.tolist(), int_rects.tolist()):
+        assert tuple(rect) == bbox_to_rect(bbox)
+        assert tuple(int_rect) == bbox_to_int_rect(bbox)
+
+
+def test_union_rect_matches_union_bbox(random_bboxes):
+    """Test the batch union matches the scalar union."""
+    rects = rects_from_array(bboxes_to_array(random_bboxes, dtype=np.float64))
+    assert rect_to_bbox(union_rect(rects)) == union_bbox(random_bboxes)
+
+
+def test_rect_to_bbox_python_types():
+    """Test rect_to_bbox returns JSON-serialisable Python numbers."""
+    bbox = rect_to_bbox(np.array([1.5, 2.0, 3.0, 4.0]))
+    assert bbox == [[1.5, 2.0], [3.0, 2.0], [3.0, 4.0], [1.5, 4.0]]
+    assert all(type(v) is float for pt in bbox for v in pt)
+
+
+def test_pairwise_distances_match_scalar(random_bboxes):
+    """Test distance matrices match the scalar distance functions."""
+    rects = rects_from_array(bboxes_to_array(random_bboxes, dtype=np.float64))
+    vertical = pairwise_vertical_distance(rects)
+    full = pairwise_distance(rects)
+
+    scalar_rects = [bbox_to_rect(b) for b in random_bboxes]
+    for i, r1 in enumerate(scalar_rects):
+        for j, r2 in enumerate(scalar_rects):
+            assert vertical[i, j] == pytest.approx(compute_vertical_distance(r1, r2))
+            assert full[i, j] == pytest.approx(compute_distance(r1, r2))
+
+
+def test_expand_rects_clipped():
+    """Test batch expansion clips to image bounds."""
+    rects = np.array([[5, 5, 50, 50], [50, 50, 95, 95]])
+    expanded = expand_rects(rects, padding=10, width=100, height=100)
+    assert expanded.tolist() == [[0, 0, 60, 60], [40, 40, 100, 100]]
+
+
+def test_rasterize_rects():
+    """Test rectangles are filled as half-open pixel ranges."""
+    mask = rasterize_rects(np.array([[2, 1, 4, 3], [0, 8, 1, 10]]), width=6, height=10)
+    assert mask.shape == (10, 6)
+    assert mask.dtype == np.uint8
+    assert mask[1:3, 2:4].tolist() == [[255, 255], [255, 255]]
+    assert mask[8:10, 0].tolist() == [255, 255]
+    assert int(mask.sum()) == 255 * 6
+
+
+def test_rect_iou():
+    """Test IoU of identical, partly overlapping, disjoint and empty rectangles."""
+    assert rect_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert rect_iou((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(50 / 150)
+    assert rect_iou((0, 0, 10, 10), (10, 0, 20, 10)) == 0.0
+    assert rect_iou((0, 0, 0, 10), (0, 0, 10, 10)) == 0.0
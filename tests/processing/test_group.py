@@ -350,3 +350,45 @@ def test_run_page_with_ocr_and_grouping(temp_dirs_with_ocr):
     assert grouping_data["engine"] == "heuristic"
     assert len(grouping_data["groups"]) == 1  # Close lines grouped together
     assert grouping_data["groups"][0]["lines"] == [0, 1]
+
+
+def _random_ocr_result(seed: int, count: int) -> dict:
+    """Generate a random page of OCR lines with varied heights and gaps."""
+    import random
+
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        x = rng.uniform(0, 600)
+        y = rng.uniform(0, 5000)
+        w = rng.uniform(20, 200)
+        h = rng.uniform(10, 40)
+        lines.append({"text": "x", "bbox": [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]})
+    return {"lines": lines, "source_image": "test.png"}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sweep_matches_agglomerative(seed):
+    """Test the sweep engine produces the same groups as the original engine."""
+    ocr_result = _random_ocr_result(seed, 60)
+
+    sweep = group_lines(ocr_result, method="sweep")
+    legacy = group_lines(ocr_result, method="agglomerative")
+
+    assert [g["bbox"] for g in sweep["groups"]] == [g["bbox"] for g in legacy["groups"]]
+    assert [sorted(g["lines"]) for g in sweep["groups"]] == [sorted(g["lines"]) for g in legacy["groups"]]
+
+
+def test_sweep_handles_dense_strip():
+    """Test the sweep engine scales to hundreds of lines on a tall strip."""
+    ocr_result = _random_ocr_result(42, 5000)
+    result = group_lines(ocr_result)
+
+    grouped = sorted(idx for g in result["groups"] for idx in g["lines"])
+    assert grouped == list(range(5000))
+
+
+def test_group_lines_unknown_method():
+    """Test an unknown grouping method is rejected."""
+    with pytest.raises(ValueError, match="Unknown grouping method"):
+        group_lines({"lines": []}, method="bogus")
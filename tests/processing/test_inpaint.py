@@ -10,9 +10,12 @@ import pytest
 from PIL import Image
 
 from src.processing.inpaint import (
+    INPAINT_MODES,
     bbox_to_rect,
     create_mask_from_groups,
     expand_rect,
+    find_mask_regions,
+    inpaint_regions,
     run_inpaint,
 )
 from src.processing.job import PageJob
@@ -279,10 +282,10 @@ def test_run_page_with_inpaint(temp_dirs_with_grouping):
         assert result.status == "DONE"
         assert result.error is None
 
-        # Verify cv2 operations were called
+        # Verify cv2 operations were called and the cleaned image written
         assert mock_imread.called
         assert mock_inpaint.called
-        assert mock_imwrite.called
+        assert cleaned_output.exists()
 
 
 def test_run_page_with_inpaint_no_grouping(temp_dirs_with_grouping):
@@ -367,3 +370,99 @@ def test_run_page_full_pipeline(temp_dirs_with_grouping):
 
         # Verify inpainting was called
         assert mock_inpaint.called
+
+
+def _random_page(height=600, width=200, seed=0):
+    """Create a smooth random BGR image and a mask of scattered rectangles."""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    image = cv2.GaussianBlur((rng.random((height, width, 3)) * 255).astype(np.uint8), (7, 7), 0)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for _ in range(12):
+        x = int(rng.integers(0, width - 40))
+        y = int(rng.integers(0, height - 30))
+        mask[y:y + int(rng.integers(4, 30)), x:x + int(rng.integers(4, 40))] = 255
+    # Regions touching the image border
+    mask[0:6, 0:20] = 255
+    mask[height - 5:height, width - 15:width] = 255
+    return image, mask
+
+
+def test_find_mask_regions_merges_close_pixels():
+    """Test nearby mask blobs share a region and distant ones do not."""
+    mask = np.zeros((100, 100), dtype=np.uint8)
+    mask[10:20, 10:20] = 255
+    mask[10:20, 22:30] = 255  # 2px gap, merged
+    mask[70:80, 70:80] = 255  # far away
+
+    regions = find_mask_regions(mask)
+
+    assert len(regions) == 2
+    for x_min, y_min, x_max, y_max, crop_mask in regions:
+        assert crop_mask.shape == (y_max - y_min, x_max - x_min)
+    assert sum(int((r[4] > 0).sum()) for r in regions) == int((mask > 0).sum())
+
+
+def test_find_mask_regions_empty():
+    """Test an empty mask has no regions."""
+    assert find_mask_regions(np.zeros((50, 50), dtype=np.uint8)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_inpaint_regions_matches_full_inpaint(workers):
+    """Test region-cropped inpainting is byte-identical to whole-page inpainting."""
+    import cv2
+
+    image, mask = _random_page()
+    expected = cv2.inpaint(image, mask, inpaintRadius=3, flags=cv2.INPAINT_TELEA)
+
+    result = inpaint_regions(image, mask, workers=workers)
+
+    assert np.array_equal(result, expected)
+
+
+def test_run_inpaint_region_mode_matches_full(tmp_path):
+    """Test both run_inpaint modes write the same cleaned image."""
+    image, _ = _random_page(seed=1)
+    groups = {
+        "groups": [
+            {"bbox": [[10, 20], [80, 20], [80, 40], [10, 40]]},
+            {"bbox": [[50, 300], [150, 300], [150, 340], [50, 340]]},
+        ]
+    }
+    outputs = {}
+    for mode in INPAINT_MODES:
+        image_path = tmp_path / mode / "page.png"
+        image_path.parent.mkdir()
+        Image.fromarray(image).save(image_path)
+        outputs[mode] = np.array(Image.open(run_inpaint(image_path, groups, mode=mode)))
+
+    assert np.array_equal(outputs["full"], outputs["regions"])
+
+
+def test_run_inpaint_unknown_mode(tmp_path):
+    """Test unknown inpaint modes are rejected."""
+    with pytest.raises(ValueError, match="Unknown inpaint mode"):
+        run_inpaint(tmp_path / "page.png", {"groups": []}, mode="bogus")
+
+
+def test_run_page_with_inpaint_region_mode(temp_dirs_with_grouping):
+    """Test run_page forwards the inpaint mode."""
+    output_dir = temp_dirs_with_grouping["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    job = PageJob(
+        source_id="test-source",
+        series_id="test-series",
+        chapter_id="ch001",
+        page_index=0,
+        input_image_path=temp_dirs_with_grouping["input_image"],
+        input_manifest_path=temp_dirs_with_grouping["input_manifest"],
+        output_image_path=output_dir / "000_processed.png",
+        output_manifest_path=output_dir / "page_000.out.json",
+        status="PENDING",
+    )
+
+    result = run_page(job, with_inpaint=True, inpaint_mode="regions")
+
+    assert result.status == "DONE"
+    assert (output_dir / "000_processed.cleaned.png").exists()
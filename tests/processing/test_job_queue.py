@@ -0,0 +1,219 @@
+"""Tests for the durable job queue and queue workers."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from src.processing import worker
+from src.processing.job import PageJob
+from src.processing.job_queue import JobQueue, retry_delay
+from src.processing.worker import LOST, drain_queue, enqueue_pages, queue_stages
+
+
+def _page_job(tmp_path: Path, page_index: int) -> PageJob:
+    manifest = tmp_path / "sources" / "src" / "series" / "ch001" / "pages" / f"page_{page_index:03d}.json"
+    return PageJob(
+        "src", "series", "ch001", page_index,
+        manifest.parent / f"{page_index:03d}.png", manifest,
+        tmp_path / "out.png", tmp_path / "out.json", status="PENDING",
+    )
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """A job queue holding two pages x (prepare, ocr)."""
+    q = JobQueue(tmp_path / "jobs.db")
+    q.enqueue([_page_job(tmp_path, 0), _page_job(tmp_path, 1)], ["prepare", "ocr"], tmp_path, {"inpaint_mode": "full"})
+    yield q
+    q.close()
+
+
+def test_enqueue_is_idempotent(tmp_path, queue):
+    """Test enqueueing the same pages again adds nothing."""
+    assert queue.enqueue([_page_job(tmp_path, 0), _page_job(tmp_path, 1)], ["prepare", "ocr"], tmp_path) == 0
+    assert queue.enqueue([_page_job(tmp_path, 2)], ["prepare", "ocr"], tmp_path) == 2
+    assert queue.counts() == {"pending": 6}
+
+
+def test_lease_respects_stage_order(queue):
+    """Test a stage is not leased before the page's earlier stages are done."""
+    first = queue.lease("a")
+    second = queue.lease("a")
+    assert (first.page_index, first.stage) == (0, "prepare")
+    assert (second.page_index, second.stage) == (1, "prepare")
+    assert second.options == {"inpaint_mode": "full"}
+    assert second.attempts == 1
+
+    # Both prepare jobs are leased; ocr is waiting on them
+    assert queue.lease("a") is None
+
+    assert queue.complete(first.id, "a")
+    third = queue.lease("a")
+    assert (third.page_index, third.stage) == (0, "ocr")
+
+
+def test_lease_is_exclusive_across_connections(tmp_path, queue):
+    """Test two workers on separate connections never get the same job."""
+    other = JobQueue(tmp_path / "jobs.db")
+    try:
+        leased = [queue.lease("a"), other.lease("b"), queue.lease("a"), other.lease("b")]
+    finally:
+        other.close()
+
+    ids = [job.id for job in leased if job is not None]
+    assert len(ids) == 2
+    assert len(set(ids)) == 2
+
+
+def test_complete_requires_lease_owner(queue):
+    """Test a worker cannot complete a job it does not hold."""
+    job = queue.lease("a")
+    assert not queue.complete(job.id, "b")
+    assert not queue.heartbeat(job.id, "b")
+    assert queue.heartbeat(job.id, "a")
+    assert queue.complete(job.id, "a")
+
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    """Test a job held by a worker that stopped heartbeating is re-leased."""
+    q = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+    try:
+        q.enqueue([_page_job(tmp_path, 0)], ["prepare"], tmp_path)
+        job = q.lease("crashed")
+        time.sleep(0.1)
+
+        retaken = q.lease("b")
+        assert retaken.id == job.id
+        assert retaken.attempts == 2
+        # The original worker lost its lease
+        assert not q.complete(job.id, "crashed")
+    finally:
+        q.close()
+
+
+def test_expired_lease_dead_letters_after_max_attempts(tmp_path):
+    """Test a job that keeps killing its worker is eventually dead-lettered."""
+    q = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+    try:
+        q.enqueue([_page_job(tmp_path, 0)], ["prepare"], tmp_path, max_attempts=1)
+        q.lease("crashed")
+        time.sleep(0.1)
+
+        assert q.lease("b") is None
+        assert q.counts() == {"dead": 1}
+        assert q.dead_jobs()[0]["last_error"].startswith("Lease expired")
+    finally:
+        q.close()
+
+
+def test_fail_retries_with_backoff_then_dead_letters(tmp_path):
+    """Test failed jobs back off before retrying and are dead-lettered when out of attempts."""
+    q = JobQueue(tmp_path / "jobs.db")
+    try:
+        q.enqueue([_page_job(tmp_path, 0)], ["prepare", "ocr"], tmp_path, max_attempts=2)
+        job = q.lease("a")
+        assert q.fail(job.id, "a", "boom") == "pending"
+
+        # Backing off: not available yet, but the worker should wait for it
+        assert q.lease("a") is None
+        assert 0 < q.next_available_in() <= retry_delay(1)
+
+        q.conn.execute("UPDATE jobs SET available_at = 0")
+        job = q.lease("a")
+        assert job.attempts == 2
+        assert q.fail(job.id, "a", "boom again") == "dead"
+
+        assert q.counts() == {"dead": 1, "blocked": 1}
+        assert q.next_available_in() is None
+        assert q.dead_jobs()[0]["last_error"] == "boom again"
+
+        assert q.retry_dead() == 1
+        assert q.counts() == {"pending": 2}
+        assert q.lease("a").stage == "prepare"
+    finally:
+        q.close()
+
+
+def test_retry_delay_is_capped():
+    """Test retry delays grow exponentially up to the cap."""
+    assert retry_delay(1) < retry_delay(2) < retry_delay(3)
+    assert retry_delay(100) == retry_delay(101)
+
+
+def test_queue_stages():
+    """Test queue stages follow run_page flags in pipeline order."""
+    assert queue_stages() == ["prepare"]
+    assert queue_stages(with_render=True, with_ocr=True) == ["prepare", "ocr", "render"]
+
+
+def test_drain_queue_runs_stages_in_order(tmp_path, monkeypatch):
+    """Test a worker drains every stage of every page and dead-letters persistent failures."""
+    ran = []
+
+    def fake_run_page_stage(job, stage, **options):
+        ran.append((job.page_index, stage, options["translation_memory_path"]))
+        job.status = "FAILED" if (job.page_index, stage) == (1, "ocr") else "DONE"
+        job.error = "OCR failed" if job.status == "FAILED" else None
+        return job
+
+    monkeypatch.setattr(worker, "run_page_stage", fake_run_page_stage)
+
+    data_dir = tmp_path / "data"
+    jobs = [_page_job(data_dir, 0), _page_job(data_dir, 1)]
+    queue_path = tmp_path / "jobs.db"
+    added = enqueue_pages(
+        queue_path, jobs, tmp_path, max_attempts=1, with_ocr=True, with_render=True,
+        translation_memory_path=tmp_path / "tm.db",
+    )
+    assert added == 6
+
+    outcomes = []
+    stats = drain_queue(queue_path, owner="w", poll_seconds=0.01, on_job=lambda q, j, s: outcomes.append(s))
+
+    assert (stats.done, stats.retried, stats.dead) == (4, 0, 1)
+    assert outcomes.count("dead") == 1
+    # Jobs run in enqueue order; page 1 never renders since its ocr stage is dead
+    assert [(page, stage) for page, stage, _ in ran] == [
+        (0, "prepare"), (0, "ocr"), (0, "render"), (1, "prepare"), (1, "ocr"),
+    ]
+    assert all(path == tmp_path / "tm.db" for _, _, path in ran)
+
+    q = JobQueue(queue_path)
+    try:
+        assert q.counts() == {"done": 4, "dead": 1, "blocked": 1}
+    finally:
+        q.close()
+
+
+@pytest.mark.parametrize("first_status", ["DONE", "FAILED"])
+def test_drain_queue_counts_lease_lost_mid_job(tmp_path, monkeypatch, first_status):
+    """Test a job whose lease expires while it runs is counted as lost, not done or retried."""
+    queue_path = tmp_path / "jobs.db"
+    calls = []
+
+    def fake_run_page_stage(job, stage, **options):
+        calls.append(stage)
+        if len(calls) == 1:
+            # The lease runs out and another worker takes the job over
+            thief = JobQueue(queue_path, lease_seconds=0.05)
+            try:
+                thief.conn.execute("UPDATE jobs SET lease_expires_at = 0")
+                assert thief.lease("thief") is not None
+            finally:
+                thief.close()
+            job.status, job.error = first_status, "boom"
+        else:
+            job.status, job.error = "DONE", None
+        return job
+
+    monkeypatch.setattr(worker, "run_page_stage", fake_run_page_stage)
+    enqueue_pages(queue_path, [_page_job(tmp_path / "data", 0)], tmp_path)
+
+    outcomes = []
+    stats = drain_queue(queue_path, owner="w", poll_seconds=0.01, on_job=lambda q, j, s: outcomes.append(s))
+
+    # The stolen run's outcome is discarded; the job reruns once the thief's lease expires
+    assert outcomes == [LOST, None]
+    assert (stats.done, stats.retried, stats.dead, stats.lost) == (1, 0, 0, 1)
+    assert stats.total == 2
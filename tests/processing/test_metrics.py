@@ -0,0 +1,94 @@
+"""Tests for per-stage processing metrics."""
+
+import json
+import time
+
+import pytest
+
+from src.processing.metrics import (
+    append_metrics_record,
+    measure_stage,
+    percentile,
+    read_metrics_log,
+    summarize_metrics,
+)
+
+
+def test_measure_stage_records_time_and_io(tmp_path):
+    """Test wall/CPU time and I/O counters are measured."""
+    with measure_stage("ocr") as metrics:
+        time.sleep(0.01)
+        (tmp_path / "out.bin").write_bytes(b"x" * 4096)
+
+    assert metrics.stage == "ocr"
+    assert metrics.wall_seconds >= 0.01
+    assert metrics.cpu_seconds >= 0
+    if metrics.bytes_written is not None:
+        assert metrics.bytes_written >= 4096
+    if metrics.peak_rss_bytes is not None:
+        assert metrics.peak_rss_bytes > 0
+    assert "stage" not in metrics.to_dict()
+
+
+def test_measure_stage_records_on_error():
+    """Test metrics are filled in when the stage raises."""
+    with pytest.raises(RuntimeError):
+        with measure_stage("render") as metrics:
+            raise RuntimeError("boom")
+
+    assert metrics.wall_seconds > 0
+
+
+def test_percentile():
+    """Test linear-interpolated percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 95) == pytest.approx(95.05)
+    assert percentile([3.0], 95) == 3.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def _record(chapter_id, page_index, wall, status="DONE"):
+    return {
+        "source_id": "src",
+        "series_id": "series",
+        "chapter_id": chapter_id,
+        "page_index": page_index,
+        "status": status,
+        "stages": {
+            "prepare": {"wall_seconds": 0.1, "cpu_seconds": 0.05, "bytes_read": None},
+            "ocr": {"wall_seconds": wall, "cpu_seconds": wall / 2, "bytes_read": 100},
+        },
+    }
+
+
+def test_read_metrics_log_filters_and_keeps_latest(tmp_path):
+    """Test records are filtered by chapter and reruns replace earlier records."""
+    log_path = tmp_path / "metrics.jsonl"
+    append_metrics_record(log_path, _record("ch1", 0, 1.0, status="FAILED"))
+    append_metrics_record(log_path, _record("ch1", 1, 2.0))
+    append_metrics_record(log_path, _record("ch2", 0, 3.0))
+    append_metrics_record(log_path, _record("ch1", 0, 4.0))
+
+    records = read_metrics_log(log_path, "src", "series", "ch1")
+
+    assert sorted((r["page_index"], r["stages"]["ocr"]["wall_seconds"]) for r in records) == [(0, 4.0), (1, 2.0)]
+    assert len(read_metrics_log(log_path, series_id="series")) == 3
+    with open(log_path) as f:
+        assert all(json.loads(line) for line in f)
+
+
+def test_summarize_metrics():
+    """Test per-stage p50/p95 summaries and skipped missing values."""
+    records = [_record("ch1", i, float(i + 1)) for i in range(10)]
+
+    summary = summarize_metrics(records)
+
+    assert list(summary) == ["prepare", "ocr"]
+    assert summary["ocr"]["pages"] == 10
+    assert summary["ocr"]["wall_seconds"]["p50"] == pytest.approx(5.5)
+    assert summary["ocr"]["wall_seconds"]["p95"] == pytest.approx(9.55)
+    assert summary["ocr"]["wall_seconds"]["total"] == pytest.approx(55.0)
+    assert "bytes_read" not in summary["prepare"]
+    assert "peak_rss_bytes" not in summary["ocr"]
@@ -5,10 +5,12 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from PIL import Image
 
 from src.processing.job import PageJob
+from src.processing.ocr import merge_tile_lines, run_ocr
 from src.processing.runner import run_page
 
 
@@ -187,3 +189,206 @@ def test_run_page_with_ocr_empty_result(temp_dirs_with_image):
 
     assert ocr_data["lines"] == []
     assert ocr_data["engine"] == "paddleocr"
+
+
+def test_engine_pool_reused_across_pages(temp_dirs_with_image):
+    """Test that PaddleOCR is constructed once and reused for subsequent pages."""
+    mock_ocr_instance = MagicMock()
+    mock_ocr_instance.ocr.return_value = None
+    mock_paddle_class = MagicMock(return_value=mock_ocr_instance)
+
+    output_dir = (
+        temp_dirs_with_image["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    )
+
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}):
+        for _ in range(3):
+            job = PageJob(
+                source_id="test-source",
+                series_id="test-series",
+                chapter_id="ch001",
+                page_index=0,
+                input_image_path=temp_dirs_with_image["input_image"],
+                input_manifest_path=temp_dirs_with_image["input_manifest"],
+                output_image_path=output_dir / "000_processed.png",
+                output_manifest_path=output_dir / "page_000.out.json",
+                status="PENDING",
+            )
+            assert run_page(job, with_ocr=True, force=True).status == "DONE"
+
+    assert mock_paddle_class.call_count == 1
+    assert mock_ocr_instance.ocr.call_count == 3
+
+
+def test_engine_pool_warm_up_and_bound():
+    """Test warm-up pre-loads engines and the pool never exceeds max_size."""
+    from src.processing.ocr import get_engine_pool, warm_up
+
+    mock_paddle_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}):
+        pool = warm_up(count=2)
+        assert pool.size == 2
+        assert mock_paddle_class.call_count == 2
+
+        # Same configuration returns the same pool
+        assert get_engine_pool() is pool
+
+        # Borrowing both engines concurrently does not construct a third
+        with pool.engine() as first, pool.engine() as second:
+            assert first is not second
+        assert mock_paddle_class.call_count == 2
+
+        # A different configuration gets its own pool
+        assert get_engine_pool(use_angle_cls=True) is not pool
+
+    mock_paddle_class.assert_called_with(lang="korean", use_angle_cls=False, show_log=False)
+
+
+def _box(x_min, y_min, x_max, y_max):
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+
+
+def _tall_job(tmp_path: Path) -> PageJob:
+    return PageJob(
+        "test-source", "test-series", "ch001", 0,
+        tmp_path / "000.png", tmp_path / "page_000.json",
+        tmp_path / "000_processed.png", tmp_path / "page_000.out.json",
+        status="PENDING",
+    )
+
+
+def test_run_ocr_tiled_remaps_and_deduplicates(tmp_path):
+    """Test tall pages are OCRed as overlapping tiles merged into page coordinates."""
+    # 1000-row page, tiles of 400 rows overlapping by 100: y = 0, 300, 600
+    tile_results = {
+        0: [
+            (_box(10, 50, 90, 80), ("A", 0.9)),
+            (_box(10, 320, 90, 350), ("B", 0.8)),
+            # Cut off by the tile's bottom edge
+            (_box(10, 385, 90, 400), ("C-part", 0.99)),
+        ],
+        300: [
+            (_box(10, 20, 90, 50), ("B", 0.95)),
+            (_box(10, 85, 90, 115), ("C", 0.7)),
+        ],
+        600: [(_box(10, 300, 90, 330), ("D", 0.9))],
+    }
+    offsets = iter(sorted(tile_results))
+    seen_shapes = []
+
+    def fake_ocr(rows, cls):
+        seen_shapes.append(rows.shape)
+        return [tile_results[next(offsets)]]
+
+    mock_ocr_instance = MagicMock()
+    mock_ocr_instance.ocr.side_effect = fake_ocr
+    mock_paddle_class = MagicMock(return_value=mock_ocr_instance)
+
+    image = np.zeros((1000, 100, 3), dtype=np.uint8)
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}):
+        result = run_ocr(_tall_job(tmp_path), image=image, tile_height=400, tile_overlap=100)
+
+    assert seen_shapes == [(400, 100, 3)] * 3
+    assert mock_paddle_class.call_count == 1
+    assert result["tiling"] == {"tile_height": 400, "overlap": 100, "tiles": 3}
+    assert [(line["text"], line["confidence"]) for line in result["lines"]] == [
+        ("A", 0.9), ("B", 0.95), ("C", 0.7), ("D", 0.9),
+    ]
+    assert result["lines"][1]["bbox"] == _box(10, 320, 90, 350)
+    assert result["lines"][2]["bbox"] == _box(10, 385, 90, 415)
+    assert result["lines"][3]["bbox"] == _box(10, 900, 90, 930)
+
+
+def test_run_ocr_short_page_is_not_tiled(tmp_path):
+    """Test a page no taller than the tile height is recognised in one call."""
+    mock_ocr_instance = MagicMock()
+    mock_ocr_instance.ocr.return_value = [[(_box(0, 0, 10, 10), ("A", 0.9))]]
+
+    image = np.zeros((300, 100, 3), dtype=np.uint8)
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=MagicMock(return_value=mock_ocr_instance))}):
+        result = run_ocr(_tall_job(tmp_path), image=image, tile_height=400)
+
+    assert mock_ocr_instance.ocr.call_count == 1
+    assert mock_ocr_instance.ocr.call_args[0][0] is image
+    assert "tiling" not in result
+    assert result["lines"] == [{"text": "A", "confidence": 0.9, "bbox": _box(0, 0, 10, 10)}]
+
+
+def test_run_ocr_rejects_overlap_not_below_tile_height(tmp_path):
+    """Test invalid tiling is rejected before any engine is used."""
+    with pytest.raises(ValueError, match="tile_overlap"):
+        run_ocr(_tall_job(tmp_path), image=np.zeros((10, 10, 3), dtype=np.uint8), tile_height=100, tile_overlap=100)
+
+
+def test_merge_tile_lines_keeps_unmatched_cut_lines():
+    """Test a cut-off line with no counterpart in the next tile is kept, and the last tile has no inner bottom edge."""
+    tiles = [
+        (0, 400, [{"text": "cut", "confidence": 0.5, "bbox": _box(10, 390, 90, 400)}]),
+        (300, 400, [{"text": "bottom", "confidence": 0.5, "bbox": _box(10, 680, 90, 700)}]),
+    ]
+    merged = merge_tile_lines(tiles, page_height=700)
+    assert [line["text"] for line in merged] == ["cut", "bottom"]
+
+
+def test_pipelined_ocr_workers_get_their_own_engines(tmp_path):
+    """Test the pipelined runner loads one engine per OCR thread up front and runs them concurrently."""
+    import threading
+
+    from src.processing.runner import run_pages_pipelined
+
+    barrier = threading.Barrier(2, timeout=5)
+    created = []
+
+    def make_engine(**kwargs):
+        engine = MagicMock()
+        # Each call waits for a second concurrent call; with a single engine it times out
+        engine.ocr.side_effect = lambda image, cls: barrier.wait() and None
+        created.append(engine)
+        return engine
+
+    mock_paddle_class = MagicMock(side_effect=make_engine)
+
+    pages_dir = tmp_path / "data" / "sources" / "src" / "series" / "ch001" / "pages"
+    pages_dir.mkdir(parents=True)
+    jobs = []
+    for index in range(2):
+        Image.new("RGB", (20, 20)).save(pages_dir / f"{index:03d}.png")
+        (pages_dir / f"page_{index:03d}.json").write_text("{}")
+        output_dir = tmp_path / "output" / "pages"
+        jobs.append(PageJob(
+            "src", "series", "ch001", index,
+            pages_dir / f"{index:03d}.png", pages_dir / f"page_{index:03d}.json",
+            output_dir / f"{index:03d}_processed.png", output_dir / f"page_{index:03d}.out.json",
+            status="PENDING",
+        ))
+
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}):
+        finished = run_pages_pipelined(jobs, stage_workers={"ocr": 2}, with_ocr=True)
+
+    assert [job.status for job in finished] == ["DONE", "DONE"], [job.error for job in finished]
+    assert len(created) == 2
+    assert all(engine.ocr.call_count == 1 for engine in created)
+
+
+def test_merge_tile_lines_line_in_three_tiles_kept_once():
+    """Test a line covered by three overlapping tiles is merged into one, whichever detection wins."""
+    # Tiles of 300 rows every 100 rows: the line at y=250 lies in all three
+    line = lambda confidence: {"text": "A", "confidence": confidence, "bbox": _box(10, 250, 90, 270)}
+    for confidences in ([0.9, 0.5, 0.7], [0.5, 0.9, 0.7], [0.5, 0.7, 0.9]):
+        tiles = [(y, 300, [line(c)]) for y, c in zip((0, 100, 200), confidences)]
+        merged = merge_tile_lines(tiles, page_height=500)
+        assert merged == [line(0.9)]
+
+
+def test_warm_up_failure_is_logged(caplog):
+    """Test an engine that cannot load is reported once, with its cause, instead of raising."""
+    from src.processing.runner import warm_up_ocr
+
+    broken = MagicMock(PaddleOCR=MagicMock(side_effect=ImportError("paddle is broken")))
+    with patch.dict("sys.modules", {"paddleocr": broken}), caplog.at_level("WARNING"):
+        warm_up_ocr(2)
+
+    assert len(caplog.records) == 1
+    assert "OCR engine" in caplog.records[0].message
+    assert "paddle is broken" in caplog.text
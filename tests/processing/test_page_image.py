@@ -0,0 +1,74 @@
+"""Tests for shared page image handles."""
+
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.processing.page_image import PageImage
+
+
+@pytest.fixture
+def page_path(tmp_path):
+    """A 40x100 page with a distinct colour per row band."""
+    image = Image.new("RGB", (40, 100))
+    for y in range(100):
+        for x in range(40):
+            image.putpixel((x, y), (y, 255 - y, x))
+    path = tmp_path / "000.png"
+    image.save(path)
+    return path
+
+
+def test_decodes_once(page_path):
+    """Test the file is decoded on first access only."""
+    page = PageImage(page_path)
+    assert not page.decoded
+
+    with patch("src.processing.page_image.cv2.imread", wraps=cv2.imread) as imread:
+        first = page.array
+        assert page.array is first
+        assert page.size == (40, 100)
+        page.to_pil()
+    assert imread.call_count == 1
+
+
+def test_to_pil_matches_file(page_path):
+    """Test the PIL image has the same RGB pixels as opening the file, and is cached."""
+    page = PageImage(page_path)
+    with Image.open(page_path) as expected:
+        assert np.array_equal(np.asarray(page.to_pil()), np.asarray(expected.convert("RGB")))
+    assert page.to_pil() is page.to_pil()
+
+
+def test_tiles_are_overlapping_views(page_path):
+    """Test bands cover every row, overlap as asked and share the decoded buffer."""
+    page = PageImage(page_path)
+    tiles = list(page.tiles(30, overlap=5))
+
+    assert [y for y, _ in tiles] == [0, 25, 50, 75]
+    assert [rows.shape[0] for _, rows in tiles] == [30, 30, 30, 25]
+    assert all(np.shares_memory(rows, page.array) for _, rows in tiles)
+    assert np.array_equal(tiles[1][1], page.array[25:55])
+
+    assert [y for y, _ in page.tiles(100)] == [0]
+    with pytest.raises(ValueError):
+        list(page.tiles(10, overlap=10))
+
+
+def test_from_array_and_release(tmp_path, page_path):
+    """Test wrapped arrays need no file until released."""
+    array = np.zeros((10, 20, 3), dtype=np.uint8)
+    page = PageImage.from_array(array, tmp_path / "missing.png")
+    assert page.array is array
+
+    page.release()
+    with pytest.raises(ValueError, match="Failed to load image"):
+        page.array
+
+    page = PageImage(page_path)
+    page.array
+    page.release()
+    assert not page.decoded
@@ -6,13 +6,17 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageFont
 
 from src.processing.job import PageJob
 from src.processing.render import (
+    FONT_PATHS,
+    _open_font,
     bbox_to_rect,
     calculate_font_size,
+    load_font,
     render_page,
+    render_text_in_bbox,
     wrap_text,
 )
 from src.processing.runner import run_page
@@ -356,9 +360,9 @@ def test_run_page_full_pipeline_with_render(temp_dirs_with_full_pipeline):
     # Mock Papago translation
     mock_translation_response = MagicMock()
     mock_translation_response.status_code = 200
-    mock_translation_response.json.return_value = {
-        "message": {"result": {"translatedText": "Hello"}}
-    }
+    mock_translation_response.json.return_value = {"translatedText": "Hello"}
+    mock_session = MagicMock()
+    mock_session.post.return_value = mock_translation_response
 
     output_dir = temp_dirs_with_full_pipeline["output_dir"] / "output" / "test-source" / "test-series" / "ch003" / "pages"
     output_image = output_dir / "000_processed.png"
@@ -379,7 +383,8 @@ def test_run_page_full_pipeline_with_render(temp_dirs_with_full_pipeline):
 
     # Mock all external dependencies
     with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}), \
-         patch("src.processing.translate.requests.post", return_value=mock_translation_response), \
+         patch("src.processing.translate._get_papago_version", return_value="v1.0.0"), \
+         patch("src.processing.translate._get_session", return_value=mock_session), \
          patch("src.processing.inpaint.cv2.imread") as mock_imread, \
          patch("src.processing.inpaint.cv2.inpaint") as mock_inpaint, \
          patch("src.processing.inpaint.cv2.imwrite") as mock_imwrite, \
@@ -411,8 +416,9 @@ def test_run_page_full_pipeline_with_render(temp_dirs_with_full_pipeline):
         result = run_page(job, with_ocr=True, with_translate=True, with_grouping=True, with_inpaint=True, with_render=True)
 
         # Check success
-        assert result.status == "DONE"
+        assert result.status == "DONE", result.error
         assert result.error is None
+        assert mock_session.post.called
 
         # Check all JSON files created (images are mocked)
         ocr_output = output_dir / "page_000.ocr.json"
@@ -422,7 +428,82 @@ def test_run_page_full_pipeline_with_render(temp_dirs_with_full_pipeline):
         assert ocr_output.exists()
         assert translation_output.exists()
         assert grouping_output.exists()
+        with open(translation_output, encoding="utf-8") as f:
+            assert [line["translated_text"] for line in json.load(f)["lines"]] == ["Hello"]
+
+        # Render draws on the inpainted image handed over in memory
+        assert not mock_image_open.called
+        assert rendered_output.exists()
+
+
+def test_load_font_cached():
+    """Test fonts are opened once per (path, size) and missing paths are probed once."""
+    _open_font.cache_clear()
+    real_font = ImageFont.load_default()
+
+    def fake_truetype(path, size):
+        if path != FONT_PATHS[1]:
+            raise OSError("missing")
+        return real_font
+
+    with patch("src.processing.render.ImageFont.truetype", side_effect=fake_truetype) as mock_truetype:
+        first = load_font(14)
+        second = load_font(14)
+        load_font(16)
+
+    assert first is second is real_font
+    # Two paths probed per size, once each
+    assert mock_truetype.call_count == 4
+    _open_font.cache_clear()
+
+
+def test_wrap_text_measures_each_word_once():
+    """Test wrapping measures distinct words once instead of every growing prefix."""
+    mock_font = MagicMock()
+    mock_font.getbbox.side_effect = lambda text: (0, 0, len(text) * 10, 20)
+
+    text = "one two three one two three one two three"
+    lines = wrap_text(text, mock_font, max_width=140)
+
+    assert lines == ["one two three", "one two three", "one two three"]
+    measured = [call.args[0] for call in mock_font.getbbox.call_args_list]
+    assert sorted(measured) == sorted(["one", "two", "three", "x x", "xx"])
+
+
+def test_wrap_text_matches_real_font_widths():
+    """Test wrapped lines fit the width when measured as whole strings."""
+    font = load_font(14)
+    text = "The quick brown fox jumps over the lazy dog again and again"
+    lines = wrap_text(text, font, max_width=120)
+
+    assert " ".join(lines) == text
+    for line in lines:
+        if " " in line:
+            bbox = font.getbbox(line)
+            assert bbox[2] - bbox[0] <= 120 + 2  # allow for kerning differences
+
+
+def test_render_text_in_bbox_single_draw_per_line():
+    """Test each line is drawn once using PIL's stroke outline."""
+    mock_draw = MagicMock()
+    font = load_font(14)
+
+    render_text_in_bbox(mock_draw, "hello world", (0, 0, 200, 50), font)
+
+    assert mock_draw.text.call_count == 1
+    kwargs = mock_draw.text.call_args.kwargs
+    assert kwargs["stroke_width"] == 1
+    assert kwargs["stroke_fill"] == "white"
+    assert kwargs["fill"] == "black"
+
+
+def test_render_text_in_bbox_does_not_cache_whole_lines():
+    """Test only words go into the per-font width cache, not rendered lines."""
+    from src.processing.render import _TEXT_WIDTHS
+
+    font = load_font(14)
+    render_text_in_bbox(MagicMock(), "hello wide world", (0, 0, 400, 50), font)
 
-        # Verify PIL operations were called
-        assert mock_image_open.called
-        assert mock_pil_image.save.called
+    cached = _TEXT_WIDTHS.get(font, {})
+    assert "hello wide world" not in cached
+    assert all(" " not in text or text == "x x" for text in cached)
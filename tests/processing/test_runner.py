@@ -1,6 +1,7 @@
 """Tests for processing runner."""
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -141,3 +142,316 @@ def test_run_page_missing_input_manifest(temp_dirs):
     assert result.status == "FAILED"
     assert result.error is not None
     assert "not found" in result.error
+
+
+def _make_job(temp_dirs, page_index, input_image=None):
+    """Build a PageJob writing into the standard output layout."""
+    output_dir = temp_dirs["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    return PageJob(
+        source_id="test-source",
+        series_id="test-series",
+        chapter_id="ch001",
+        page_index=page_index,
+        input_image_path=input_image or temp_dirs["input_image"],
+        input_manifest_path=temp_dirs["input_manifest"],
+        output_image_path=output_dir / f"{page_index:03d}_processed.png",
+        output_manifest_path=output_dir / f"page_{page_index:03d}.out.json",
+        status="PENDING",
+    )
+
+
+def test_run_pages_pipelined(temp_dirs):
+    """Test the stage pipeline processes every page and writes the same outputs as run_page."""
+    from src.processing.runner import run_pages_pipelined
+
+    output_dir = temp_dirs["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    output_dir.mkdir(parents=True)
+    ocr_data = {
+        "lines": [{"text": "안녕", "confidence": 0.9, "bbox": [[10, 10], [50, 10], [50, 30], [10, 30]]}],
+        "source_image": "000.png",
+    }
+    for i in range(4):
+        with open(output_dir / f"page_{i:03d}.ocr.json", "w", encoding="utf-8") as f:
+            json.dump(ocr_data, f, ensure_ascii=False)
+
+    jobs = [_make_job(temp_dirs, i) for i in range(4)]
+    completed = []
+    results = run_pages_pipelined(
+        jobs, stage_workers={"grouping": 2}, with_grouping=True, on_complete=completed.append
+    )
+
+    assert sorted(job.page_index for job in results) == [0, 1, 2, 3]
+    assert len(completed) == 4
+    for job in results:
+        assert job.status == "DONE"
+        assert job.error is None
+        assert job.output_image_path.exists()
+        assert job.output_manifest_path.exists()
+        with open(output_dir / f"page_{job.page_index:03d}.groups.json", encoding="utf-8") as f:
+            assert len(json.load(f)["groups"]) == 1
+
+
+def test_run_pages_pipelined_isolates_failures(temp_dirs):
+    """Test a failing page does not stop the other pages in the pipeline."""
+    from src.processing.runner import run_pages_pipelined
+
+    jobs = [
+        _make_job(temp_dirs, 0),
+        _make_job(temp_dirs, 1, input_image=temp_dirs["input_dir"] / "missing.png"),
+        _make_job(temp_dirs, 2),
+    ]
+
+    results = {job.page_index: job for job in run_pages_pipelined(jobs)}
+
+    assert results[0].status == "DONE"
+    assert results[2].status == "DONE"
+    assert results[1].status == "FAILED"
+    assert "not found" in results[1].error
+
+
+def test_run_page_records_stage_metrics(temp_dirs):
+    """Test stage metrics are added to the output manifest and the metrics log."""
+    from src.processing.metrics import read_metrics_log
+
+    job = _make_job(temp_dirs, 0)
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+
+    result = run_page(job, metrics_log_path=log_path)
+
+    assert result.status == "DONE"
+    with open(job.output_manifest_path) as f:
+        manifest = json.load(f)
+    prepare = manifest["metrics"]["prepare"]
+    assert prepare["wall_seconds"] >= 0
+    assert prepare["cpu_seconds"] >= 0
+
+    records = read_metrics_log(log_path)
+    assert len(records) == 1
+    assert records[0]["page_index"] == 0
+    assert records[0]["status"] == "DONE"
+    assert list(records[0]["stages"]) == ["prepare"]
+
+
+def test_run_page_records_metrics_for_failed_stage(temp_dirs):
+    """Test the failing stage is still logged with the page status."""
+    from src.processing.metrics import read_metrics_log
+
+    job = _make_job(temp_dirs, 0)
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+
+    # No OCR file, so grouping fails
+    result = run_page(job, with_grouping=True, metrics_log_path=log_path)
+
+    assert result.status == "FAILED"
+    records = read_metrics_log(log_path)
+    assert records[0]["status"] == "FAILED"
+    assert list(records[0]["stages"]) == ["prepare", "grouping"]
+
+
+def test_run_pages_pipelined_records_metrics(temp_dirs):
+    """Test the pipelined runner logs one metrics record per page."""
+    from src.processing.metrics import read_metrics_log
+    from src.processing.runner import run_pages_pipelined
+
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+    jobs = [_make_job(temp_dirs, i) for i in range(3)]
+
+    run_pages_pipelined(jobs, metrics_log_path=log_path)
+
+    records = read_metrics_log(log_path, chapter_id="ch001")
+    assert sorted(record["page_index"] for record in records) == [0, 1, 2]
+    for job in jobs:
+        with open(job.output_manifest_path) as f:
+            assert "prepare" in json.load(f)["metrics"]
+
+
+def _write_ocr(temp_dirs, text="안녕"):
+    output_dir = temp_dirs["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ocr_data = {
+        "lines": [{"text": text, "confidence": 0.9, "bbox": [[10, 10], [50, 10], [50, 30], [10, 30]]}],
+        "source_image": "000.png",
+    }
+    with open(output_dir / "page_000.ocr.json", "w", encoding="utf-8") as f:
+        json.dump(ocr_data, f, ensure_ascii=False)
+    return output_dir
+
+
+def _last_skipped(log_path):
+    """Return the stages skipped by the last logged run."""
+    with open(log_path) as f:
+        return json.loads(f.readlines()[-1])["skipped"]
+
+
+def test_run_page_skips_unchanged_stages(temp_dirs):
+    """Test a re-run skips stages whose inputs are unchanged and reruns those whose inputs changed."""
+    from src.processing.metrics import read_metrics_log
+
+    output_dir = _write_ocr(temp_dirs)
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+
+    assert run_page(_make_job(temp_dirs, 0), with_grouping=True, metrics_log_path=log_path).status == "DONE"
+    groups_mtime = (output_dir / "page_000.groups.json").stat().st_mtime_ns
+
+    # Nothing changed: grouping is skipped and the image is not copied again
+    assert run_page(_make_job(temp_dirs, 0), with_grouping=True, metrics_log_path=log_path).status == "DONE"
+    assert (output_dir / "page_000.groups.json").stat().st_mtime_ns == groups_mtime
+    assert _last_skipped(log_path) == ["grouping"]
+    with open(log_path) as f:
+        assert "grouping" not in json.loads(f.readlines()[-1])["stages"]
+
+    # The OCR result changed: grouping runs again
+    _write_ocr(temp_dirs, text="다른")
+    run_page(_make_job(temp_dirs, 0), with_grouping=True, metrics_log_path=log_path)
+    assert read_metrics_log(log_path)[0]["skipped"] == []
+
+    # force reruns regardless
+    run_page(_make_job(temp_dirs, 0), with_grouping=True, metrics_log_path=log_path, force=True)
+    assert read_metrics_log(log_path)[0]["skipped"] == []
+
+
+def test_run_page_reruns_stage_with_missing_output(temp_dirs):
+    """Test a stage is rerun if its output file was deleted, even with a matching fingerprint."""
+    output_dir = _write_ocr(temp_dirs)
+    run_page(_make_job(temp_dirs, 0), with_grouping=True)
+    (output_dir / "page_000.groups.json").unlink()
+
+    assert run_page(_make_job(temp_dirs, 0), with_grouping=True).status == "DONE"
+    assert (output_dir / "page_000.groups.json").exists()
+
+
+def test_run_page_rerenders_only_after_font_change(temp_dirs, monkeypatch):
+    """Test changing the render font reruns render but not the stages before it."""
+    from src.processing import render
+
+    output_dir = _write_ocr(temp_dirs)
+    with open(output_dir / "page_000.translated.json", "w", encoding="utf-8") as f:
+        json.dump({"lines": [{"source_text": "안녕", "translated_text": "Hello"}]}, f)
+    flags = {"with_grouping": True, "with_inpaint": True, "with_render": True}
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+
+    assert run_page(_make_job(temp_dirs, 0), metrics_log_path=log_path, **flags).status == "DONE"
+    run_page(_make_job(temp_dirs, 0), metrics_log_path=log_path, **flags)
+    assert _last_skipped(log_path) == ["grouping", "inpaint", "render"]
+
+    monkeypatch.setattr(render, "FONT_PATHS", [])
+    assert run_page(_make_job(temp_dirs, 0), metrics_log_path=log_path, **flags).status == "DONE"
+    assert _last_skipped(log_path) == ["grouping", "inpaint"]
+
+
+def test_run_pages_pipelined_skips_unchanged_stages(temp_dirs):
+    """Test the pipelined runner honours fingerprints recorded by run_page."""
+    from src.processing.runner import run_pages_pipelined
+
+    _write_ocr(temp_dirs)
+    log_path = temp_dirs["output_dir"] / "metrics.jsonl"
+    run_page(_make_job(temp_dirs, 0), with_grouping=True)
+
+    results = run_pages_pipelined([_make_job(temp_dirs, 0)], with_grouping=True, metrics_log_path=log_path)
+
+    assert results[0].status == "DONE"
+    assert _last_skipped(log_path) == ["grouping"]
+
+
+def test_run_page_links_output_image(temp_dirs):
+    """Test the output image is a hard link in link mode and a separate file by default."""
+    job = _make_job(temp_dirs, 0)
+    assert run_page(job, output_image="link").status == "DONE"
+    assert job.output_image_path.stat().st_ino == temp_dirs["input_image"].stat().st_ino
+
+    job = _make_job(temp_dirs, 0)
+    assert run_page(job).status == "DONE"
+    assert job.output_image_path.stat().st_ino != temp_dirs["input_image"].stat().st_ino
+    assert job.output_image_path.read_bytes() == temp_dirs["input_image"].read_bytes()
+
+
+def test_run_page_relink_never_writes_through_old_link(temp_dirs):
+    """Test replacing the output image of a changed page leaves the old source file intact."""
+    job = _make_job(temp_dirs, 0)
+    run_page(job, output_image="link")
+    old_source = temp_dirs["input_image"].with_name("old.png")
+    os.link(temp_dirs["input_image"], old_source)
+    old_bytes = old_source.read_bytes()
+
+    # The page is re-downloaded as a new file
+    replacement = temp_dirs["input_image"].with_name("new.png")
+    Image.new("RGB", (100, 200), color=(0, 0, 255)).save(replacement)
+    os.replace(replacement, temp_dirs["input_image"])
+
+    assert run_page(_make_job(temp_dirs, 0), output_image="link").status == "DONE"
+    assert old_source.read_bytes() == old_bytes
+    assert job.output_image_path.read_bytes() == temp_dirs["input_image"].read_bytes()
+
+
+def test_run_page_without_output_image_hands_cleaned_image_to_render(temp_dirs, monkeypatch):
+    """Test stages read the source page and render does not decode the cleaned PNG again."""
+    from src.processing import render
+
+    output_dir = _write_ocr(temp_dirs)
+    with open(output_dir / "page_000.translated.json", "w", encoding="utf-8") as f:
+        json.dump({"lines": [{"source_text": "안녕", "translated_text": "Hello"}]}, f)
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("cleaned image decoded from disk")
+
+    monkeypatch.setattr(render.Image, "open", no_decode)
+    job = _make_job(temp_dirs, 0)
+    result = run_page(job, with_grouping=True, with_inpaint=True, with_render=True, output_image="none")
+
+    assert result.status == "DONE", result.error
+    assert not job.output_image_path.exists()
+    assert (output_dir / "000_processed.cleaned.png").exists()
+    assert (output_dir / "000_processed.rendered.png").exists()
+    with open(job.output_manifest_path) as f:
+        assert json.load(f)["output_image"] is None
+
+
+def test_run_page_unknown_output_image_mode(temp_dirs):
+    """Test an unknown output image mode fails the page."""
+    result = run_page(_make_job(temp_dirs, 0), output_image="symlink")
+    assert result.status == "FAILED"
+    assert "Unknown output image mode" in result.error
+
+
+def test_run_page_decodes_source_image_once(temp_dirs):
+    """Test OCR and inpainting share one decode of the source page."""
+    import cv2
+    from unittest.mock import MagicMock, patch
+
+    import numpy as np
+
+    mock_ocr_instance = MagicMock()
+    mock_ocr_instance.ocr.return_value = [[[[[10, 10], [50, 10], [50, 30], [10, 30]], ("안녕", 0.9)]]]
+    mock_paddle_class = MagicMock(return_value=mock_ocr_instance)
+
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}), \
+         patch("src.processing.page_image.cv2.imread", wraps=cv2.imread) as imread:
+        result = run_page(_make_job(temp_dirs, 0), with_ocr=True, with_grouping=True, with_inpaint=True)
+
+    assert result.status == "DONE", result.error
+    assert imread.call_count == 1
+    # The engine gets the decoded pixels rather than the path
+    assert isinstance(mock_ocr_instance.ocr.call_args.args[0], np.ndarray)
+
+
+def test_run_page_tiled_ocr_reruns_when_tiling_changes(temp_dirs):
+    """Test tall pages are OCRed in tiles and a tiling change invalidates the OCR result."""
+    from unittest.mock import MagicMock, patch
+
+    mock_ocr_instance = MagicMock()
+    mock_ocr_instance.ocr.return_value = None
+    mock_paddle_class = MagicMock(return_value=mock_ocr_instance)
+
+    with patch.dict("sys.modules", {"paddleocr": MagicMock(PaddleOCR=mock_paddle_class)}):
+        # 200-row page in tiles of 120 rows overlapping by 40: y = 0, 80
+        assert run_page(_make_job(temp_dirs, 0), with_ocr=True, ocr_tile_height=120, ocr_tile_overlap=40).status == "DONE"
+        assert mock_ocr_instance.ocr.call_count == 2
+
+        run_page(_make_job(temp_dirs, 0), with_ocr=True, ocr_tile_height=120, ocr_tile_overlap=40)
+        assert mock_ocr_instance.ocr.call_count == 2
+
+        run_page(_make_job(temp_dirs, 0), with_ocr=True, ocr_tile_height=120, ocr_tile_overlap=20)
+        assert mock_ocr_instance.ocr.call_count == 4
+
+    with open(temp_dirs["output_dir"] / "output" / "test-source" / "test-series" / "ch001" / "pages" / "page_000.ocr.json") as f:
+        assert json.load(f)["tiling"] == {"tile_height": 120, "overlap": 20, "tiles": 2}
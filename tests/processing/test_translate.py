@@ -270,3 +270,156 @@ def test_write_translation_result(temp_dirs_with_ocr):
     with open(output_path, "r", encoding="utf-8") as f:
         raw_content = f.read()
     assert "안녕" in raw_content  # Should be actual Korean, not \\uXXXX
+
+
+def _joined_papago_translate(text: str, version: str) -> str:
+    """Mock Papago translating a delimiter-joined batch line by line."""
+    from src.processing.translate import BATCH_DELIMITER
+
+    return BATCH_DELIMITER.join(mock_papago_translate(part, version) for part in text.split(BATCH_DELIMITER))
+
+
+def test_run_translation_batched(temp_dirs_with_ocr):
+    """Test batched mode sends one request for all lines and splits the response."""
+    from src.processing.translate import run_translation
+
+    with patch("src.processing.translate._get_papago_version") as mock_version, patch(
+        "src.processing.translate._translate_text_papago"
+    ) as mock_translate:
+        mock_version.return_value = "v1.0.0"
+        mock_translate.side_effect = _joined_papago_translate
+
+        result = run_translation(temp_dirs_with_ocr["ocr_data"], batch=True)
+
+    assert mock_translate.call_count == 1
+    assert [line["translated_text"] for line in result["lines"]] == ["Hello", "This is a test", "Translation test"]
+
+
+def test_run_translation_batched_fallback_on_mismatch(temp_dirs_with_ocr):
+    """Test batched mode falls back to per-line requests when the split count differs."""
+    from src.processing.translate import run_translation
+
+    def merging_translate(text, version):
+        # Papago sometimes swallows the breaker and merges sentences
+        if "##" in text:
+            return "Hello. This is a test. Translation test"
+        return mock_papago_translate(text, version)
+
+    with patch("src.processing.translate._get_papago_version") as mock_version, patch(
+        "src.processing.translate._translate_text_papago"
+    ) as mock_translate:
+        mock_version.return_value = "v1.0.0"
+        mock_translate.side_effect = merging_translate
+
+        result = run_translation(temp_dirs_with_ocr["ocr_data"], batch=True)
+
+    assert mock_translate.call_count == 4  # 1 batch + 3 per-line fallbacks
+    assert [line["translated_text"] for line in result["lines"]] == ["Hello", "This is a test", "Translation test"]
+
+
+def test_batch_skips_blank_lines_and_respects_size_limit():
+    """Test blank lines are not sent and large inputs are split into several batches."""
+    from src.processing.translate import BATCH_MAX_CHARS, _translate_batch_papago
+
+    long_text = "가" * (BATCH_MAX_CHARS // 3)
+    texts = [long_text, "  ", long_text, long_text]
+
+    with patch("src.processing.translate._translate_text_papago") as mock_translate:
+        mock_translate.side_effect = _joined_papago_translate
+        translations = _translate_batch_papago(texts, "v1.0.0")
+
+    assert translations[1] == ""
+    assert len(translations) == 4
+    assert mock_translate.call_count == 2
+    for call in mock_translate.call_args_list:
+        assert "  " not in call.args[0].split("\n")
+
+
+def test_papago_version_cached_within_ttl():
+    """Test the scraped Papago version is reused until the TTL expires."""
+    from src.processing import translate
+
+    translate.clear_papago_version_cache()
+    with patch("src.processing.translate._fetch_papago_version") as mock_fetch:
+        mock_fetch.side_effect = ["v1", "v2"]
+
+        assert translate._get_papago_version() == "v1"
+        assert translate._get_papago_version() == "v1"
+        assert mock_fetch.call_count == 1
+
+        with patch("src.processing.translate.PAPAGO_VERSION_TTL_SECONDS", 0):
+            assert translate._get_papago_version() == "v2"
+
+    translate.clear_papago_version_cache()
+
+
+def test_stale_papago_version_refetched_once_on_auth_failure(temp_dirs_with_ocr):
+    """Test an auth failure drops the cached version and the translation is retried with a fresh one."""
+    from src.processing import translate
+
+    def versioned_translate(text, version):
+        if version == "stale":
+            raise translate.PapagoAuthError("401")
+        return mock_papago_translate(text, version)
+
+    translate.clear_papago_version_cache()
+    with patch("src.processing.translate._fetch_papago_version") as mock_fetch, patch(
+        "src.processing.translate._translate_text_papago"
+    ) as mock_translate:
+        mock_fetch.side_effect = ["stale", "fresh"]
+        mock_translate.side_effect = versioned_translate
+
+        result = translate.run_translation(temp_dirs_with_ocr["ocr_data"])
+
+        assert mock_fetch.call_count == 2
+        assert [line["translated_text"] for line in result["lines"]] == ["Hello", "This is a test", "Translation test"]
+        assert translate._get_papago_version() == "fresh"
+
+    translate.clear_papago_version_cache()
+
+
+def test_papago_auth_failure_raises_auth_error():
+    """Test 401/403 answers are reported as auth errors rather than generic failures."""
+    from src.processing import translate
+
+    response = MagicMock(status_code=403)
+    with patch("src.processing.translate._get_session") as mock_session:
+        mock_session.return_value.post.return_value = response
+        with pytest.raises(translate.PapagoAuthError):
+            translate._translate_text_papago("안녕", "stale")
+
+
+def test_session_reused_per_thread():
+    """Test HTTP sessions are pooled and reused within a thread."""
+    from src.processing.translate import _get_session
+
+    assert _get_session() is _get_session()
+
+
+def test_run_translation_uses_memory(temp_dirs_with_ocr, tmp_path):
+    """Test cached lines skip Papago entirely and new lines are written back."""
+    from src.processing.translate import run_translation
+    from utils.translation_memory import TranslationMemory
+
+    memory = TranslationMemory(tmp_path / "tm.db")
+    memory.put("papago", "ko", "en", "안녕하세요", "Hello (cached)")
+
+    with patch("src.processing.translate._get_papago_version") as mock_version, patch(
+        "src.processing.translate._translate_text_papago"
+    ) as mock_translate:
+        mock_version.return_value = "v1.0.0"
+        mock_translate.side_effect = mock_papago_translate
+
+        first = run_translation(temp_dirs_with_ocr["ocr_data"], memory=memory)
+        calls_after_first = mock_translate.call_count
+        second = run_translation(temp_dirs_with_ocr["ocr_data"], memory=memory)
+
+    assert first["lines"][0]["translated_text"] == "Hello (cached)"
+    assert first["lines"][1]["translated_text"] == "This is a test"
+    assert second["lines"] == first["lines"]
+
+    # Only the two uncached lines were requested, and the re-run cost nothing
+    assert [c.args[0] for c in mock_translate.call_args_list if c.args[0]] == ["테스트입니다", "번역 테스트"]
+    assert mock_translate.call_count == calls_after_first
+    assert mock_version.call_count == 1
+    memory.close()
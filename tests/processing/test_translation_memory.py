@@ -0,0 +1,172 @@
+"""Tests for the persistent translation memory."""
+
+import pytest
+
+from utils.translation_memory import TranslationMemory, open_translation_memory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    """Create an empty translation memory."""
+    tm = TranslationMemory(tmp_path / "tm.db")
+    yield tm
+    tm.close()
+
+
+def test_get_miss_then_hit(memory):
+    """Test stored translations are returned and hits/misses are counted."""
+    assert memory.get("papago", "ko", "en", "안녕") is None
+
+    memory.put("papago", "ko", "en", "안녕", "Hi")
+
+    assert memory.get("papago", "ko", "en", "안녕") == "Hi"
+    assert memory.hits == 1
+    assert memory.misses == 1
+
+
+def test_key_includes_engine_and_languages(memory):
+    """Test entries are scoped by engine and language pair."""
+    memory.put("papago", "ko", "en", "안녕", "Hi")
+
+    assert memory.get("google", "ko", "en", "안녕") is None
+    assert memory.get("papago", "ko", "ja", "안녕") is None
+
+
+def test_get_many_ignores_blank_and_duplicates(memory):
+    """Test batch lookup skips blank text and counts each distinct text once."""
+    memory.put_many("papago", "ko", "en", {"가": "A", "나": "B"})
+
+    found = memory.get_many("papago", "ko", "en", ["가", "가", " ", "다"])
+
+    assert found == {"가": "A"}
+    assert memory.hits == 1
+    assert memory.misses == 1
+
+
+def test_empty_translations_not_stored(memory):
+    """Test blank source text or empty translations are never cached."""
+    memory.put_many("papago", "ko", "en", {"": "x", "가": ""})
+    assert len(memory) == 0
+
+
+def test_lru_eviction(tmp_path):
+    """Test least recently used entries are evicted beyond max_entries."""
+    tm = TranslationMemory(tmp_path / "tm.db", max_entries=2)
+    tm.put("papago", "ko", "en", "a", "A")
+    tm.put("papago", "ko", "en", "b", "B")
+
+    # Touch "a" so "b" becomes least recently used
+    assert tm.get("papago", "ko", "en", "a") == "A"
+    tm.put("papago", "ko", "en", "c", "C")
+
+    assert len(tm) == 2
+    assert tm.get("papago", "ko", "en", "b") is None
+    assert tm.get("papago", "ko", "en", "a") == "A"
+    assert tm.get("papago", "ko", "en", "c") == "C"
+    tm.close()
+
+
+def test_persists_across_instances(tmp_path):
+    """Test entries survive reopening the database."""
+    tm = TranslationMemory(tmp_path / "tm.db")
+    tm.put("papago", "ko", "en", "안녕", "Hi")
+    tm.close()
+
+    reopened = TranslationMemory(tmp_path / "tm.db")
+    assert reopened.get("papago", "ko", "en", "안녕") == "Hi"
+    reopened.close()
+
+
+def test_export_import_roundtrip(memory, tmp_path):
+    """Test export to JSONL and import into a fresh memory."""
+    memory.put_many("papago", "ko", "en", {"안녕": "Hi", "테스트": "Test"})
+    export_path = tmp_path / "tm.jsonl"
+
+    assert memory.export_jsonl(export_path) == 2
+    assert "안녕" in export_path.read_text(encoding="utf-8")
+
+    other = TranslationMemory(tmp_path / "other.db")
+    assert other.import_jsonl(export_path) == 2
+    assert other.get_many("papago", "ko", "en", ["안녕", "테스트"]) == {"안녕": "Hi", "테스트": "Test"}
+    other.close()
+
+
+def test_stats(memory):
+    """Test stats report entries and hit rate."""
+    memory.put("papago", "ko", "en", "a", "A")
+    memory.get("papago", "ko", "en", "a")
+    memory.get("papago", "ko", "en", "b")
+
+    stats = memory.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lookup_totals_persist_across_sessions(tmp_path):
+    """Test hit/miss totals accumulate in the database across instances."""
+    tm = TranslationMemory(tmp_path / "tm.db")
+    tm.put("papago", "ko", "en", "a", "A")
+    tm.get_many("papago", "ko", "en", ["a", "b"])
+    tm.close()
+
+    tm = TranslationMemory(tmp_path / "tm.db")
+    try:
+        tm.get("papago", "ko", "en", "a")
+        stats = tm.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 0)
+        assert (stats["total_hits"], stats["total_misses"]) == (2, 1)
+        assert stats["total_hit_rate"] == pytest.approx(2 / 3)
+        assert tm.totals() == {"hits": 2, "misses": 1}
+    finally:
+        tm.close()
+
+
+def test_open_translation_memory_shared(tmp_path):
+    """Test the same path returns the same process-wide instance."""
+    assert open_translation_memory(tmp_path / "tm.db") is open_translation_memory(tmp_path / "tm.db")
+
+
+def test_desktop_translator_consults_memory(memory):
+    """Test BaseTranslator serves hits from the memory, sends only misses, and keys entries on its params."""
+    from modules.translators.base import BaseTranslator
+    from utils.textblock import TextBlock
+
+    class StubTranslator(BaseTranslator):
+        concate_text = False
+        params = {"model": "small", "delay": 0.0}
+
+        def _setup_translator(self):
+            self.lang_map["한국어"] = "ko"
+            self.lang_map["English"] = "en"
+
+        def _translate(self, src_list):
+            sent.append(list(src_list))
+            return [f"{self.get_param_value('model')}:{text}" for text in src_list]
+
+    sent = []
+    translator = StubTranslator("한국어", "English")
+    translator.translation_memory = memory
+
+    def translate(*texts):
+        blocks = [TextBlock(text=text) for text in texts]
+        translator.translate_textblk_lst(blocks)
+        return [blk.translation for blk in blocks]
+
+    assert translate("가", "나") == ["small:가", "small:나"]
+    assert sent == [["가", "나"]]
+
+    # Hits skip the translator; only the new text is sent
+    assert translate("가", "다", "나") == ["small:가", "small:다", "small:나"]
+    assert sent[1:] == [["다"]]
+    assert translate("가", "나") == ["small:가", "small:나"]
+    assert len(sent) == 2
+
+    # A param that shapes the output invalidates the cached translations; one that does not, doesn't
+    translator.set_param_value("delay", 1.0)
+    translate("가")
+    assert len(sent) == 2
+    translator.set_param_value("model", "large")
+    assert translate("가") == ["large:가"]
+    assert sent[2:] == [["가"]]
@@ -26,6 +26,7 @@ from .custom_widget import ImgtransProgressMessageBox, ParamComboBox
 from .configpanel import ConfigPanel
 from utils.proj_imgtrans import ProjImgTrans
 from utils.config import pcfg, RunStatus
+from utils.translation_memory import open_translation_memory
 cfg_module = pcfg.module
 
 
@@ -186,6 +187,8 @@ class TranslateThread(ModuleThread):
                 self.translator = translator_module(source, target, raise_unsupported_lang=False, **params)
             else:
                 self.translator = translator_module(source, target, raise_unsupported_lang=False)
+            if cfg_module.translation_memory:
+                self.translator.translation_memory = open_translation_memory(cfg_module.translation_memory)
             cfg_module.translate_source = self.translator.lang_source
             cfg_module.translate_target = self.translator.lang_target
             cfg_module.translator = self.translator.name
@@ -36,6 +36,8 @@ class ModuleConfig(Config):
     inpainter_params: Dict = field(default_factory=lambda: dict())
     translate_source: str = '日本語'
     translate_target: str = '简体中文'
+    # SQLite translation memory shared by the translators (e.g. data/translation_memory.db); empty disables it
+    translation_memory: str = ''
     check_need_inpaint: bool = True
     load_model_on_demand: bool = False
     empty_runcache: bool = False
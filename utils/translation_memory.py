@@ -0,0 +1,250 @@
+"""Persistent translation memory backed by SQLite, shared by the processing pipeline and the desktop translators."""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+# Default number of entries kept before least-recently-used ones are evicted
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+class TranslationMemory:
+    """On-disk cache of translations keyed by (engine, source_language, target_language, text).
+
+    Lookups refresh an entry's last-used time; when the memory grows past
+    ``max_entries`` the least recently used entries are evicted. A single
+    connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open (or create) the translation memory database."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Worker processes may share one database, so wait on locks rather than fail
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create database schema if it doesn't exist."""
+        cursor = self.conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                engine TEXT NOT NULL,
+                source_language TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translated_text TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (engine, source_language, target_language, source_text)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)
+        """)
+
+        # Lookup counters accumulated across sessions and processes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+        self.conn.commit()
+
+    def get_many(self, engine: str, source_language: str, target_language: str, texts: Iterable[str]) -> Dict[str, str]:
+        """Look up several texts at once.
+
+        Returns:
+            Mapping of source text to cached translation for every hit.
+        """
+        unique = list(dict.fromkeys(t for t in texts if t.strip()))
+        found: Dict[str, str] = {}
+        if not unique:
+            return found
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"""
+                    SELECT source_text, translated_text FROM translations
+                    WHERE engine = ? AND source_language = ? AND target_language = ?
+                    AND source_text IN ({placeholders})
+                """,
+                    (engine, source_language, target_language, *chunk),
+                )
+                found.update(cursor.fetchall())
+
+            if found:
+                cursor.executemany(
+                    """
+                    UPDATE translations SET last_used = ?
+                    WHERE engine = ? AND source_language = ? AND target_language = ? AND source_text = ?
+                """,
+                    [(time.time(), engine, source_language, target_language, text) for text in found],
+                )
+
+            hits, misses = len(found), len(unique) - len(found)
+            cursor.executemany(
+                """
+                INSERT INTO counters (name, value) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+            """,
+                [("hits", hits), ("misses", misses)],
+            )
+            self.conn.commit()
+
+            self.hits += hits
+            self.misses += misses
+
+        return found
+
+    def get(self, engine: str, source_language: str, target_language: str, text: str) -> Optional[str]:
+        """Look up a single text, returning None on a miss."""
+        return self.get_many(engine, source_language, target_language, [text]).get(text)
+
+    def put_many(self, engine: str, source_language: str, target_language: str, translations: Dict[str, str]) -> None:
+        """Store translations (source text -> translated text), then evict if over capacity."""
+        now = time.time()
+        created_at = datetime.utcnow().isoformat()
+        rows = [
+            (engine, source_language, target_language, source, translated, created_at, now)
+            for source, translated in translations.items()
+            if source.strip() and translated
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO translations
+                (engine, source_language, target_language, source_text, translated_text, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            self._evict(cursor)
+            self.conn.commit()
+
+    def put(self, engine: str, source_language: str, target_language: str, text: str, translation: str) -> None:
+        """Store a single translation."""
+        self.put_many(engine, source_language, target_language, {text: translation})
+
+    def _evict(self, cursor: sqlite3.Cursor) -> None:
+        """Delete least recently used entries beyond max_entries."""
+        cursor.execute("SELECT COUNT(*) FROM translations")
+        excess = cursor.fetchone()[0] - self.max_entries
+        if excess > 0:
+            cursor.execute(
+                """
+                DELETE FROM translations WHERE rowid IN (
+                    SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?
+                )
+            """,
+                (excess,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def totals(self) -> Dict[str, int]:
+        """Return hit/miss counts recorded by every session that used this database."""
+        with self._lock:
+            counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        return {"hits": counters.get("hits", 0), "misses": counters.get("misses", 0)}
+
+    def stats(self) -> dict:
+        """Return entry count, hit/miss counters for this session and totals across sessions."""
+        lookups = self.hits + self.misses
+        totals = self.totals()
+        total_lookups = totals["hits"] + totals["misses"]
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "total_hits": totals["hits"],
+            "total_misses": totals["misses"],
+            "total_hit_rate": totals["hits"] / total_lookups if total_lookups else 0.0,
+        }
+
+    def export_jsonl(self, output_path: Path) -> int:
+        """Write every entry as one JSON object per line. Returns the entry count."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT engine, source_language, target_language, source_text, translated_text, created_at
+                FROM translations ORDER BY engine, source_language, target_language, source_text
+            """
+            ).fetchall()
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            for engine, source_language, target_language, source_text, translated_text, created_at in rows:
+                entry = {
+                    "engine": engine,
+                    "source_language": source_language,
+                    "target_language": target_language,
+                    "source_text": source_text,
+                    "translated_text": translated_text,
+                    "created_at": created_at,
+                }
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        return len(rows)
+
+    def import_jsonl(self, input_path: Path) -> int:
+        """Load entries exported by export_jsonl. Returns the number imported."""
+        grouped: Dict[tuple, Dict[str, str]] = {}
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = (entry["engine"], entry["source_language"], entry["target_language"])
+                grouped.setdefault(key, {})[entry["source_text"]] = entry["translated_text"]
+
+        for (engine, source_language, target_language), translations in grouped.items():
+            self.put_many(engine, source_language, target_language, translations)
+
+        return sum(len(translations) for translations in grouped.values())
+
+    def close(self):
+        """Close database connection."""
+        self.conn.close()
+
+
+_MEMORIES: Dict[Path, TranslationMemory] = {}
+_MEMORIES_LOCK = threading.Lock()
+
+
+def open_translation_memory(db_path: Path) -> TranslationMemory:
+    """Return the process-wide TranslationMemory for a database path."""
+    key = Path(db_path).resolve()
+    with _MEMORIES_LOCK:
+        memory = _MEMORIES.get(key)
+        if memory is None:
+            memory = TranslationMemory(key)
+            _MEMORIES[key] = memory
+        return memory